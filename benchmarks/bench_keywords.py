@@ -0,0 +1,74 @@
+"""Time keyword detection against the nested substring scan it replaced.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_keywords --repeat 2000
+
+Each dictionary is timed on a long article with no keyword and with one hit
+near the end; the script fails if ``KeywordMatcher`` disagrees with the scan.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+from crawler_project.utils.data_parser import CHARGE_KEYWORDS, DISASTER_KEYWORDS
+from crawler_project.utils.keyword_matcher import KeywordMatcher
+
+FILLER = "的了在是我有和人这中大为上个国不以会们要到说时地出就年而生也"
+
+
+def substring_first(dictionary, text):
+    for category, keywords in dictionary.items():
+        if any(keyword in text for keyword in keywords):
+            return category
+    return None
+
+
+def synthetic_dictionary(rng: random.Random, categories: int = 100, terms: int = 50):
+    alphabet = [chr(code) for code in range(0x4E00, 0x4E00 + 3000)]
+    return {
+        f"c{index}": ["".join(rng.choice(alphabet) for _ in range(rng.randint(2, 4))) for _ in range(terms)]
+        for index in range(categories)
+    }
+
+
+def _per_call(func, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="calls per dictionary and text")
+    parser.add_argument("--length", type=int, default=5000, help="characters per article")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    miss = "".join(rng.choice(FILLER) for _ in range(args.length))
+    synthetic = synthetic_dictionary(rng)
+    dictionaries = {"disaster": DISASTER_KEYWORDS, "charge": CHARGE_KEYWORDS, "synthetic-5000": synthetic}
+
+    mismatches = 0
+    print(f"{'dictionary':<16}{'text':<6}{'substring':>12}{'matcher':>12}{'speedup':>10}   (us/call)")
+    for name, dictionary in dictionaries.items():
+        matcher = KeywordMatcher(dictionary)
+        last = list(dictionary)[-1]
+        hit = miss[: -args.length // 5] + dictionary[last][0] + miss[-args.length // 5 :]
+        for label, text in (("miss", miss), ("hit", hit)):
+            if matcher.first_category(text) != substring_first(dictionary, text):
+                print(f"  matcher disagrees with the substring scan on {name}/{label}")
+                mismatches += 1
+            old = _per_call(lambda t: substring_first(dictionary, t), text, args.repeat)
+            new = _per_call(matcher.first_category, text, args.repeat)
+            print(f"{name:<16}{label:<6}{old:>12.1f}{new:>12.1f}{old / new:>9.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
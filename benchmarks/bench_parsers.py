@@ -0,0 +1,72 @@
+"""Time per-page extraction for every installed HTML parser backend.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_parsers --repeat 200
+
+Each fixture page under ``tests/fixtures`` is parsed with its extraction spec;
+the script fails if any backend disagrees with the first one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from crawler_project.utils.extraction_specs import (
+    HOUSING_LISTING,
+    LEGAL_DETAIL,
+    LEGAL_LISTING,
+    NEWS_DETAIL,
+    NEWS_LISTING,
+)
+from crawler_project.utils.html_parser import get_backend
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+CASES = [
+    (NEWS_LISTING, "news_list.html"),
+    (NEWS_DETAIL, "news_detail.html"),
+    (LEGAL_LISTING, "legal_list.html"),
+    (LEGAL_DETAIL, "legal_detail.html"),
+    (HOUSING_LISTING, "housing_list.html"),
+]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="parses per page and backend")
+    parser.add_argument("--backends", nargs="*", default=["selectolax", "lxml", "soup"])
+    args = parser.parse_args(argv)
+
+    backends = []
+    for name in args.backends:
+        try:
+            backends.append(get_backend(name))
+        except ImportError:
+            print(f"{name:<12} not installed, skipped")
+    if not backends:
+        print("no parser backend available")
+        return 1
+
+    mismatches = 0
+    print(f"{'page':<20}" + "".join(f"{b.name:>14}" for b in backends) + "   (ms/page)")
+    for spec, fixture in CASES:
+        html = (FIXTURES / fixture).read_text(encoding="utf-8")
+        expected = backends[0].extract(spec, html)
+        timings = []
+        for backend in backends:
+            if backend.extract(spec, html) != expected:
+                print(f"  {backend.name} output differs from {backends[0].name} on {fixture}")
+                mismatches += 1
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                backend.extract(spec, html)
+            timings.append((time.perf_counter() - started) / args.repeat * 1000)
+        print(f"{fixture:<20}" + "".join(f"{ms:>14.3f}" for ms in timings))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
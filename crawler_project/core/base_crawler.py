@@ -3,24 +3,105 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import itertools
 import logging
+import multiprocessing
+import os
 import random
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterable, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
-import aiohttp
 import json
 import tenacity
 
 from ..config import settings
-from ..utils.proxy_manager import ProxyManager
+from ..utils.checkpoint import CheckpointStore
+from ..utils.config_loader import get_section
+from ..utils.dedup import get_dedup_index
+from ..utils.frontier import CrawlFrontier
+from ..utils.http_cache import ResponseCache, get_response_cache
+from ..utils.proxy_manager import get_proxy_manager
+from ..utils.rate_limiter import get_rate_limiter
+from ..utils.transport import TRANSPORT_ERRORS, Session, acquire_session, release_session
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
 
-def _sleep_interval() -> float:
-    policy = settings.request_policy
-    return random.uniform(policy.min_delay_seconds, policy.max_delay_seconds)
+
+@dataclass
+class ConcurrencySettings:
+    """Window of detail requests a crawler keeps in flight per listing page."""
+
+    detail_window: int = 4
+    ordered: bool = False
+
+
+@dataclass
+class ParseSettings:
+    """HTML parsing workers; ``workers: 0`` parses inline on the event loop."""
+
+    workers: Optional[int] = None
+    # pages shipped to a worker per task by ``_parse_many``
+    chunksize: int = 4
+
+
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_parse_loaded = False
+_parse_lock = threading.Lock()
+
+
+def get_parse_executor() -> Optional[ProcessPoolExecutor]:
+    """Return the process-wide parse pool shared by all crawlers (``None`` = inline)."""
+
+    global _parse_executor, _parse_loaded
+    with _parse_lock:
+        if not _parse_loaded:
+            cfg = get_section("parsing", ParseSettings())
+            workers = min(4, os.cpu_count() or 1) if cfg.workers is None else cfg.workers
+            if workers > 0:
+                # spawn: the crawl process may already run browser/writer threads that must not be forked.
+                _parse_executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+            _parse_loaded = True
+        return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    global _parse_executor, _parse_loaded
+    with _parse_lock:
+        if _parse_executor is not None:
+            _parse_executor.shutdown(cancel_futures=True)
+        _parse_executor = None
+        _parse_loaded = False
+
+
+class HttpResponse(NamedTuple):
+    status: int
+    text: str
+    headers: Mapping[str, str]
 
 
 class BaseCrawler(ABC):
@@ -28,47 +109,295 @@ class BaseCrawler(ABC):
 
     name: str = "base"
 
-    def __init__(self, session: Optional[aiohttp.ClientSession] = None) -> None:
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        concurrency: Optional[int] = None,
+        ordered: Optional[bool] = None,
+        run_id: Optional[str] = None,
+    ) -> None:
         self.session = session
-        self.proxy_manager = ProxyManager(settings.proxy.pool_file)
+        self._owns_session = False
+        self.run_id = run_id
+        self.checkpoints: Optional[CheckpointStore] = None
+        self.frontier: Optional[CrawlFrontier] = None
+        self._unacked: Deque[Tuple[str, Optional[str]]] = deque()
+        self.proxy_manager = get_proxy_manager()
         self.user_agents = settings.user_agents.desktop
+        self.rate_limiter = get_rate_limiter()
+        self.cache = get_response_cache()
+        self.dedup = get_dedup_index()
+        defaults = get_section("concurrency", ConcurrencySettings())
+        self.concurrency = max(1, concurrency or defaults.detail_window)
+        self.ordered = defaults.ordered if ordered is None else ordered
 
     async def __aenter__(self):
         if not self.session:
-            timeout = aiohttp.ClientTimeout(total=settings.request_policy.timeout_seconds)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            # Borrow the loop's shared session so crawlers reuse one connection pool.
+            self.session = await acquire_session()
+            self._owns_session = True
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        if self.session:
-            await self.session.close()
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+            self.checkpoints = None
+        if self.frontier:
+            await asyncio.to_thread(self.frontier.close)
+            self.frontier = None
+        # A session passed in by the caller stays open; a borrowed one is handed back.
+        if self.session and self._owns_session:
+            await release_session(self.session)
+            self.session = None
+            self._owns_session = False
+
+    async def _begin_run(self, *scope: Any) -> None:
+        """Open the checkpoint store for this run.
+
+        Without an explicit ``run_id`` the run is identified by the crawl
+        arguments in ``scope`` plus today's date, so a crash restart on the
+        same day resumes while tomorrow's run starts fresh.
+        """
+
+        run_id = self.run_id or ":".join([*(str(part) for part in scope), date.today().isoformat()])
+        if self.checkpoints is not None and self.checkpoints.run_id == run_id:
+            return
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+        if self.frontier:
+            await asyncio.to_thread(self.frontier.close)
+        self.checkpoints = CheckpointStore.from_settings(self.name, run_id)
+        self.frontier = await asyncio.to_thread(CrawlFrontier.from_settings, self.name, run_id)
+        if self.checkpoints is not None and len(self.checkpoints):
+            logger.info("Resuming %s run %s with %s finished items", self.name, run_id, len(self.checkpoints))
+
+    def _is_done(self, kind: str, key: str) -> bool:
+        return self.checkpoints is not None and self.checkpoints.is_done(kind, key)
+
+    def _mark_done(self, kind: str, key: str) -> None:
+        if self.checkpoints is not None:
+            self.checkpoints.mark_done(kind, key)
+        if self.frontier:
+            self.frontier.complete(kind, key)
+
+    async def _page_batches(self, urls: Sequence[str], batch_size: Optional[int] = None) -> AsyncIterator[List[str]]:
+        """Yield the listing pages this worker should crawl, in order.
+
+        Without a frontier that is one batch of every page not yet done in
+        this run. With one, pages are seeded into the shared frontier and
+        leased ``batch_size`` at a time until no node has any left; pages a stopped
+        consumer never finished are released for other nodes.
+        """
+
+        urls = [url for url in urls if not self._is_done("page", url)]
+        if not self.frontier:
+            if urls:
+                yield urls
+            return
+        frontier = self.frontier
+        await asyncio.to_thread(frontier.seed, "page", urls)
+        leased: List[str] = []
+        try:
+            while True:
+                leased = await asyncio.to_thread(frontier.lease, "page", batch_size)
+                if leased:
+                    self.rate_limiter.set_share(1.0 / await asyncio.to_thread(frontier.active_workers))
+                    yield leased
+                    leased = []
+                elif await asyncio.to_thread(frontier.remaining, "page"):
+                    await asyncio.sleep(frontier.poll_seconds)  # other nodes hold the rest; wait for expiries
+                else:
+                    return
+        finally:
+            if leased:
+                await asyncio.to_thread(frontier.release, "page", leased)
+
+    async def _skip_detail(self, url: str) -> bool:
+        """True when ``url`` was finished in this run, ingested by any earlier
+        one, or is being fetched by another node."""
+
+        if self._is_done("detail", url):
+            return True
+        if self.dedup and await asyncio.to_thread(self.dedup.seen, url):
+            return True
+        return bool(self.frontier) and not await asyncio.to_thread(self.frontier.claim, "detail", url)
+
+    def _record_yielded(self, detail_url: Optional[str] = None) -> None:
+        """Track a record about to be yielded until the sink acknowledges it."""
+
+        self._unacked.append(("detail", detail_url))
+
+    def _page_finished(self, url: str) -> None:
+        """Complete the frontier lease on ``url`` now; checkpoint it once its records are acknowledged.
+
+        Holding the lease until the sink acknowledges (in batches) would keep
+        the page in the frontier's ``remaining`` count, so this worker would
+        wait out its own lease and crawl the page again.
+        """
+
+        if self.frontier:
+            self.frontier.complete("page", url)
+        self._unacked.append(("page", url))
+        self._drain_acknowledged(0)
+
+    def _drain_acknowledged(self, count: int) -> List[str]:
+        details: List[str] = []
+        while self._unacked:
+            kind, key = self._unacked[0]
+            if kind == "detail":
+                if count <= 0:
+                    break
+                count -= 1
+            self._unacked.popleft()
+            if key is not None:
+                self._mark_done(kind, key)
+                if kind == "detail":
+                    details.append(key)
+        return details
+
+    async def acknowledge(self, count: int) -> None:
+        """Confirm that the next ``count`` yielded records (in yield order) are stored.
+
+        Detail URLs and listing pages are checkpointed, and detail URLs
+        added to the cross-run dedup index, only once their records are
+        acknowledged, so a crash or failed write between yield and storage
+        re-crawls them instead of skipping them for good.
+        """
+
+        details = self._drain_acknowledged(count)
+        if self.dedup and details:
+            await asyncio.to_thread(self.dedup.add_many, details)
 
     async def fetch_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> dict:
-        response_text = await self._request("GET", url, params=params)
+        response_text = await self.fetch_text(url, params=params)
         return json.loads(response_text)
 
-    async def fetch_text(self, url: str, params: Optional[Dict[str, Any]] = None) -> str:
-        return await self._request("GET", url, params=params)
+    async def fetch_text(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        immutable: bool = False,
+    ) -> str:
+        """GET ``url`` through the response cache.
+
+        ``immutable`` pages (court documents, published articles) are served
+        from cache without a request once stored; other pages are revalidated
+        with ``If-None-Match`` / ``If-Modified-Since``.
+        """
+
+        if not self.cache:
+            return await self._request("GET", url, params=params)
+
+        key = ResponseCache.key("GET", url, params)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached and (cached.immutable or immutable):
+            return cached.body
+
+        headers = cached.conditional_headers() if cached else {}
+        response = await self._send("GET", url, params=params, headers=headers)
+        if response.status == 304 and cached:
+            await asyncio.to_thread(self.cache.refresh, key)
+            return cached.body
+        await asyncio.to_thread(
+            self.cache.put,
+            key,
+            url,
+            response.text,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            immutable,
+        )
+        return response.text
+
+    async def _parse(self, func: Callable[..., R], html: str, *args: Any) -> R:
+        """Run a module-level parse function on ``html`` in the parse pool.
+
+        ``func`` must be picklable and return plain data (dicts, lists, str).
+        """
+
+        executor = get_parse_executor()
+        if executor is None:
+            return func(html, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, html, *args))
+
+    async def _parse_many(self, func: Callable[[str], R], pages: Sequence[str]) -> List[R]:
+        """Parse a group of fetched pages, shipping them to workers ``chunksize`` at a time."""
+
+        executor = get_parse_executor()
+        if executor is None:
+            return [func(html) for html in pages]
+        chunksize = max(1, get_section("parsing", ParseSettings()).chunksize)
+        return await asyncio.to_thread(lambda: list(executor.map(func, pages, chunksize=chunksize)))
+
+    async def _bounded_map(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        window: Optional[int] = None,
+        ordered: Optional[bool] = None,
+    ) -> AsyncIterator[R]:
+        """Run ``func`` over ``items`` keeping at most ``window`` calls in flight.
+
+        Results stream out as soon as they complete, or in input order when
+        ``ordered`` is set. Pending calls are cancelled if the consumer stops early.
+        """
+
+        window = max(1, window or self.concurrency)
+        ordered = self.ordered if ordered is None else ordered
+        iterator = iter(items)
+        in_flight: Deque[asyncio.Future] = deque(
+            asyncio.ensure_future(func(item)) for item in itertools.islice(iterator, window)
+        )
+        try:
+            while in_flight:
+                if ordered:
+                    task = in_flight.popleft()
+                    await asyncio.wait([task])
+                else:
+                    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    task = next(t for t in in_flight if t in done)
+                    in_flight.remove(task)
+                for item in itertools.islice(iterator, 1):
+                    in_flight.append(asyncio.ensure_future(func(item)))
+                yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
 
     @tenacity.retry(
         stop=tenacity.stop_after_attempt(settings.request_policy.max_retries),
         wait=tenacity.wait_exponential(multiplier=settings.request_policy.backoff_factor),
         reraise=True,
     )
-    async def _request(self, method: str, url: str, **kwargs) -> str:
+    async def _send(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> HttpResponse:
         if not self.session:
-            raise RuntimeError("ClientSession not initialized. Use async context manager.")
+            raise RuntimeError("Session not initialized. Use async context manager.")
 
-        proxy = self.proxy_manager.next_proxy() if settings.proxy.enabled else None
+        # Only pool-chosen proxies are scored; an explicit ``proxy=`` is left alone.
+        proxy = self.proxy_manager.next_proxy() if settings.proxy.enabled and "proxy" not in kwargs else None
         if proxy:
-            kwargs.setdefault("proxy", proxy)
-
-        headers = {"User-Agent": random.choice(self.user_agents)}
-        async with self.session.request(method, url, headers=headers, **kwargs) as resp:
-            resp.raise_for_status()
-            text = await resp.text()
-            await asyncio.sleep(_sleep_interval())
-            return text
+            kwargs["proxy"] = proxy
+
+        headers = {"User-Agent": random.choice(self.user_agents), **(headers or {})}
+        await self.rate_limiter.acquire(url)
+        started = time.monotonic()
+        try:
+            async with self.session.request(method, url, headers=headers, **kwargs) as resp:
+                if proxy:
+                    self.proxy_manager.record(proxy, resp.status, time.monotonic() - started)
+                resp.raise_for_status()
+                return HttpResponse(resp.status, await resp.text(), resp.headers)
+        except TRANSPORT_ERRORS:
+            if proxy:
+                self.proxy_manager.mark_failure(proxy)
+            raise
+
+    async def _request(self, method: str, url: str, **kwargs) -> str:
+        response = await self._send(method, url, **kwargs)
+        return response.text
 
     @abstractmethod
     async def crawl(self, **kwargs) -> Iterable[dict]:
@@ -3,33 +3,60 @@
 from __future__ import annotations
 
 import asyncio
-from typing import AsyncGenerator
-
-from pyquery import PyQuery as pq
+from typing import AsyncGenerator, List, Optional, Tuple
 
 from .base_crawler import BaseCrawler
-from ..utils.browser import fetch_dynamic_html
+from ..utils.browser import BrowserPool, ReadyCondition
+from ..utils.extraction_specs import HOUSING_LISTING
+from ..utils.html_parser import extract
 
 LIST_URL = "https://bj.lianjia.com/ershoufang/pg{page}/"
+LISTING_READY = ReadyCondition(selector="li.clear", timeout=10.0)
 
 
 class HousingCrawler(BaseCrawler):
     name = "housing"
 
-    async def crawl(self, max_pages: int = 100) -> AsyncGenerator[dict, None]:
-        for page in range(1, max_pages + 1):
-            url = LIST_URL.format(page=page)
-            html = await asyncio.to_thread(fetch_dynamic_html, url)
-            for record in self._parse_page(html):
-                yield record
-
-    def _parse_page(self, html: str):
-        doc = pq(html)
-        for item in doc("li.clear").items():
-            yield {
-                "community": item.find(".positionInfo a").text(),
-                "address": item.find(".positionInfo a").attr("title"),
-                "price": item.find(".totalPrice span").text(),
-                "area": item.find(".houseInfo").text(),
-                "deal_date": item.find(".dealDate").text(),
-            }
+    async def crawl(self, max_pages: int = 100, workers: Optional[int] = None) -> AsyncGenerator[dict, None]:
+        pool = BrowserPool(size=workers)
+
+        async def fetch_page(url: str) -> Tuple[str, str]:
+            await self.rate_limiter.acquire(url)
+            return url, await asyncio.to_thread(pool.fetch, url, LISTING_READY)
+
+        try:
+            await self._begin_run()
+            urls = [LIST_URL.format(page=page) for page in range(1, max_pages + 1)]
+            async for batch in self._page_batches(urls, batch_size=pool.size):
+                pages: List[Tuple[str, str]] = []
+                remaining = len(batch)
+                async for page in self._bounded_map(fetch_page, batch, window=pool.size, ordered=True):
+                    pages.append(page)
+                    if len(pages) == min(pool.size, remaining):
+                        # Parse a window of pages together while the next window is being fetched.
+                        parsed = await self._parse_many(_parse_page, [html for _, html in pages])
+                        for (url, _), records in zip(pages, parsed):
+                            for record in records:
+                                self._record_yielded()
+                                yield record
+                            self._page_finished(url)
+                        remaining -= len(pages)
+                        pages = []
+        finally:
+            # Quitting the drivers blocks on chromedriver; keep it off the event loop.
+            await asyncio.to_thread(pool.close)
+
+
+def _parse_page(html: str) -> List[dict]:
+    """Parse one listing page; module level so the parse pool can pickle it."""
+
+    return [
+        {
+            "community": row["community"],
+            "address": row["address"],
+            "price": row["price"],
+            "area": row["house_info"],
+            "deal_date": row["deal_date"],
+        }
+        for row in extract(HOUSING_LISTING, html)
+    ]
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
-
+from ..utils.data_parser import detect_charge
+from ..utils.extraction_specs import LEGAL_DETAIL, LEGAL_LISTING
+from ..utils.gazetteer import location_columns
+from ..utils.html_parser import extract, extract_one
 from .base_crawler import BaseCrawler
 
 BASE_URL = "https://www.bjcourt.gov.cn/bjws/bsal/"  # Example listing page
@@ -16,59 +18,56 @@ class LegalCrawler(BaseCrawler):
     name = "legal"
 
     async def crawl(self, max_pages: int = 5) -> AsyncGenerator[dict, None]:
-        for page in range(1, max_pages + 1):
-            url = f"{BASE_URL}?page={page}"
-            html = await self.fetch_text(url)
-            soup = BeautifulSoup(html, "lxml")
-            for row in soup.select(".list li"):
-                record = await self._build_record(row)
-                if record:
-                    yield record
-
-    async def _build_record(self, row):
-        link = row.select_one("a")
-        if not link:
+        await self._begin_run()
+        async for batch in self._page_batches([f"{BASE_URL}?page={page}" for page in range(1, max_pages + 1)]):
+            for url in batch:
+                html = await self.fetch_text(url)
+                rows = await self._parse(_parse_page, html)
+                async for record in self._bounded_map(self._build_record, rows):
+                    if record:
+                        self._record_yielded(record["detail_url"])
+                        yield record
+                self._page_finished(url)
+
+    async def _build_record(self, row: dict):
+        detail_url = urljoin(BASE_URL, row["href"])
+        if await self._skip_detail(detail_url):
             return None
-        detail_url = urljoin(BASE_URL, link["href"])
-        detail_html = await self.fetch_text(detail_url)
-        detail = self._parse_detail(detail_html)
+        detail_html = await self.fetch_text(detail_url, immutable=True)
+        detail = await self._parse(_parse_detail, detail_html)
         return {
-            "title": link.get_text(strip=True),
+            "title": row["title"],
             "case_type": "刑事",
-            "judgment_date": row.select_one("span").get_text(strip=True) if row.select_one("span") else None,
+            "judgment_date": row["judgment_date"],
             "detail_url": detail_url,
             **detail,
         }
 
-    def _parse_detail(self, html: str):
-        soup = BeautifulSoup(html, "lxml")
-        body = soup.select_one(".article")
-        text = body.get_text("\n", strip=True) if body else ""
-        return {
-            "location": self._extract_location(text),
-            "charges": self._extract_charges(text),
-            "statutes": self._extract_statutes(text),
-            "content": text,
-        }
 
-    def _extract_location(self, text: str) -> str:
-        markers = ["北京市", "区", "县"]
-        for marker in markers:
-            idx = text.find(marker)
-            if idx != -1:
-                return text[max(0, idx - 12) : idx + len(marker)]
-        return ""
-
-    def _extract_charges(self, text: str) -> str:
-        keywords = ["盗窃", "故意伤害", "诈骗", "抢劫"]
-        for kw in keywords:
-            if kw in text:
-                return kw
-        return ""
-
-    def _extract_statutes(self, text: str) -> str:
-        start = text.find("《")
-        end = text.find("法")
-        if start != -1 and end != -1 and end > start:
-            return text[start : end + 1]
-        return ""
+# Parse functions live at module level so the parse pool can pickle them.
+
+
+def _parse_page(html: str) -> List[dict]:
+    return [row for row in extract(LEGAL_LISTING, html) if row["href"]]
+
+
+def _parse_detail(html: str) -> dict:
+    text = extract_one(LEGAL_DETAIL, html)["content"] or ""
+    return {
+        **location_columns(text),
+        "charges": _extract_charges(text),
+        "statutes": _extract_statutes(text),
+        "content": text,
+    }
+
+
+def _extract_charges(text: str) -> str:
+    return detect_charge(text) or ""
+
+
+def _extract_statutes(text: str) -> str:
+    start = text.find("《")
+    end = text.find("法")
+    if start != -1 and end != -1 and end > start:
+        return text[start : end + 1]
+    return ""
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import logging
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, List, Optional
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
-
-from ..utils.data_parser import detect_disaster_type, extract_loss_info, parse_date
+from ..utils.data_parser import detect_disaster_type, extract_loss_info, loss_columns, parse_date
+from ..utils.extraction_specs import NEWS_DETAIL, NEWS_LISTING
+from ..utils.gazetteer import location_columns
+from ..utils.html_parser import extract, extract_one
+from ..utils.watermark import Watermark, date_floor, is_known, page_below
 from .base_crawler import BaseCrawler
 
+logger = logging.getLogger(__name__)
+
 BASE_URL = "http://www.north-news.cn/"
 
 
@@ -22,49 +27,69 @@ class NewsCrawler(BaseCrawler):
         start_date: datetime,
         end_date: datetime,
         max_pages: int = 20,
+        watermark: Optional[Watermark] = None,
     ) -> AsyncGenerator[dict, None]:
-        page = 1
-        while page <= max_pages:
-            url = f"{BASE_URL}news/node_{page}.htm"
-            html = await self.fetch_text(url)
-            soup = BeautifulSoup(html, "lxml")
-            for article in soup.select(".list li"):
-                record = await self._parse_article(article, start_date, end_date)
-                if record:
-                    yield record
-            page += 1
-
-    async def _parse_article(self, article, start: datetime, end: datetime):
-        title_el = article.select_one("a")
-        date_node = article.select_one("span")
-        if not title_el or not date_node:
-            return None
-        date_text = date_node.get_text(strip=True)
-        publish_date = parse_date(date_text)
+        """Yield articles published in ``[start_date, end_date]``, newest listing page first.
+
+        Pages are walked until one is entirely older than ``start_date`` or,
+        for incremental runs, than the stored ``watermark``.
+        """
+
+        await self._begin_run(f"{start_date:%Y%m%d}-{end_date:%Y%m%d}")
+        floor = date_floor(start_date, watermark)
+        urls = [f"{BASE_URL}news/node_{page}.htm" for page in range(1, max_pages + 1)]
+        async for batch in self._page_batches(urls):
+            for url in batch:
+                html = await self.fetch_text(url)
+                articles = await self._parse(_parse_page, html)
+                async for record in self._bounded_map(
+                    lambda article: self._parse_article(article, floor, end_date, watermark), articles
+                ):
+                    if record:
+                        self._record_yielded(record["url"])
+                        yield record
+                self._page_finished(url)
+                if page_below((article["publish_date"] for article in articles), floor):
+                    logger.info("Stopping at %s: every article predates %s", url, floor)
+                    return
+
+    async def _parse_article(
+        self, article: dict, start: datetime, end: datetime, watermark: Optional[Watermark] = None
+    ):
+        publish_date = article["publish_date"]
         if not publish_date or not (start <= publish_date <= end):
             return None
-        detail_url = urljoin(BASE_URL, title_el["href"])
-        detail_html = await self.fetch_text(detail_url)
-        body = self._extract_body(detail_html)
+        detail_url = urljoin(BASE_URL, article["href"])
+        if is_known(detail_url, publish_date, watermark) or await self._skip_detail(detail_url):
+            return None
+        detail_html = await self.fetch_text(detail_url, immutable=True)
+        detail = await self._parse(_parse_detail, detail_html)
         return {
-            "title": title_el.get_text(strip=True),
+            "title": article["title"],
             "url": detail_url,
             "publish_date": publish_date.isoformat(),
-            "location": self._extract_location(body),
-            "disaster_type": detect_disaster_type(body),
-            "loss": extract_loss_info(body),
-            "content": body,
+            **detail,
         }
 
-    def _extract_body(self, html: str) -> str:
-        soup = BeautifulSoup(html, "lxml")
-        body = soup.select_one(".article") or soup.select_one("#article")
-        return body.get_text("\n", strip=True) if body else ""
-
-    def _extract_location(self, text: str) -> str:
-        keywords = ["市", "区", "县"]
-        for token in keywords:
-            idx = text.find(token)
-            if 0 < idx < 20:
-                return text[idx - 20 : idx + 1]
-        return ""
+
+# Parse functions live at module level so the parse pool can pickle them.
+
+
+def _parse_page(html: str) -> List[dict]:
+    rows = [row for row in extract(NEWS_LISTING, html) if row["href"] and row["date_text"] is not None]
+    return [{**row, "publish_date": parse_date(row["date_text"])} for row in rows]
+
+
+def _parse_detail(html: str) -> dict:
+    body = _extract_body(html)
+    return {
+        **location_columns(body),
+        "disaster_type": detect_disaster_type(body),
+        "loss": extract_loss_info(body),
+        **loss_columns(body),
+        "content": body,
+    }
+
+
+def _extract_body(html: str) -> str:
+    return extract_one(NEWS_DETAIL, html)["content"] or ""
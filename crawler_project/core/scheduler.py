@@ -0,0 +1,149 @@
+"""Run several crawlers concurrently on one event loop.
+
+Jobs share the loop's transport session (one connection pool with a global
+and per-host connection cap, see ``utils.transport``) and the process-wide
+rate limiter, so adding a job never multiplies the load on a host.
+``parallelism`` caps how many jobs run at once. Each job streams its records
+into storage in batches written off the event loop and acknowledges each
+stored batch back to its crawler, which only then checkpoints it. The
+scheduler logs per-job progress and throughput while jobs run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from ..utils.config_loader import get_section
+from ..utils.storage_handler import StorageHandler
+from ..utils.transport import Session, acquire_session, release_session, transport_stats
+from .base_crawler import BaseCrawler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SchedulerSettings:
+    parallelism: int = 3  # jobs running at once
+    batch_size: int = 200  # records per storage write
+    report_seconds: float = 30.0
+
+
+@dataclass
+class CrawlJob:
+    name: str
+    crawler: Type[BaseCrawler]
+    table: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class JobProgress:
+    name: str
+    table: str
+    records: int = 0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Records stored per second."""
+
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def state(self) -> str:
+        if self.started is None:
+            return "queued"
+        if self.finished is None:
+            return "running"
+        return "failed" if self.error else "done"
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.state}, {self.records} records -> {self.table} "
+            f"in {self.elapsed:.1f}s ({self.throughput:.2f}/s)"
+        )
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        jobs: Sequence[CrawlJob],
+        storage: StorageHandler,
+        parallelism: Optional[int] = None,
+        config: Optional[SchedulerSettings] = None,
+        session: Optional[Session] = None,
+    ) -> None:
+        self.jobs = list(jobs)
+        self.storage = storage
+        self.config = config or get_section("scheduler", SchedulerSettings())
+        self.parallelism = max(1, parallelism or self.config.parallelism)
+        self.session = session
+        self.progress: Dict[str, JobProgress] = {job.name: JobProgress(job.name, job.table) for job in self.jobs}
+
+    async def run(self) -> List[JobProgress]:
+        """Run every job to completion; a failing job is logged and does not stop the rest."""
+
+        owns_session = self.session is None
+        session = self.session or await acquire_session()
+        slots = asyncio.Semaphore(self.parallelism)
+        reporter = asyncio.create_task(self._report())
+        try:
+            await asyncio.gather(*(self._run_job(job, session, slots) for job in self.jobs))
+        finally:
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+            if owns_session:
+                await release_session(session)
+        for progress in self.progress.values():
+            logger.info("%s", progress)
+        logger.info("Transport: %s", transport_stats().snapshot())
+        return list(self.progress.values())
+
+    async def _run_job(self, job: CrawlJob, session: Session, slots: asyncio.Semaphore) -> None:
+        progress = self.progress[job.name]
+        async with slots:
+            progress.started = time.monotonic()
+            logger.info("Starting %s -> %s", job.name, job.table)
+            try:
+                async with job.crawler(session=session) as crawler:
+                    batch: List[dict] = []
+                    try:
+                        async for record in crawler.crawl(**job.kwargs):
+                            batch.append(record)
+                            if len(batch) >= self.config.batch_size:
+                                full, batch = batch, []
+                                await self._store(crawler, progress, full)
+                    finally:
+                        # Also after a crawl error: the records yielded so far are complete.
+                        await self._store(crawler, progress, batch)
+            except Exception as exc:
+                progress.error = exc
+                logger.exception("Job %s failed after %s records", job.name, progress.records)
+            finally:
+                progress.finished = time.monotonic()
+
+    async def _store(self, crawler: BaseCrawler, progress: JobProgress, batch: List[dict]) -> None:
+        # Awaiting the write keeps at most one batch per job in memory.
+        if batch:
+            await asyncio.to_thread(self.storage.save_records, batch, progress.table)
+            progress.records += len(batch)
+            await crawler.acknowledge(len(batch))
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.report_seconds)
+            for progress in self.progress.values():
+                if progress.state == "running":
+                    logger.info("%s", progress)
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-import json
-from typing import AsyncGenerator, Dict, Iterable, List
+from typing import AsyncGenerator, Dict, Iterable, Iterator, List, Set
 
 import geopandas as gpd
 import pandas as pd
-from shapely.geometry import Point
 
 from ..config import settings
+from ..utils.config_loader import get_section
+from ..utils.coords import to_wgs84
+from ..utils.poi_tiling import PageRequest, Tile, TilingSettings, follow_ups, page_results, search_params, unseen
+from ..utils.spatial_index import points_geodataframe
 from .base_crawler import BaseCrawler
 
 BAIDU_POI_URL = "http://api.map.baidu.com/place/v2/search"
@@ -19,29 +21,38 @@ class SpatialCrawler(BaseCrawler):
     name = "spatial"
 
     async def crawl(self, bounds: Dict[str, float], category: str) -> AsyncGenerator[dict, None]:
-        params = {
-            "query": category,
-            "bounds": f"{bounds['southwest']},{bounds['northeast']}",
-            "output": "json",
-            "ak": settings.api_keys.baidu_map,
-        }
-        response = await self.fetch_text(BAIDU_POI_URL, params=params)
-        payload = json.loads(response)
-        for poi in payload.get("results", []):
-            coordinate = self._to_wgs84(poi["location"]["lng"], poi["location"]["lat"])
+        """Yield every POI of ``category`` inside ``bounds``, tiling around the result cap."""
+
+        tiling = get_section("poi_tiling", TilingSettings())
+        seen: Set[str] = set()
+        pending = [PageRequest(Tile.from_corners(bounds["southwest"], bounds["northeast"]))]
+        while pending:
+            scheduled, pending = pending, []
+
+            async def fetch(request: PageRequest):
+                params = search_params(category, request, settings.api_keys.baidu_map, tiling)
+                return request, await self.fetch_json(BAIDU_POI_URL, params=params)
+
+            async for request, payload in self._bounded_map(fetch, scheduled):
+                pending.extend(follow_ups(payload, request, tiling))
+                results = list(unseen(page_results(payload, request), seen))
+                for record in self._records(results, category):
+                    yield record
+
+    def _records(self, results: List[dict], category: str) -> Iterator[dict]:
+        # Baidu returns BD-09 coordinates; convert the whole page in one call.
+        lngs, lats = to_wgs84(
+            [poi["location"]["lng"] for poi in results], [poi["location"]["lat"] for poi in results], "bd09"
+        )
+        for poi, lng, lat in zip(results, lngs.tolist(), lats.tolist()):
             yield {
+                "uid": poi.get("uid"),
                 "name": poi["name"],
                 "category": category,
-                "longitude": coordinate[0],
-                "latitude": coordinate[1],
+                "longitude": lng,
+                "latitude": lat,
                 "address": poi.get("address"),
             }
 
-    def _to_wgs84(self, lng: float, lat: float):
-        # Placeholder for real conversion logic
-        return lng, lat
-
     def to_geodataframe(self, records: Iterable[dict]) -> gpd.GeoDataFrame:
-        df = pd.DataFrame(records)
-        geometry = [Point(lon, lat) for lon, lat in zip(df["longitude"], df["latitude"])]
-        return gpd.GeoDataFrame(df, geometry=geometry, crs=f"EPSG:{settings.grid.srid}")
+        return points_geodataframe(pd.DataFrame(records), crs=f"EPSG:{settings.grid.srid}")
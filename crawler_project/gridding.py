@@ -0,0 +1,117 @@
+"""Aggregate stored point records onto the 5 km grid and write GeoJSON or Postgres.
+
+Rows are streamed from the source table ``--chunk-size`` at a time, so
+memory is bounded by the number of occupied cells::
+
+    python -m crawler_project.gridding spatial_poi --geojson poi_grid
+    python -m crawler_project.gridding news_events --output-table news_grid --cell-size 1000
+
+``housing_market`` is not a source: listings carry no coordinates, and the
+only place in them is a district name, so gazetteer geocoding would stack a
+whole district on its centroid cell.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy import MetaData, Table, select
+
+from .config import settings
+from .utils.config_loader import get_section, load_settings
+from .utils.grid import GridAggregator, GridSettings, GridSpec
+from .utils.storage_handler import StorageHandler
+
+logger = logging.getLogger(__name__)
+
+
+class GridSource(NamedTuple):
+    values: Tuple[str, ...] = ()
+    by: Optional[str] = None
+    lng: str = "longitude"
+    lat: str = "latitude"
+
+
+SOURCES: Dict[str, GridSource] = {
+    "spatial_poi": GridSource(by="category"),
+    "news_events": GridSource(values=("deaths", "injuries", "economic_loss_yuan"), by="disaster_type"),
+    "legal_cases": GridSource(by="charges"),
+}
+
+
+def iter_points(storage: StorageHandler, table: str, source: GridSource, chunk_size: int) -> Iterator[pd.DataFrame]:
+    target = Table(table, MetaData(), autoload_with=storage.engine)
+    columns = [source.lng, source.lat, *source.values] + ([source.by] if source.by else [])
+    missing = [column for column in dict.fromkeys(columns) if column not in target.c]
+    if missing:
+        raise ValueError(f"Table {table} cannot be gridded: no column {', '.join(missing)}")
+    query = select(*(target.c[column] for column in dict.fromkeys(columns))).where(
+        target.c[source.lng].is_not(None), target.c[source.lat].is_not(None)
+    )
+    with storage.engine.connect() as conn:
+        streaming = conn.execution_options(stream_results=True, max_row_buffer=chunk_size)
+        yield from pd.read_sql_query(query, streaming, chunksize=chunk_size)
+
+
+def build_grid(
+    storage: StorageHandler,
+    table: str,
+    source: Optional[GridSource] = None,
+    spec: Optional[GridSpec] = None,
+    chunk_size: Optional[int] = None,
+) -> GridAggregator:
+    source = source or SOURCES.get(table, GridSource())
+    spec = spec or GridSpec.from_settings()
+    chunk_size = chunk_size or get_section("gridding", GridSettings()).chunk_size
+    aggregator = GridAggregator(spec, source.values, source.by)
+    for frame in iter_points(storage, table, source, chunk_size):
+        aggregator.add_frames([frame], source.lng, source.lat)
+        logger.info("Gridded %s points from %s", aggregator.points, table)
+    return aggregator
+
+
+def main(argv: Optional[Sequence[str]] = None) -> GridAggregator:
+    parser = argparse.ArgumentParser(description="Aggregate point records onto a square grid")
+    parser.add_argument("table", help=f"source table, e.g. {', '.join(SOURCES)}")
+    parser.add_argument("--cell-size", type=int, help="cell edge in metres (default gridding.cell_size_m)")
+    parser.add_argument("--crs", help="projected CRS for the grid (default gridding.crs)")
+    parser.add_argument("--values", nargs="*", help="numeric columns to sum/average per cell")
+    parser.add_argument("--by", help="category column to split cells by; 'none' to disable")
+    parser.add_argument("--chunk-size", type=int)
+    parser.add_argument("--geojson", metavar="NAME", help="write <geojson_dir>/NAME.geojson")
+    parser.add_argument("--output-table", help="replace this Postgres table with the grid")
+    parser.add_argument("--postgres-dsn")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_settings()
+    cfg = get_section("gridding", GridSettings())
+    spec = GridSpec(args.cell_size or cfg.cell_size_m, args.crs or cfg.crs)
+    source = SOURCES.get(args.table, GridSource())
+    if args.values is not None:
+        source = source._replace(values=tuple(args.values))
+    if args.by:
+        source = source._replace(by=None if args.by == "none" else args.by)
+
+    storage = StorageHandler(args.postgres_dsn)
+    aggregator = build_grid(storage, args.table, source, spec, args.chunk_size)
+    output_crs = f"EPSG:{settings.grid.srid}"
+    if args.geojson:
+        path = storage.save_geojson(aggregator.to_geodataframe(output_crs), args.geojson)
+        logger.info("Wrote %s", path)
+    if args.output_table:
+        cells = aggregator.to_geodataframe(output_crs)
+        frame = pd.DataFrame(cells.drop(columns="geometry"))
+        frame["geometry_wkt"] = cells.geometry.to_wkt()
+        frame["srid"] = settings.grid.srid
+        storage.save_dataframe(frame, args.output_table, if_exists="replace")
+        logger.info("Wrote %s cells to %s", len(frame), args.output_table)
+    print(f"{aggregator.points} points in {len(aggregator.result())} cells")
+    return aggregator
+
+
+if __name__ == "__main__":
+    main()
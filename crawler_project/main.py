@@ -0,0 +1,120 @@
+"""Command-line entry point running one or more core crawlers into storage::
+
+    python -m crawler_project.main news --start-date 2015-01-01 --end-date 2015-12-31 --table news_events
+    python -m crawler_project.main news spatial housing --parallelism 3 --postgres-dsn postgresql+psycopg2://...
+    python -m crawler_project.main news --incremental
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Type
+
+from .core.base_crawler import BaseCrawler, shutdown_parse_executor
+from .core.housing_crawler import HousingCrawler
+from .core.legal_crawler import LegalCrawler
+from .core.news_crawler import BASE_URL as NEWS_BASE_URL
+from .core.news_crawler import NewsCrawler
+from .core.scheduler import CrawlJob, JobScheduler, SchedulerSettings
+from .core.spatial_crawler import SpatialCrawler
+from .utils.config_loader import get_section, load_settings
+from .utils.storage_handler import StorageHandler
+from .utils.watermark import load_watermark
+
+logger = logging.getLogger(__name__)
+
+
+def _news_kwargs(args: argparse.Namespace, storage: Optional[StorageHandler], table: str) -> Dict[str, Any]:
+    end = args.end_date or datetime.combine(date.today(), datetime.max.time())
+    kwargs: Dict[str, Any] = {"end_date": end, **_paged_kwargs(args, storage, table)}
+    if args.incremental and storage is not None:
+        kwargs["watermark"] = load_watermark(storage.engine, table, url_prefix=NEWS_BASE_URL)
+        logger.info("News watermark: %s", kwargs["watermark"] and kwargs["watermark"].publish_date)
+    # Incremental runs without --start-date reach back to the watermark, however old.
+    default_start = datetime.min if args.incremental else end - timedelta(days=30)
+    kwargs["start_date"] = args.start_date or default_start
+    return kwargs
+
+
+def _spatial_kwargs(args: argparse.Namespace, storage: Optional[StorageHandler], table: str) -> Dict[str, Any]:
+    southwest, northeast = args.bounds.split(";")
+    return {"bounds": {"southwest": southwest, "northeast": northeast}, "category": args.category}
+
+
+def _paged_kwargs(args: argparse.Namespace, storage: Optional[StorageHandler], table: str) -> Dict[str, Any]:
+    return {"max_pages": args.max_pages} if args.max_pages else {}
+
+
+class JobType(NamedTuple):
+    crawler: Type[BaseCrawler]
+    table: str
+    kwargs: Callable[[argparse.Namespace, Optional[StorageHandler], str], Dict[str, Any]]
+
+
+# Tables match the Scrapy spiders so both entry points feed the same data.
+JOB_TYPES: Dict[str, JobType] = {
+    "news": JobType(NewsCrawler, "news_events", _news_kwargs),
+    "spatial": JobType(SpatialCrawler, "spatial_poi", _spatial_kwargs),
+    "housing": JobType(HousingCrawler, "housing_market", _paged_kwargs),
+    "legal": JobType(LegalCrawler, "legal_cases", _paged_kwargs),
+}
+
+
+def _date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def build_jobs(args: argparse.Namespace, storage: Optional[StorageHandler] = None) -> List[CrawlJob]:
+    jobs = []
+    for name in dict.fromkeys(args.jobs):
+        job_type = JOB_TYPES[name]
+        table = args.table or job_type.table
+        jobs.append(CrawlJob(name, job_type.crawler, table, job_type.kwargs(args, storage, table)))
+    return jobs
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run crawlers concurrently and store their records")
+    parser.add_argument("jobs", nargs="+", choices=sorted(JOB_TYPES), help="crawlers to run")
+    parser.add_argument("--parallelism", type=int, help="jobs running at once (default scheduler.parallelism)")
+    parser.add_argument("--postgres-dsn")
+    parser.add_argument("--table", help="target table; only valid with a single job")
+    parser.add_argument("--start-date", type=_date, help="news: first publish date, YYYY-MM-DD (default 30 days ago)")
+    parser.add_argument("--end-date", type=_date, help="news: last publish date, YYYY-MM-DD (default today)")
+    parser.add_argument(
+        "--incremental", action="store_true", help="news: stop at the newest article already in the table"
+    )
+    parser.add_argument("--max-pages", type=int, help="news/legal/housing: listing pages to crawl")
+    parser.add_argument("--category", default="学校", help="spatial: POI query")
+    parser.add_argument("--bounds", default="39.5,116.2;41.0,117.4", help="spatial: 'lat,lng;lat,lng' (SW;NE)")
+    parser.add_argument("--batch-size", type=int, help="records per storage write")
+    args = parser.parse_args(argv)
+    if args.table and len(set(args.jobs)) > 1:
+        parser.error("--table can only be used with a single job")
+    if args.end_date:
+        args.end_date = datetime.combine(args.end_date.date(), datetime.max.time())
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_settings()
+    config = get_section("scheduler", SchedulerSettings())
+    if args.batch_size:
+        config.batch_size = args.batch_size
+
+    storage = StorageHandler(args.postgres_dsn)
+    scheduler = JobScheduler(build_jobs(args, storage), storage, args.parallelism, config)
+    try:
+        results = asyncio.run(scheduler.run())
+    finally:
+        shutdown_parse_executor()
+    return 1 if any(progress.error for progress in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
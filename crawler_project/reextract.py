@@ -0,0 +1,146 @@
+"""Re-run text extraction over stored rows after ``utils/data_parser`` rules change.
+
+Rows are read in key order, ``--chunk-size`` at a time, re-derived with the
+batch extractors and written back only where a value actually changed::
+
+    python -m crawler_project.reextract --table news_events --chunk-size 20000
+    python -m crawler_project.reextract --fields publish_date --date-column publish_date --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+from sqlalchemy import MetaData, Table, select
+from sqlalchemy.engine import Engine
+
+from .utils.batch_extraction import (
+    detect_disaster_type_batch,
+    extract_loss_info_batch,
+    loss_columns_batch,
+    parse_date_batch,
+)
+from .utils.config_loader import load_settings
+from .utils.data_parser import LOSS_COLUMNS
+from .utils.storage_handler import StorageHandler
+
+logger = logging.getLogger(__name__)
+
+EXTRACTORS: Dict[str, Callable[[Any], Union[pd.Series, pd.DataFrame]]] = {
+    "disaster_type": detect_disaster_type_batch,
+    "loss": extract_loss_info_batch,
+    "loss_columns": loss_columns_batch,
+    "publish_date": parse_date_batch,
+}
+# Fields whose extractor returns several columns; the rest write one column named after the field.
+FIELD_COLUMNS: Dict[str, Dict[str, Any]] = {
+    "loss_columns": {column: 0.0 if column == "economic_loss_yuan" else 0 for column in LOSS_COLUMNS},
+}
+
+
+def iter_chunks(engine: Engine, table: str, key: str, columns: Sequence[str], chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Keyset-paginate ``table`` by ``key`` so no cursor stays open between chunks."""
+
+    target = Table(table, MetaData(), autoload_with=engine)
+    selected = [target.c[column] for column in dict.fromkeys([key, *columns])]
+    last = None
+    while True:
+        query = select(*selected).order_by(target.c[key]).limit(chunk_size)
+        if last is not None:
+            query = query.where(target.c[key] > last)
+        with engine.connect() as conn:
+            chunk = pd.read_sql_query(query, conn)
+        if chunk.empty:
+            return
+        yield chunk
+        last = chunk[key].iloc[-1]
+
+
+def _stored(field: str, value: Any) -> Any:
+    """Bring a value to the shape the crawlers persist, for change detection."""
+
+    if value is None or (not isinstance(value, (str, dict, list)) and pd.isna(value)):
+        return None
+    if hasattr(value, "item"):  # NumPy scalars from nullable integer/float columns
+        value = value.item()
+    if field == "loss" and isinstance(value, str):
+        return json.loads(value)
+    if field == "publish_date" and isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def reextract(
+    storage: StorageHandler,
+    table: str = "news_events",
+    key: str = "url",
+    fields: Sequence[str] = ("disaster_type", "loss"),
+    text_column: str = "content",
+    date_column: Optional[str] = None,
+    chunk_size: int = 20_000,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Re-derive ``fields`` for every row of ``table``; returns scanned/changed counts."""
+
+    sources = {field: (date_column if field == "publish_date" else text_column) for field in fields}
+    if sources.get("publish_date") is None and "publish_date" in sources:
+        raise ValueError("publish_date needs --date-column (the stored column holding the date, e.g. publish_date)")
+    for field in fields:
+        if field in FIELD_COLUMNS:
+            storage.add_missing_columns(table, [FIELD_COLUMNS[field]])
+    columns = [column for field in fields for column in FIELD_COLUMNS.get(field, [field])]
+    stats = {"scanned": 0, "changed": 0}
+    for chunk in iter_chunks(storage.engine, table, key, [*sources.values(), *columns], chunk_size):
+        derived: Dict[str, pd.Series] = {}
+        for field, source in sources.items():
+            result = EXTRACTORS[field](chunk[source])
+            derived.update(result.items() if isinstance(result, pd.DataFrame) else [(field, result)])
+        updates: List[List[Any]] = []
+        for position in range(len(chunk)):
+            new = [_stored(column, derived[column].iat[position]) for column in columns]
+            old = [_stored(column, chunk[column].iat[position]) for column in columns]
+            if new != old:
+                updates.append([chunk[key].iat[position], *new])
+        if updates and not dry_run:
+            storage.update_rows(table, [key], columns, updates)
+        stats["scanned"] += len(chunk)
+        stats["changed"] += len(updates)
+        logger.info("Re-extracted %s rows of %s, %s changed", stats["scanned"], table, stats["changed"])
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, int]:
+    parser = argparse.ArgumentParser(description="Re-run data_parser extraction over a stored table")
+    parser.add_argument("--table", default="news_events")
+    parser.add_argument("--key", default="url", help="unique column used for paging and updates")
+    parser.add_argument("--fields", nargs="+", choices=sorted(EXTRACTORS), default=["disaster_type", "loss"])
+    parser.add_argument("--text-column", default="content")
+    parser.add_argument("--date-column", help="stored date column, e.g. publish_date; required for publish_date")
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    parser.add_argument("--postgres-dsn")
+    parser.add_argument("--dry-run", action="store_true", help="count changes without writing them")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_settings()
+    stats = reextract(
+        StorageHandler(args.postgres_dsn),
+        table=args.table,
+        key=args.key,
+        fields=args.fields,
+        text_column=args.text_column,
+        date_column=args.date_column,
+        chunk_size=args.chunk_size,
+        dry_run=args.dry_run,
+    )
+    print(f"scanned {stats['scanned']} rows, {stats['changed']} changed")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from scrapy.dupefilters import RFPDupeFilter
+
+from crawler_project.utils.dedup import UrlDedupIndex, get_dedup_index
+
+
+class PersistentUrlDupeFilter(RFPDupeFilter):
+    """In-memory request fingerprints plus the shared cross-run URL index.
+
+    Only requests flagged with ``meta["dedup"]`` (detail pages) consult the
+    persistent index; listing pages change between runs and must be refetched.
+    URLs are added to the index by ``PostgresPipeline`` once their items are stored.
+    """
+
+    index: UrlDedupIndex | None = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        dupefilter = super().from_crawler(crawler)
+        if crawler.settings.getbool("DEDUP_ENABLED", True):
+            dupefilter.index = get_dedup_index()
+        return dupefilter
+
+    def request_seen(self, request) -> bool:
+        if request.meta.get("dedup") and self.index is not None and self.index.seen(request.url):
+            return True
+        return super().request_seen(request)
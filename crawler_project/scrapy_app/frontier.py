@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import scrapy
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
+from scrapy.utils.defer import deferred_to_future
+from twisted.internet import threads
+
+from crawler_project.utils.frontier import CrawlFrontier
+
+
+class FrontierSpiderMixin:
+    """Lease listing pages from the shared crawl frontier instead of a fixed local range.
+
+    With ``frontier.enabled`` every node seeds the same pages and requests only
+    the ones it leases; on ``spider_idle`` it leases more and stays open while
+    other nodes still hold unfinished pages. Download delays are scaled by the
+    number of active nodes so the combined rate per host stays as configured.
+    Runs are scoped by ``-a run_id=...`` (default: spider name and today's date).
+
+    Detail URLs claimed with :meth:`claim_details` are requested through
+    :meth:`detail_request`: the detail callback marks them done with
+    :meth:`complete_detail` and a failed fetch releases the claim. Apart from
+    the initial seed and lease in ``start_requests``, frontier store calls
+    run in Twisted's thread pool, off the reactor thread.
+    """
+
+    frontier: Optional[CrawlFrontier] = None
+    pages_exhausted = False  # set by a spider that reached the end of what it wants
+    _page_callback: Optional[Callable] = None
+    _leasing = None  # Deferred of the lease running in the thread pool
+    _frontier_drained = False
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        run_id = getattr(spider, "run_id", None) or date.today().isoformat()
+        spider.frontier = CrawlFrontier.from_settings(spider.name, run_id)
+        if spider.frontier is not None:
+            spider._base_delay = crawler.settings.getfloat("DOWNLOAD_DELAY")
+            crawler.signals.connect(spider._lease_more, signal=signals.spider_idle)
+            crawler.signals.connect(spider._close_frontier, signal=signals.spider_closed)
+        return spider
+
+    def page_requests(self, urls: Iterable[str], callback: Callable) -> Iterator[scrapy.Request]:
+        if self.frontier is None:
+            for url in urls:
+                yield scrapy.Request(url, callback=callback)
+            return
+        self._page_callback = callback
+        self.frontier.seed("page", list(urls))
+        yield from self._leased_requests()
+
+    async def claim_details(self, urls: List[str]) -> Set[str]:
+        """The subset of ``urls`` this node may fetch; other nodes hold or finished the rest."""
+
+        if self.frontier is None:
+            return set(urls)
+        return set(await deferred_to_future(threads.deferToThread(self._claim_all, urls)))
+
+    def _claim_all(self, urls: List[str]) -> List[str]:
+        return [url for url in urls if self.frontier.claim("detail", url)]
+
+    def detail_request(self, response, url: str, callback: Callable, **kwargs) -> scrapy.Request:
+        """Follow a claimed detail ``url``; a failed fetch hands the claim back."""
+
+        meta = {**kwargs.pop("meta", {}), "frontier_detail": url}
+        return response.follow(url, callback=callback, errback=self._release_detail, meta=meta, **kwargs)
+
+    def complete_detail(self, response) -> None:
+        if self.frontier is not None:
+            self.frontier.complete("detail", response.meta["frontier_detail"])
+
+    def _release_detail(self, failure):
+        if self.frontier is not None:
+            return threads.deferToThread(self.frontier.release, "detail", [failure.request.meta["frontier_detail"]])
+
+    def _leased_requests(self) -> Iterator[scrapy.Request]:
+        urls = self.frontier.lease("page")
+        if urls:
+            self._scale_delay(self.frontier.active_workers())
+        yield from self._requests_for(urls)
+
+    def _requests_for(self, urls: List[str]) -> Iterator[scrapy.Request]:
+        for url in urls:
+            yield scrapy.Request(
+                url,
+                callback=self._parse_leased,
+                errback=self._release_leased,
+                dont_filter=True,
+                meta={"frontier_key": url},
+            )
+
+    async def _parse_leased(self, response):
+        output = self._page_callback(response)
+        if hasattr(output, "__aiter__"):
+            async for result in output:
+                yield result
+        else:
+            for result in output or ():
+                yield result
+        self.frontier.complete("page", response.meta["frontier_key"])  # buffered, written with the next lease
+
+    def _release_leased(self, failure):
+        return threads.deferToThread(self.frontier.release, "page", [failure.request.meta["frontier_key"]])
+
+    def _scale_delay(self, workers: int) -> None:
+        # Same knob AutoThrottle turns: existing slots and the default for new ones.
+        self.download_delay = self._base_delay * workers
+        try:
+            slots = self.crawler.engine.downloader.slots
+        except (AttributeError, RuntimeError):  # engine not started yet: no slots to update
+            return
+        for slot in slots.values():
+            slot.delay = self.download_delay
+
+    def _lease_more(self, spider):
+        if spider is not self or self.pages_exhausted or self._frontier_drained:
+            return
+        if self._leasing is None:
+            self._leasing = threads.deferToThread(self._lease_in_thread)
+            self._leasing.addCallback(self._schedule_leased)
+            self._leasing.addErrback(self._lease_failed)
+        raise DontCloseSpider
+
+    def _lease_in_thread(self) -> Tuple[List[str], int, int]:
+        urls = self.frontier.lease("page")
+        workers = self.frontier.active_workers() if urls else 0
+        return urls, workers, 0 if urls else self.frontier.remaining("page")
+
+    def _schedule_leased(self, leased: Tuple[List[str], int, int]) -> None:
+        self._leasing = None
+        urls, workers, remaining = leased
+        # Nothing leased and nothing left anywhere: let the next idle signal close the spider.
+        self._frontier_drained = not urls and not remaining
+        if urls:
+            self._scale_delay(workers)
+        for request in self._requests_for(urls):
+            self.crawler.engine.crawl(request)
+
+    def _lease_failed(self, failure) -> None:
+        self._leasing = None
+        self.logger.error("Leasing pages from the frontier failed: %s", failure.getErrorMessage())
+
+    def _close_frontier(self, spider):
+        if spider is self and self.frontier is not None:
+            return threads.deferToThread(self.frontier.close)
@@ -9,8 +9,19 @@ class NewsItem(scrapy.Item):
     publish_date = scrapy.Field()
     disaster_type = scrapy.Field()
     location = scrapy.Field()
+    admin_code = scrapy.Field()
+    longitude = scrapy.Field()
+    latitude = scrapy.Field()
     loss = scrapy.Field()
     content = scrapy.Field()
+    # typed totals from data_parser.extract_loss_details (counts, yuan)
+    deaths = scrapy.Field()
+    injuries = scrapy.Field()
+    missing = scrapy.Field()
+    trapped = scrapy.Field()
+    affected = scrapy.Field()
+    people = scrapy.Field()
+    economic_loss_yuan = scrapy.Field()
 
 
 class HousingItem(scrapy.Item):
@@ -29,12 +40,16 @@ class LegalItem(scrapy.Item):
     judgment_date = scrapy.Field()
     case_type = scrapy.Field()
     location = scrapy.Field()
+    admin_code = scrapy.Field()
+    longitude = scrapy.Field()
+    latitude = scrapy.Field()
     charges = scrapy.Field()
     law_articles = scrapy.Field()
     url = scrapy.Field()
 
 
 class PoiItem(scrapy.Item):
+    uid = scrapy.Field()
     name = scrapy.Field()
     category = scrapy.Field()
     latitude = scrapy.Field()
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import random
 
+from scrapy.exceptions import NotConfigured
+
 from crawler_project.config import settings as project_settings
+from crawler_project.utils.proxy_manager import PROXY_FAILURE_STATUSES, get_proxy_manager
 
 
 class ConfigUserAgentMiddleware:
@@ -18,3 +21,44 @@ class ConfigUserAgentMiddleware:
     def process_request(self, request, spider):
         request.headers.setdefault("User-Agent", random.choice(self.user_agents))
         return None
+
+
+class HealthScoredProxyMiddleware:
+    """Assign pool proxies to requests and feed outcomes back into their health scores."""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not project_settings.proxy.enabled:
+            raise NotConfigured("proxy.enabled is false")
+        return cls(get_proxy_manager())
+
+    def process_request(self, request, spider):
+        if "proxy" in request.meta:
+            return None
+        proxy = self.manager.next_proxy()
+        if proxy:
+            request.meta["proxy"] = proxy
+            request.meta["pool_proxy"] = proxy
+        return None
+
+    def process_response(self, request, response, spider):
+        proxy = request.meta.get("pool_proxy")
+        if proxy:
+            self.manager.record(proxy, response.status, request.meta.get("download_latency", 0.0))
+            if response.status in PROXY_FAILURE_STATUSES:
+                # RetryMiddleware copies this request for the retry; drop the blocked proxy from it.
+                request.meta.pop("proxy", None)
+                request.meta.pop("pool_proxy", None)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        proxy = request.meta.get("pool_proxy")
+        if proxy:
+            self.manager.mark_failure(proxy)
+            # Let a retry pick a fresh proxy instead of reusing the one that failed.
+            request.meta.pop("proxy", None)
+            request.meta.pop("pool_proxy", None)
+        return None
@@ -1,57 +1,223 @@
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+import time
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-import pandas as pd
+from scrapy.exceptions import DropItem
+from twisted.internet import threads
 
+from crawler_project.utils.dedup import UrlDedupIndex, get_dedup_index
 from crawler_project.utils.storage_handler import StorageHandler
 
 logger = logging.getLogger(__name__)
 
+Batch = Tuple[str, List[dict]]
+
 
 class PostgresPipeline:
-    """Batch items and persist via StorageHandler."""
+    """Batch items and persist via StorageHandler on a background writer thread.
+
+    Full batches go through a bounded queue so the reactor never waits on
+    Postgres; when the queue is full ``process_item`` returns a Deferred and
+    Scrapy stops feeding items until the writer catches up. Partial batches
+    older than ``flush_interval`` seconds are written by the writer itself.
+    Dedup lookups that need the exact store run in a thread as well; only a
+    miss in the warmed Bloom filter is answered inline.
 
-    def __init__(self, batch_size: int = 100) -> None:
+    A failed write is retried ``write_retries`` times with exponential
+    backoff. If it still fails the spider is closed, nothing more is written
+    and ``close_spider`` raises; URLs are only added to the dedup index once
+    their rows are stored, so the unwritten items are crawled again next run.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        dedup: UrlDedupIndex | None = None,
+        queue_size: int = 4,
+        flush_interval: float = 5.0,
+        write_retries: int = 3,
+        retry_backoff: float = 1.0,
+        crawler=None,
+    ) -> None:
         self.batch_size = batch_size
+        self.dedup = dedup
+        self.flush_interval = flush_interval
+        self.write_retries = max(0, write_retries)
+        self.retry_backoff = retry_backoff
+        self.crawler = crawler
         self.storage: StorageHandler | None = None
         self._buffers: Dict[str, List[dict]] = defaultdict(list)
+        self._buffer_started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Batch]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._writer: threading.Thread | None = None
+        self._closed = False
+        self._spider = None
+        self._error: BaseException | None = None
+        self._unwritten = 0
 
     @classmethod
     def from_crawler(cls, crawler):
         batch_size = crawler.settings.getint("PIPELINE_BATCH_SIZE", 100)
-        return cls(batch_size=batch_size)
+        dedup = get_dedup_index() if crawler.settings.getbool("DEDUP_ENABLED", True) else None
+        return cls(
+            batch_size=batch_size,
+            dedup=dedup,
+            queue_size=crawler.settings.getint("PIPELINE_QUEUE_SIZE", 4),
+            flush_interval=crawler.settings.getfloat("PIPELINE_FLUSH_INTERVAL", 5.0),
+            write_retries=crawler.settings.getint("PIPELINE_WRITE_RETRIES", 3),
+            retry_backoff=crawler.settings.getfloat("PIPELINE_RETRY_BACKOFF", 1.0),
+            crawler=crawler,
+        )
 
     def open_spider(self, spider):
         self.storage = StorageHandler()
+        self._closed = False
+        self._spider = spider
+        self._error = None
+        self._unwritten = 0
+        self._writer = threading.Thread(target=self._run_writer, name=f"pg-writer-{spider.name}", daemon=True)
+        self._writer.start()
         logger.info("Opened Postgres pipeline for spider %s", spider.name)
 
     def close_spider(self, spider):
-        self._flush_all(spider)
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            batches = [self._take(table) for table in list(self._buffers) if self._buffers[table]]
+        if self.crawler is not None:
+            # Joining the writer can take a while; keep it off the reactor thread.
+            return threads.deferToThread(self._drain, spider, batches)
+        self._drain(spider, batches)
+
+    def _drain(self, spider, batches: List[Batch]):
+        for batch in batches:
+            self._queue.put(batch)
+        self._queue.put(None)
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        if self._error is not None:
+            raise RuntimeError(
+                f"PostgresPipeline could not store {self._unwritten} rows for spider {spider.name}"
+            ) from self._error
         logger.info("Closed Postgres pipeline for spider %s", spider.name)
 
     def process_item(self, item, spider):
         table = getattr(spider, "table_name", f"{spider.name}_records")
         data = dict(item)
-        self._buffers[table].append(data)
-        if len(self._buffers[table]) >= self.batch_size:
-            self._flush_table(table)
+        url = data.get("url")
+        if self.dedup is not None and url and not self.dedup.definitely_new(url):
+            if self.crawler is not None:
+                # The exact lookup queries SQLite/Postgres; keep it off the reactor thread.
+                deferred = threads.deferToThread(self.dedup.seen, url)
+                deferred.addCallback(self._buffer_unseen, table, data, item)
+                return deferred
+            return self._buffer_unseen(self.dedup.seen(url), table, data, item)
+        return self._buffer(table, data, item)
+
+    def _buffer_unseen(self, seen: bool, table: str, data: dict, item):
+        if seen:
+            raise DropItem(f"Already ingested: {data['url']}")
+        return self._buffer(table, data, item)
+
+    def _buffer(self, table: str, data: dict, item):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PostgresPipeline received an item after close_spider")
+            buffer = self._buffers[table]
+            if not buffer:
+                self._buffer_started[table] = time.monotonic()
+            buffer.append(data)
+            batch = self._take(table) if len(buffer) >= self.batch_size else None
+        if batch is None:
+            return item
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            deferred = threads.deferToThread(self._queue.put, batch)
+            deferred.addCallback(lambda _: item)
+            return deferred
         return item
 
-    def _flush_table(self, table: str):
-        buffer = self._buffers.get(table)
-        if not buffer:
+    def _take(self, table: str) -> Batch:
+        """Detach the buffered rows of ``table``; caller holds the lock."""
+
+        rows = self._buffers.pop(table)
+        self._buffer_started.pop(table, None)
+        return table, rows
+
+    def _take_stale(self) -> List[Batch]:
+        deadline = time.monotonic() - self.flush_interval
+        with self._lock:
+            stale = [table for table, started in self._buffer_started.items() if started <= deadline]
+            return [self._take(table) for table in stale]
+
+    def _run_writer(self):
+        poll = max(0.01, min(self.flush_interval, 1.0))
+        while True:
+            try:
+                batch = self._queue.get(timeout=poll)
+            except queue.Empty:
+                batch = None
+            else:
+                if batch is None:
+                    return
+                self._flush_table(*batch)
+            for stale in self._take_stale():
+                self._flush_table(*stale)
+
+    def _flush_table(self, table: str, rows: List[dict]):
+        if not rows:
+            return
+        if self._error is not None:
+            self._unwritten += len(rows)
             return
+        try:
+            self._save(table, rows)
+        except Exception as exc:
+            logger.exception("Giving up on %s rows for %s", len(rows), table)
+            self._unwritten += len(rows)
+            self._fail(exc)
+            return
+        logger.info("Inserted %s rows into %s", len(rows), table)
+        if self.dedup is not None:
+            try:
+                self.dedup.add_many(row["url"] for row in rows if row.get("url"))
+            except Exception:
+                logger.exception("Failed to add %s URLs of %s to the dedup index", len(rows), table)
+
+    def _save(self, table: str, rows: List[dict]):
         assert self.storage is not None
-        df = pd.DataFrame(buffer)
-        if df.empty:
+        for attempt in range(self.write_retries + 1):
+            try:
+                self.storage.save_records(rows, table)
+                return
+            except Exception:
+                if attempt == self.write_retries:
+                    raise
+                delay = self.retry_backoff * 2**attempt
+                logger.warning(
+                    "Writing %s rows into %s failed (attempt %s/%s), retrying in %.1fs",
+                    len(rows),
+                    table,
+                    attempt + 1,
+                    self.write_retries + 1,
+                    delay,
+                    exc_info=True,
+                )
+                time.sleep(delay)
+
+    def _fail(self, exc: BaseException):
+        self._error = exc
+        if self.crawler is None or self._spider is None:
             return
-        self.storage.save_dataframe(df, table)
-        logger.info("Inserted %s rows into %s", len(df), table)
-        self._buffers[table].clear()
+        from twisted.internet import reactor
 
-    def _flush_all(self, spider):
-        for table in list(self._buffers.keys()):
-            self._flush_table(table)
+        reactor.callFromThread(self.crawler.engine.close_spider, self._spider, "pipeline_write_failed")
@@ -27,13 +27,23 @@ ITEM_PIPELINES = {
 
 DOWNLOADER_MIDDLEWARES = {
     "crawler_project.scrapy_app.middlewares.ConfigUserAgentMiddleware": 400,
+    # Between RetryMiddleware (550), so failures are seen before a retry is
+    # scheduled, and HttpProxyMiddleware (750), which applies meta["proxy"].
+    "crawler_project.scrapy_app.middlewares.HealthScoredProxyMiddleware": 600,
 }
 
+DUPEFILTER_CLASS = "crawler_project.scrapy_app.dupefilters.PersistentUrlDupeFilter"
+DEDUP_ENABLED = True
+
 TELNETCONSOLE_ENABLED = False
 LOG_STDOUT = False
 LOG_LEVEL = "INFO"
 
 PIPELINE_BATCH_SIZE = 200
+PIPELINE_QUEUE_SIZE = 4
+PIPELINE_FLUSH_INTERVAL = 5.0
+PIPELINE_WRITE_RETRIES = 3
+PIPELINE_RETRY_BACKOFF = 1.0  # seconds, doubled after each failed attempt
 
 # Ensure new features stay compatible
 twisted_timeout = POLICY.timeout_seconds
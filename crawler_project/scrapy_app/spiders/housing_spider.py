@@ -4,12 +4,15 @@ from typing import Optional
 
 import scrapy
 
+from crawler_project.scrapy_app.frontier import FrontierSpiderMixin
 from crawler_project.scrapy_app.items import HousingItem
+from crawler_project.utils.extraction_specs import HOUSING_LISTING
+from crawler_project.utils.html_parser import extract
 
 LIST_URL = "https://bj.lianjia.com/ershoufang/pg{page}/"
 
 
-class LianjiaHousingSpider(scrapy.Spider):
+class LianjiaHousingSpider(FrontierSpiderMixin, scrapy.Spider):
     name = "housing_market"
     allowed_domains = ["bj.lianjia.com"]
     custom_settings = {"DOWNLOAD_DELAY": 2.5}
@@ -20,20 +23,19 @@ class LianjiaHousingSpider(scrapy.Spider):
         self.table_name = "housing_market"
 
     def start_requests(self):
-        for page in range(1, self.max_pages + 1):
-            yield scrapy.Request(LIST_URL.format(page=page), callback=self.parse)
+        yield from self.page_requests([LIST_URL.format(page=page) for page in range(1, self.max_pages + 1)], self.parse)
 
     def parse(self, response):
-        for card in response.css("li.clear"):
-            info = card.css(".houseInfo::text").get(default="").split("|")
+        for card in extract(HOUSING_LISTING, response.text):
+            info = (card["house_info"] or "").split("|")
             area = info[1].strip() if len(info) > 1 else None
             yield HousingItem(
-                community=card.css(".positionInfo a::text").get(default="").strip(),
-                address=card.css(".positionInfo a::attr(title)").get(),
-                price=card.css(".totalPrice span::text").get(),
-                unit_price=card.css(".unitPrice span::text").get(),
+                community=card["community"] or "",
+                address=card["address"],
+                price=card["price"],
+                unit_price=card["unit_price"],
                 area=area,
-                deal_date=card.css(".dealDate::text").get(default="").strip(),
+                deal_date=card["deal_date"] or "",
                 latitude=None,
                 longitude=None,
             )
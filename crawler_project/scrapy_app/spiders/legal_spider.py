@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import scrapy
 
+from crawler_project.scrapy_app.frontier import FrontierSpiderMixin
 from crawler_project.scrapy_app.items import LegalItem
+from crawler_project.utils.extraction_specs import LEGAL_LISTING
+from crawler_project.utils.gazetteer import location_columns
+from crawler_project.utils.html_parser import extract
 
 BASE_URL = "https://www.bjcourt.gov.cn/bjws/bsal/"
 
 
-class BeijingCourtSpider(scrapy.Spider):
+class BeijingCourtSpider(FrontierSpiderMixin, scrapy.Spider):
     name = "legal_cases"
     allowed_domains = ["bjcourt.gov.cn"]
     custom_settings = {"DOWNLOAD_DELAY": 2.0}
@@ -18,29 +22,19 @@ class BeijingCourtSpider(scrapy.Spider):
         self.table_name = "legal_cases"
 
     def start_requests(self):
-        for page in range(1, self.max_pages + 1):
-            yield scrapy.Request(f"{BASE_URL}?page={page}", callback=self.parse)
+        yield from self.page_requests([f"{BASE_URL}?page={page}" for page in range(1, self.max_pages + 1)], self.parse)
 
     def parse(self, response):
-        for node in response.css(".list li"):
-            title = node.css("a::text").get(default="").strip()
-            detail_url = response.urljoin(node.css("a::attr(href)").get(default=""))
-            judgment_date = node.css("span::text").get(default="").strip()
-            location = self._extract_location(title)
+        for node in extract(LEGAL_LISTING, response.text):
+            title = node["title"] or ""
+            detail_url = response.urljoin(node["href"] or "")
+            judgment_date = node["judgment_date"] or ""
             yield LegalItem(
                 title=title,
                 judgment_date=judgment_date,
                 case_type="刑事",
-                location=location,
                 charges=None,
                 law_articles=None,
                 url=detail_url,
+                **location_columns(title),
             )
-
-    def _extract_location(self, text: str):
-        for suffix in ("法院", "区", "市"):
-            idx = text.find(suffix)
-            if idx > 0:
-                start = max(0, idx - 6)
-                return text[start : idx + len(suffix)]
-        return None
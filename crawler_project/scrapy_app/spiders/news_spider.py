@@ -1,73 +1,104 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
 from urllib.parse import urljoin
 
 import scrapy
 
+from crawler_project.scrapy_app.frontier import FrontierSpiderMixin
 from crawler_project.scrapy_app.items import NewsItem
-from crawler_project.utils.data_parser import detect_disaster_type, extract_loss_info, parse_date
+from crawler_project.utils.data_parser import detect_disaster_type, extract_loss_info, loss_columns, parse_date
+from crawler_project.utils.extraction_specs import NEWS_DETAIL, NEWS_LISTING
+from crawler_project.utils.gazetteer import location_columns
+from crawler_project.utils.html_parser import extract, extract_one
+from crawler_project.utils.storage_handler import StorageHandler
+from crawler_project.utils.watermark import date_floor, is_known, load_watermark, page_below
 
 BASE_URL = "http://www.north-news.cn/"
 
 
-class NorthNewsSpider(scrapy.Spider):
+class NorthNewsSpider(FrontierSpiderMixin, scrapy.Spider):
     name = "north_news"
     allowed_domains = ["north-news.cn"]
     custom_settings = {"DOWNLOAD_DELAY": 2.0}
 
-    def __init__(self, start_date: str = "2011-01-01", end_date: str = "2020-12-31", max_pages: int = 10, *args, **kwargs):
+    def __init__(
+        self,
+        start_date: str = "2011-01-01",
+        end_date: str = "2020-12-31",
+        max_pages: int = 10,
+        incremental: str = "false",
+        *args,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.start_date = datetime.fromisoformat(start_date)
         self.end_date = datetime.fromisoformat(end_date)
         self.max_pages = int(max_pages)
+        self.incremental = str(incremental).lower() in {"1", "true", "yes"}
         self.table_name = "news_events"
+        self.watermark = None
+        self.floor = self.start_date
 
     def start_requests(self):
-        for page in range(1, self.max_pages + 1):
-            url = f"{BASE_URL}news/node_{page}.htm"
-            yield scrapy.Request(url, callback=self.parse_list)
+        if self.incremental:
+            self.watermark = load_watermark(StorageHandler().engine, self.table_name, url_prefix=BASE_URL)
+            self.floor = date_floor(self.start_date, self.watermark)
+            self.logger.info("Incremental crawl down to %s", self.floor)
+        urls = [f"{BASE_URL}news/node_{page}.htm" for page in range(1, self.max_pages + 1)]
+        if self.frontier is not None:
+            yield from self.page_requests(urls, self.parse_list)
+        else:
+            # Newest page first, one at a time, so the crawl stops at the date floor.
+            yield scrapy.Request(urls[0], callback=self.parse_list, cb_kwargs={"page": 1})
 
-    def parse_list(self, response):
-        for article in response.css(".list li"):
-            link = article.css("a::attr(href)").get()
-            title = article.css("a::text").get(default="").strip()
-            date_text = article.css("span::text").get(default="").strip()
-            publish_date = parse_date(date_text)
+    async def parse_list(self, response, page: int = 0):
+        articles = extract(NEWS_LISTING, response.text)
+        dates = [parse_date(article["date_text"] or "") for article in articles]
+        wanted = []
+        for article, publish_date in zip(articles, dates):
+            link = article["href"]
+            title = article["title"] or ""
             if not link or not publish_date:
                 continue
-            if publish_date < self.start_date or publish_date > self.end_date:
+            if publish_date < self.floor or publish_date > self.end_date:
                 continue
             detail_url = urljoin(response.url, link)
-            yield response.follow(
+            if not is_known(detail_url, publish_date, self.watermark):
+                wanted.append((detail_url, title, publish_date))
+        claimed = await self.claim_details([detail_url for detail_url, _, _ in wanted])
+        for detail_url, title, publish_date in wanted:
+            if detail_url not in claimed:
+                continue
+            yield self.detail_request(
+                response,
                 detail_url,
                 callback=self.parse_detail,
+                meta={"dedup": True},
                 cb_kwargs={
                     "title": title,
                     "publish_date": publish_date,
                 },
             )
+        if page_below(dates, self.floor):
+            self.logger.info("Stopping at %s: every article predates %s", response.url, self.floor)
+            self.pages_exhausted = True
+        elif page and page < self.max_pages:
+            yield scrapy.Request(
+                f"{BASE_URL}news/node_{page + 1}.htm", callback=self.parse_list, cb_kwargs={"page": page + 1}
+            )
 
     def parse_detail(self, response, title: str, publish_date: datetime):
-        body_text = "\n".join(response.css(".article *::text, #article *::text").getall()).strip()
+        body_text = extract_one(NEWS_DETAIL, response.text)["content"]
         content = body_text or " ".join(response.css("body ::text").getall()).strip()
-        location = self._guess_location(content)
         yield NewsItem(
             title=title,
             url=response.url,
             publish_date=publish_date.isoformat(),
             disaster_type=detect_disaster_type(content),
-            location=location,
             loss=extract_loss_info(content),
             content=content,
+            **loss_columns(content),
+            **location_columns(content),
         )
-
-    def _guess_location(self, text: str) -> Optional[str]:
-        markers = ["市", "区", "县"]
-        for marker in markers:
-            idx = text.find(marker)
-            if idx > 0:
-                start = max(0, idx - 10)
-                return text[start : idx + 1]
-        return None
+        self.complete_detail(response)
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
 import json
-from typing import Tuple
+import math
+from typing import Set, Tuple
 from urllib.parse import urlencode
 
 import scrapy
 
 from crawler_project.config import settings as project_settings
 from crawler_project.scrapy_app.items import PoiItem
+from crawler_project.utils.config_loader import get_section
+from crawler_project.utils.coords import to_wgs84
+from crawler_project.utils.poi_tiling import (
+    PageRequest,
+    Tile,
+    TilingSettings,
+    follow_ups,
+    page_results,
+    search_params,
+    unseen,
+)
 
 BAIDU_POI_URL = "http://api.map.baidu.com/place/v2/search"
 
@@ -18,41 +30,57 @@ def _parse_bounds(bounds: str) -> Tuple[str, str]:
 
 
 class BaiduPoiSpider(scrapy.Spider):
+    """Baidu POIs inside ``bounds``, quadtree-tiled around the per-query result cap.
+
+    ``max_pages`` caps the pages fetched per tile on top of what ``total`` requires.
+    """
+
     name = "spatial_poi"
     allowed_domains = ["api.map.baidu.com"]
     custom_settings = {"DOWNLOAD_DELAY": 1.0}
 
-    def __init__(self, category: str = "学校", bounds: str = "39.5,116.2;41.0,117.4", max_pages: int = 5, *args, **kwargs):
+    def __init__(self, category: str = "学校", bounds: str = "39.5,116.2;41.0,117.4", max_pages: int = 20, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.category = category
         self.bounds = _parse_bounds(bounds)
         self.max_pages = int(max_pages)
         self.table_name = "spatial_poi"
+        self.tiling = get_section("poi_tiling", TilingSettings())
+        self._seen: Set[str] = set()
         self.ak = project_settings.api_keys.baidu_map
         if not self.ak:
             self.logger.warning("BAIDU_LBS_AK not configured; requests may fail.")
 
     def start_requests(self):
-        for page in range(self.max_pages):
-            params = {
-                "query": self.category,
-                "bounds": f"{self.bounds[0]}|{self.bounds[1]}",
-                "output": "json",
-                "page_size": 20,
-                "page_num": page,
-                "ak": self.ak or "",
-            }
-            url = f"{BAIDU_POI_URL}?{urlencode(params)}"
-            yield scrapy.Request(url, callback=self.parse)
-
-    def parse(self, response):
+        yield self._request(PageRequest(Tile.from_corners(*self.bounds)))
+
+    def _request(self, page_request: PageRequest) -> scrapy.Request:
+        params = search_params(self.category, page_request, self.ak, self.tiling)
+        return scrapy.Request(
+            f"{BAIDU_POI_URL}?{urlencode(params)}",
+            callback=self.parse,
+            cb_kwargs={"page_request": page_request},
+        )
+
+    def parse(self, response, page_request: PageRequest):
         payload = json.loads(response.text)
-        for poi in payload.get("results", []):
-            location = poi.get("location", {})
+        for follow_up in follow_ups(payload, page_request, self.tiling):
+            if follow_up.page < self.max_pages:
+                yield self._request(follow_up)
+        results = list(unseen(page_results(payload, page_request), self._seen))
+        locations = [poi.get("location") or {} for poi in results]
+        # Baidu returns BD-09 coordinates; convert the whole page in one call (NaN where missing).
+        lngs, lats = to_wgs84(
+            [location.get("lng", math.nan) for location in locations],
+            [location.get("lat", math.nan) for location in locations],
+            "bd09",
+        )
+        for poi, lng, lat in zip(results, lngs.tolist(), lats.tolist()):
             yield PoiItem(
+                uid=poi.get("uid"),
                 name=poi.get("name"),
                 category=self.category,
-                latitude=location.get("lat"),
-                longitude=location.get("lng"),
+                latitude=None if math.isnan(lat) else lat,
+                longitude=None if math.isnan(lng) else lng,
                 address=poi.get("address"),
             )
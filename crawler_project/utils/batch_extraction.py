@@ -0,0 +1,140 @@
+"""Column-wise versions of the ``data_parser`` extractors for reprocessing stored rows.
+
+Each ``*_batch`` function takes a pandas Series, a pyarrow Array/ChunkedArray
+or any sequence of strings and returns an object Series, aligned with the
+input, holding exactly what the scalar function returns for each element.
+Regex work runs through the pandas string accessor; keyword detection uses
+pyarrow compute kernels when pyarrow is installed.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, List
+
+import numpy as np
+import pandas as pd
+
+from .data_parser import (
+    CASUALTY_KINDS,
+    DATE_PATTERN,
+    LOSS_COLUMNS,
+    LOSS_FIGURE_PATTERN,
+    LOSS_PATTERN,
+    MONEY_UNITS,
+    _to_datetime,
+    disaster_matcher,
+    to_count,
+    to_yuan,
+)
+
+try:  # optional: Arrow-backed strings make the keyword scan run in C++
+    import pyarrow  # noqa: F401
+
+    _ARROW_STRING = "string[pyarrow]"
+except ImportError:  # pragma: no cover - depends on environment
+    _ARROW_STRING = None
+
+
+def _as_series(values: Any) -> pd.Series:
+    if isinstance(values, pd.Series):
+        return values
+    if hasattr(values, "to_pandas"):
+        return values.to_pandas()
+    return pd.Series(list(values), dtype=object)
+
+
+def _texts(values: Any) -> pd.Series:
+    """Mirror the scalar ``text or ""``: missing values become empty strings."""
+
+    series = _as_series(values)
+    return series.astype(object).where(series.notna(), "").astype(str).astype(object)
+
+
+def _alternation(terms: List[str]) -> str:
+    return "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+
+
+def _empty(index: pd.Index) -> np.ndarray:
+    return np.full(len(index), None, dtype=object)
+
+
+def detect_disaster_type_batch(texts: Any) -> pd.Series:
+    """``detect_disaster_type`` over a column; categories are tried in dictionary order."""
+
+    text = _texts(texts)
+    if _ARROW_STRING is not None:
+        text = text.astype(_ARROW_STRING)
+    result = _empty(text.index)
+    pending = np.ones(len(text), dtype=bool)
+    matcher = disaster_matcher()
+    for category in matcher.categories:
+        terms = matcher.dictionary[category]
+        if not terms or not pending.any():
+            continue
+        candidates = np.flatnonzero(pending)
+        hits = text.iloc[candidates].str.contains(_alternation(terms), regex=True).to_numpy(dtype=bool)
+        result[candidates[hits]] = category
+        pending[candidates[hits]] = False
+    return pd.Series(result, index=text.index, dtype=object)
+
+
+def extract_loss_info_batch(texts: Any) -> pd.Series:
+    """``extract_loss_info`` over a column."""
+
+    text = _texts(texts)
+    found = text.str.extract(LOSS_PATTERN.pattern, expand=True)
+    amounts = found.iloc[:, 0].to_numpy(dtype=object)
+    units = found.iloc[:, 1].to_numpy(dtype=object)
+    result = _empty(text.index)
+    for position in np.flatnonzero(found.iloc[:, 0].notna().to_numpy()):
+        result[position] = {"amount": amounts[position], "unit": units[position]}
+    return pd.Series(result, index=text.index, dtype=object)
+
+
+def loss_columns_batch(texts: Any) -> pd.DataFrame:
+    """``loss_columns`` over a column as nullable Int64/Float64 columns.
+
+    All figures are pulled with one ``str.extractall`` and totalled with
+    group-bys; missing values are ``<NA>`` where the scalar gives ``None``.
+    """
+
+    text = _texts(texts)
+    positions = pd.RangeIndex(len(text))
+    frame = pd.DataFrame(index=positions)
+    found = text.reset_index(drop=True).str.extractall(LOSS_FIGURE_PATTERN.pattern)
+    money = found["unit"].isin(list(MONEY_UNITS)).to_numpy()
+    people = found.loc[~money]
+    kinds = people["after"].fillna(people["before"]).map(CASUALTY_KINDS).fillna("people")
+    counts = pd.Series(
+        [to_count(value, unit) for value, unit in zip(people["value"], people["unit"])],
+        index=people.index,
+        dtype="int64",
+    )
+    totals = counts.groupby([people.index.get_level_values(0), kinds]).sum().unstack()
+    amounts = found.loc[money]
+    yuan = pd.Series(
+        [to_yuan(value, unit) for value, unit in zip(amounts["value"], amounts["unit"])],
+        index=amounts.index.get_level_values(0),
+        dtype=float,
+    )
+    for column in LOSS_COLUMNS:
+        if column == "economic_loss_yuan":
+            frame[column] = yuan.groupby(level=0).max().reindex(positions).astype("Float64")
+        elif column in totals:
+            frame[column] = totals[column].reindex(positions).astype("Int64")
+        else:
+            frame[column] = pd.Series(pd.NA, index=positions, dtype="Int64")
+    frame.index = text.index
+    return frame
+
+
+def parse_date_batch(texts: Any) -> pd.Series:
+    """``parse_date`` over a column; invalid calendar dates come back as ``None``."""
+
+    text = _texts(texts)
+    found = text.str.extract(DATE_PATTERN.pattern, expand=True).to_numpy(dtype=object)
+    result = _empty(text.index)
+    for position in np.flatnonzero(pd.notna(found[:, 0])):
+        result[position] = _to_datetime(*found[position])
+    return pd.Series(result, index=text.index, dtype=object)
@@ -2,36 +2,286 @@
 
 from __future__ import annotations
 
+import logging
+import queue
+import threading
 import time
+import warnings
 from contextlib import contextmanager
-from typing import Iterator, Optional
+from dataclasses import dataclass, replace
+from typing import Callable, Iterator, Optional
 
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
 
+from .config_loader import get_section
 
-def create_driver(driver_path: Optional[str] = None) -> webdriver.Chrome:
+logger = logging.getLogger(__name__)
+
+
+# Chrome content settings: 2 = block.
+_BLOCKED_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+}
+_BLOCKED_URL_PATTERNS = ["*.css", "*.woff", "*.woff2", "*.ttf", "*.otf", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp"]
+
+# Chrome keeps only 150 resource timing entries by default; later resources
+# would go unseen and a busy page would look idle. Raised on every new
+# document (see create_driver) and again on each idle check.
+_RESOURCE_BUFFER_JS = "performance.setResourceTimingBufferSize(10000);"
+
+# Milliseconds since the last finished resource; 0 while the document is still loading.
+_NETWORK_QUIET_JS = _RESOURCE_BUFFER_JS + """
+if (document.readyState !== 'complete') { return 0; }
+var last = 0;
+performance.getEntriesByType('resource').forEach(function (e) { last = Math.max(last, e.responseEnd); });
+return performance.now() - last;
+"""
+
+# Milliseconds since the last DOM mutation, observed from the first call onwards.
+_DOM_QUIET_JS = """
+if (window.__crawlerLastMutation === undefined) {
+  window.__crawlerLastMutation = performance.now();
+  new MutationObserver(function () { window.__crawlerLastMutation = performance.now(); })
+    .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__crawlerLastMutation;
+"""
+
+
+@dataclass
+class BrowserSettings:
+    pool_size: int = 3
+    max_pages_per_driver: int = 50
+    block_resources: bool = False
+
+
+@dataclass(frozen=True)
+class ReadyCondition:
+    """When a rendered page counts as ready.
+
+    Every enabled check must hold: ``selector`` is present, no resource has
+    finished for ``quiet_seconds`` (``network_idle``), and the DOM has not
+    mutated for ``quiet_seconds`` (``dom_stable``). Waiting stops at ``timeout``.
+    """
+
+    selector: Optional[str] = None
+    network_idle: bool = False
+    dom_stable: bool = False
+    timeout: float = 10.0
+    quiet_seconds: float = 0.5
+    poll_seconds: float = 0.1
+
+
+DEFAULT_READY = ReadyCondition(network_idle=True)
+
+
+def create_driver(driver_path: Optional[str] = None, block_resources: bool = False) -> webdriver.Chrome:
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
+    if block_resources:
+        options.add_experimental_option("prefs", _BLOCKED_CONTENT_PREFS)
     driver = webdriver.Chrome(options=options)
     if driver_path:
         driver.service.path = driver_path
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _RESOURCE_BUFFER_JS})
+    if block_resources:
+        # Content settings do not reliably cover fonts, so block the same types at the network layer too.
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
     return driver
 
 
 @contextmanager
-def headless_browser(driver_path: Optional[str] = None) -> Iterator[webdriver.Chrome]:
-    driver = create_driver(driver_path)
+def headless_browser(driver_path: Optional[str] = None, block_resources: bool = False) -> Iterator[webdriver.Chrome]:
+    driver = create_driver(driver_path, block_resources=block_resources)
     try:
         yield driver
     finally:
         driver.quit()
 
 
-def fetch_dynamic_html(url: str, wait: float = 2.0) -> str:
-    with headless_browser() as driver:
+def wait_until_ready(
+    driver: webdriver.Chrome,
+    condition: ReadyCondition = DEFAULT_READY,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> bool:
+    """Block until ``condition`` holds; return ``False`` if it timed out first.
+
+    The time spent waiting is logged at debug level.
+    """
+
+    started = clock()
+    deadline = started + condition.timeout
+    selector = condition.selector
+
+    def poll(check: Callable[[], bool], failure: str) -> None:
+        while not check():
+            if clock() >= deadline:
+                raise TimeoutException(f"{failure} within {condition.timeout}s")
+            sleep(condition.poll_seconds)
+
+    try:
+        if selector:
+            poll(lambda: bool(driver.find_elements(By.CSS_SELECTOR, selector)), f"{selector} did not appear")
+        if condition.network_idle:
+            poll(_quiet_check(driver, _NETWORK_QUIET_JS, condition), "network did not go idle")
+        if condition.dom_stable:
+            poll(_quiet_check(driver, _DOM_QUIET_JS, condition), "DOM did not settle")
+    except TimeoutException:
+        logger.warning("Page %s not ready after %.1fs", driver.current_url, clock() - started)
+        return False
+    logger.debug("Page %s ready after %.2fs", driver.current_url, clock() - started)
+    return True
+
+
+def _quiet_check(driver: webdriver.Chrome, script: str, condition: ReadyCondition) -> Callable[[], bool]:
+    quiet_ms = condition.quiet_seconds * 1000
+    return lambda: (driver.execute_script(script) or 0) >= quiet_ms
+
+
+def fetch_dynamic_html(
+    url: str,
+    ready: ReadyCondition = DEFAULT_READY,
+    block_resources: bool = False,
+    wait: Optional[float] = None,
+) -> str:
+    """Render ``url`` in a fresh headless browser and return the page source.
+
+    ``wait`` (seconds, also accepted in place of ``ready``) is deprecated: it
+    becomes the timeout of a network-idle wait instead of a fixed sleep.
+    """
+
+    if isinstance(ready, (int, float)):
+        ready, wait = DEFAULT_READY, float(ready)
+    if wait is not None:
+        warnings.warn(
+            "fetch_dynamic_html(wait=...) is deprecated; pass ready=ReadyCondition(...)",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        ready = replace(ready, timeout=wait)
+    with headless_browser(block_resources=block_resources) as driver:
         driver.get(url)
-        time.sleep(wait)
+        wait_until_ready(driver, ready)
         return driver.page_source
+
+
+@dataclass
+class _PooledDriver:
+    driver: webdriver.Chrome
+    pages: int = 0
+
+
+class BrowserPool:
+    """Keep up to ``size`` warm Chrome drivers and lend them to worker threads.
+
+    Drivers are started lazily, recycled after ``max_pages_per_driver`` pages,
+    and replaced whenever a page load raises ``WebDriverException``.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_pages_per_driver: Optional[int] = None,
+        driver_path: Optional[str] = None,
+        block_resources: Optional[bool] = None,
+    ) -> None:
+        defaults = get_section("browser", BrowserSettings())
+        self.size = max(1, size or defaults.pool_size)
+        self.max_pages_per_driver = max_pages_per_driver or defaults.max_pages_per_driver
+        self.driver_path = driver_path
+        self.block_resources = defaults.block_resources if block_resources is None else block_resources
+        self._idle: "queue.LifoQueue[_PooledDriver]" = queue.LifoQueue()
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @contextmanager
+    def driver(self) -> Iterator[webdriver.Chrome]:
+        pooled = self._checkout()
+        try:
+            yield pooled.driver
+        except WebDriverException:
+            logger.warning("Discarding crashed browser after %s pages", pooled.pages)
+            self._discard(pooled)
+            raise
+        except BaseException:
+            self._checkin(pooled)
+            raise
+        pooled.pages += 1
+        self._checkin(pooled)
+
+    def fetch(self, url: str, ready: ReadyCondition = DEFAULT_READY, retries: int = 1) -> str:
+        for attempt in range(retries + 1):
+            try:
+                with self.driver() as driver:
+                    driver.get(url)
+                    wait_until_ready(driver, ready)
+                    return driver.page_source
+            except WebDriverException:
+                if attempt == retries:
+                    raise
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(pooled)
+
+    def _checkout(self) -> _PooledDriver:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("BrowserPool is closed")
+                spawn = self._created < self.size
+                if spawn:
+                    self._created += 1
+            if spawn:
+                try:
+                    return _PooledDriver(create_driver(self.driver_path, self.block_resources))
+                except BaseException:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            # Re-check capacity periodically: a crashed driver frees a slot without refilling the queue.
+            try:
+                return self._idle.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+    def _checkin(self, pooled: _PooledDriver) -> None:
+        if self._closed or pooled.pages >= self.max_pages_per_driver:
+            self._discard(pooled)
+        else:
+            self._idle.put(pooled)
+
+    def _discard(self, pooled: _PooledDriver) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            pooled.driver.quit()
+        except WebDriverException:
+            logger.debug("Browser already gone while quitting", exc_info=True)
@@ -0,0 +1,121 @@
+"""Resumable crawl checkpoints stored in a local SQLite file."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from ..config import settings
+from .config_loader import get_section
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    crawler TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    done_at REAL NOT NULL,
+    PRIMARY KEY (crawler, run_id, kind, key)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class CheckpointSettings:
+    enabled: bool = True
+    path: Optional[Path] = None
+    flush_every: int = 100
+    flush_interval_seconds: float = 5.0
+
+
+class CheckpointStore:
+    """Finished listing pages and detail URLs for one crawler run.
+
+    Completed keys are loaded into memory on open so lookups stay off disk;
+    new completions are buffered and written in batches every
+    ``flush_every`` marks or ``flush_interval`` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        crawler: str,
+        run_id: str,
+        flush_every: int = 100,
+        flush_interval: float = 5.0,
+    ) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.crawler = crawler
+        self.run_id = run_id
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, str, str, str, float]] = []
+        self._last_flush = time.monotonic()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._done: Set[Tuple[str, str]] = set(
+            self._conn.execute(
+                "SELECT kind, key FROM checkpoints WHERE crawler = ? AND run_id = ?",
+                (crawler, run_id),
+            )
+        )
+
+    @classmethod
+    def from_settings(cls, crawler: str, run_id: str) -> Optional["CheckpointStore"]:
+        cfg = get_section("checkpoint", CheckpointSettings())
+        if not cfg.enabled:
+            return None
+        path = Path(cfg.path) if cfg.path else settings.storage.raw_html_dir.parent / "checkpoints.sqlite3"
+        return cls(path, crawler, run_id, cfg.flush_every, cfg.flush_interval_seconds)
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def is_done(self, kind: str, key: str) -> bool:
+        return (kind, key) in self._done
+
+    def mark_done(self, kind: str, key: str) -> None:
+        with self._lock:
+            if (kind, key) in self._done:
+                return
+            self._done.add((kind, key))
+            self._pending.append((self.crawler, self.run_id, kind, key, time.time()))
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if len(self._pending) >= self.flush_every or due:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def reset(self) -> None:
+        """Forget every completion of this run."""
+
+        with self._lock:
+            self._pending.clear()
+            self._done.clear()
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM checkpoints WHERE crawler = ? AND run_id = ?",
+                    (self.crawler, self.run_id),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO checkpoints VALUES (?, ?, ?, ?, ?)", self._pending)
+        self._pending.clear()
@@ -5,12 +5,14 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, TypeVar
 
 import yaml
 
 from .. import config
 
+T = TypeVar("T")
+
 
 def load_config_file(path: Path | str | None = None) -> Dict[str, Any]:
     """Load configuration overrides from YAML/JSON, returning a dict."""
@@ -30,21 +32,40 @@ def load_config_file(path: Path | str | None = None) -> Dict[str, Any]:
 def apply_overrides(overrides: Dict[str, Any]) -> config.ProjectSettings:
     """Apply nested dict overrides onto the global settings dataclasses."""
 
-    def _apply(target, data):
-        for key, value in data.items():
-            if not hasattr(target, key):
-                continue
-            current = getattr(target, key)
-            if isinstance(value, dict) and not isinstance(current, (str, int, float)):
-                _apply(current, value)
-            else:
-                setattr(target, key, value)
-
     cloned = config.ProjectSettings()
     _apply(cloned, overrides)
     return cloned
 
 
+def get_section(name: str, default: T) -> T:
+    """Return the settings section ``name``, or ``default`` merged with file overrides.
+
+    Feature sections that ``config.ProjectSettings`` does not declare are
+    read straight from the config file so they stay configurable via YAML.
+    """
+
+    current = getattr(config.settings, name, None)
+    if current is not None:
+        return current
+    overrides = load_config_file().get(name)
+    if isinstance(overrides, dict):
+        _apply(default, overrides)
+    return default
+
+
+def _apply(target, data: Dict[str, Any]) -> None:
+    for key, value in data.items():
+        if not hasattr(target, key):
+            continue
+        current = getattr(target, key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            setattr(target, key, {**current, **value})
+        elif isinstance(value, dict) and not isinstance(current, (str, int, float)):
+            _apply(current, value)
+        else:
+            setattr(target, key, value)
+
+
 def load_settings(path: Path | str | None = None) -> config.ProjectSettings:
     """Load settings merging file overrides with environment variables."""
 
@@ -0,0 +1,130 @@
+"""Vectorized conversions between WGS84, GCJ-02 (Mars) and BD-09 (Baidu) coordinates.
+
+Every function takes scalars or NumPy-compatible arrays of longitudes and
+latitudes and returns ``(lng, lat)`` arrays of the broadcast shape. The
+forward transforms (WGS84 → GCJ-02 → BD-09) are closed-form; the inverses
+refine the usual closed-form approximation by fixed-point iteration, which
+converges to well under a millimetre in a few rounds.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+A = 6378245.0  # Krasovsky 1940 semi-major axis used by GCJ-02
+EE = 0.00669342162296594323  # its first eccentricity squared
+X_PI = np.pi * 3000.0 / 180.0
+BD_OFFSET = (0.0065, 0.006)
+
+Coordinates = Tuple[np.ndarray, np.ndarray]
+
+
+def _arrays(lng, lat) -> Coordinates:
+    lng, lat = np.broadcast_arrays(np.asarray(lng, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+    return lng, lat
+
+
+def in_china(lng, lat) -> np.ndarray:
+    """Rough bounding box outside which GCJ-02 applies no offset."""
+
+    lng, lat = _arrays(lng, lat)
+    return (lng > 72.004) & (lng < 137.8347) & (lat > 0.8293) & (lat < 55.8271)
+
+
+def _delta(lng: np.ndarray, lat: np.ndarray) -> Coordinates:
+    x, y = lng - 105.0, lat - 35.0
+    sqrt_abs_x = np.sqrt(np.abs(x))
+    common = (20.0 * np.sin(6.0 * x * np.pi) + 20.0 * np.sin(2.0 * x * np.pi)) * 2.0 / 3.0
+    d_lat = (
+        -100.0 + 2.0 * x + 3.0 * y + 0.2 * y * y + 0.1 * x * y + 0.2 * sqrt_abs_x
+        + common
+        + (20.0 * np.sin(y * np.pi) + 40.0 * np.sin(y / 3.0 * np.pi)) * 2.0 / 3.0
+        + (160.0 * np.sin(y / 12.0 * np.pi) + 320.0 * np.sin(y * np.pi / 30.0)) * 2.0 / 3.0
+    )
+    d_lng = (
+        300.0 + x + 2.0 * y + 0.1 * x * x + 0.1 * x * y + 0.1 * sqrt_abs_x
+        + common
+        + (20.0 * np.sin(x * np.pi) + 40.0 * np.sin(x / 3.0 * np.pi)) * 2.0 / 3.0
+        + (150.0 * np.sin(x / 12.0 * np.pi) + 300.0 * np.sin(x / 30.0 * np.pi)) * 2.0 / 3.0
+    )
+    rad_lat = lat / 180.0 * np.pi
+    magic = 1.0 - EE * np.sin(rad_lat) ** 2
+    sqrt_magic = np.sqrt(magic)
+    d_lat = (d_lat * 180.0) / ((A * (1.0 - EE)) / (magic * sqrt_magic) * np.pi)
+    d_lng = (d_lng * 180.0) / (A / sqrt_magic * np.cos(rad_lat) * np.pi)
+    return d_lng, d_lat
+
+
+def wgs84_to_gcj02(lng, lat) -> Coordinates:
+    lng, lat = _arrays(lng, lat)
+    d_lng, d_lat = _delta(lng, lat)
+    inside = in_china(lng, lat)
+    return np.where(inside, lng + d_lng, lng), np.where(inside, lat + d_lat, lat)
+
+
+def gcj02_to_bd09(lng, lat) -> Coordinates:
+    lng, lat = _arrays(lng, lat)
+    z = np.hypot(lng, lat) + 0.00002 * np.sin(lat * X_PI)
+    theta = np.arctan2(lat, lng) + 0.000003 * np.cos(lng * X_PI)
+    return z * np.cos(theta) + BD_OFFSET[0], z * np.sin(theta) + BD_OFFSET[1]
+
+
+def _invert(forward, lng: np.ndarray, lat: np.ndarray, guess: Coordinates, tolerance: float, max_iter: int):
+    """Solve ``forward(x) == (lng, lat)`` by fixed-point iteration from ``guess``."""
+
+    x_lng, x_lat = guess
+    for _ in range(max_iter):
+        f_lng, f_lat = forward(x_lng, x_lat)
+        err_lng, err_lat = f_lng - lng, f_lat - lat
+        x_lng, x_lat = x_lng - err_lng, x_lat - err_lat
+        if max(np.nanmax(np.abs(err_lng), initial=0.0), np.nanmax(np.abs(err_lat), initial=0.0)) < tolerance:
+            break
+    return x_lng, x_lat
+
+
+def bd09_to_gcj02(lng, lat, tolerance: float = 1e-10, max_iter: int = 10) -> Coordinates:
+    lng, lat = _arrays(lng, lat)
+    x, y = lng - BD_OFFSET[0], lat - BD_OFFSET[1]
+    z = np.hypot(x, y) - 0.00002 * np.sin(y * X_PI)
+    theta = np.arctan2(y, x) - 0.000003 * np.cos(x * X_PI)
+    guess = (z * np.cos(theta), z * np.sin(theta))
+    return _invert(gcj02_to_bd09, lng, lat, guess, tolerance, max_iter)
+
+
+def gcj02_to_wgs84(lng, lat, tolerance: float = 1e-10, max_iter: int = 10) -> Coordinates:
+    lng, lat = _arrays(lng, lat)
+    d_lng, d_lat = _delta(lng, lat)
+    inside = in_china(lng, lat)
+    guess = (np.where(inside, lng - d_lng, lng), np.where(inside, lat - d_lat, lat))
+    return _invert(wgs84_to_gcj02, lng, lat, guess, tolerance, max_iter)
+
+
+def bd09_to_wgs84(lng, lat, tolerance: float = 1e-10, max_iter: int = 10) -> Coordinates:
+    return gcj02_to_wgs84(*bd09_to_gcj02(lng, lat, tolerance, max_iter), tolerance, max_iter)
+
+
+def wgs84_to_bd09(lng, lat) -> Coordinates:
+    return gcj02_to_bd09(*wgs84_to_gcj02(lng, lat))
+
+
+_TO_WGS84 = {"wgs84": lambda lng, lat: _arrays(lng, lat), "gcj02": gcj02_to_wgs84, "bd09": bd09_to_wgs84}
+
+
+def to_wgs84(lng, lat, source: str = "bd09") -> Coordinates:
+    """Convert from ``source`` ("bd09", "gcj02" or "wgs84") to WGS84."""
+
+    return _TO_WGS84[source](lng, lat)
+
+
+def geodataframe_to_wgs84(gdf, source: str = "bd09"):
+    """Return a copy of ``gdf`` with every geometry's coordinates moved to WGS84."""
+
+    import shapely
+
+    def convert(xy: np.ndarray) -> np.ndarray:
+        return np.column_stack(to_wgs84(xy[:, 0], xy[:, 1], source))
+
+    geometry = shapely.transform(gdf.geometry.to_numpy(), convert)
+    return gdf.set_geometry(geometry, crs="EPSG:4326")
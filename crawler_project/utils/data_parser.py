@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import re
 from datetime import datetime
-from typing import Dict, Optional
+from decimal import Decimal
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from .keyword_matcher import KeywordMatcher, get_matcher
 
 DISASTER_KEYWORDS = {
     "地震": ["地震", "震感", "震源"],
@@ -13,16 +16,60 @@ DISASTER_KEYWORDS = {
     "洪涝": ["洪水", "积水", "暴雨"],
 }
 
+CHARGE_KEYWORDS = {
+    "盗窃": ["盗窃"],
+    "故意伤害": ["故意伤害"],
+    "诈骗": ["诈骗"],
+    "抢劫": ["抢劫"],
+}
+
 LOSS_PATTERN = re.compile(r"(?P<amount>\d+(?:\.\d+)?)\s*(人|万元|亿元)")
+
+CASUALTY_KINDS = {
+    "死亡": "deaths",
+    "遇难": "deaths",
+    "身亡": "deaths",
+    "罹难": "deaths",
+    "受伤": "injuries",
+    "伤亡": "people",
+    "伤": "injuries",
+    "失踪": "missing",
+    "被困": "trapped",
+    "受灾": "affected",
+}
+MONEY_UNITS = {"元": Decimal(1), "万元": Decimal(10_000), "亿元": Decimal(100_000_000)}
+HEAD_UNITS = {"人": Decimal(1), "名": Decimal(1), "万人": Decimal(10_000), "万名": Decimal(10_000)}
+LOSS_COLUMNS = ("deaths", "injuries", "missing", "trapped", "affected", "people", "economic_loss_yuan")
+
+_KIND_WORDS = "|".join(sorted(CASUALTY_KINDS, key=len, reverse=True))
+_UNITS = "|".join(sorted([*MONEY_UNITS, *HEAD_UNITS], key=len, reverse=True))
+# "死亡3人" / "造成3人死亡" / "经济损失1.2亿元": a kind word may sit right before
+# the figure (a few non-digit, non-punctuation chars apart) or right after it.
+# The word right after the figure wins ("死亡事故造成3人受伤" is injuries),
+# unless the figure had one before it and the word after leads into the next
+# figure ("死亡3人受伤20人").
+LOSS_FIGURE_PATTERN = re.compile(
+    rf"(?:(?P<before>{_KIND_WORDS})[^\d，。；、,;]{{0,4}}?)?"
+    rf"(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>{_UNITS})"
+    rf"(?P<after>(?:{_KIND_WORDS})(?(before)(?![^\d，。；、,;]{{0,4}}\d)))?"
+)
 DATE_PATTERN = re.compile(r"(\d{4})[-/年](\d{1,2})[-/月](\d{1,2})")
 
 
+def disaster_matcher() -> KeywordMatcher:
+    return get_matcher("disaster_types", DISASTER_KEYWORDS)
+
+
+def charge_matcher() -> KeywordMatcher:
+    return get_matcher("charges", CHARGE_KEYWORDS)
+
+
 def detect_disaster_type(text: str) -> Optional[str]:
-    text = text or ""
-    for disaster, keywords in DISASTER_KEYWORDS.items():
-        if any(keyword in text for keyword in keywords):
-            return disaster
-    return None
+    return disaster_matcher().first_category(text)
+
+
+def detect_charge(text: str) -> Optional[str]:
+    return charge_matcher().first_category(text)
 
 
 def extract_loss_info(text: str) -> Optional[Dict[str, str]]:
@@ -32,11 +79,86 @@ def extract_loss_info(text: str) -> Optional[Dict[str, str]]:
     return {"amount": match.group("amount"), "unit": match.group(2)}
 
 
+class LossFigure(NamedTuple):
+    kind: str  # a LOSS_COLUMNS name
+    value: Union[int, float]  # head count, or yuan for economic_loss_yuan
+    start: int
+    end: int
+
+
+class LossInfo(NamedTuple):
+    """Every casualty and monetary figure in a text, totalled per kind.
+
+    Counts are summed per kind; ``economic_loss_yuan`` is the largest amount,
+    since articles usually quote a total next to its parts. ``None`` means
+    the text gave no figure of that kind.
+    """
+
+    deaths: Optional[int] = None
+    injuries: Optional[int] = None
+    missing: Optional[int] = None
+    trapped: Optional[int] = None
+    affected: Optional[int] = None
+    people: Optional[int] = None
+    economic_loss_yuan: Optional[float] = None
+    figures: Tuple[LossFigure, ...] = ()
+
+    def columns(self) -> Dict[str, Optional[Union[int, float]]]:
+        return {name: getattr(self, name) for name in LOSS_COLUMNS}
+
+
+def to_yuan(value: str, unit: str) -> float:
+    return float(Decimal(value) * MONEY_UNITS[unit])
+
+
+def to_count(value: str, unit: str) -> int:
+    return int(Decimal(value) * HEAD_UNITS[unit])
+
+
+def loss_kind(unit: str, before: Optional[str], after: Optional[str]) -> str:
+    if unit in MONEY_UNITS:
+        return "economic_loss_yuan"
+    return CASUALTY_KINDS.get(after or before or "", "people")
+
+
+def extract_loss_details(text: str) -> Optional[LossInfo]:
+    """All loss figures in one regex pass, normalized to head counts and yuan."""
+
+    figures = []
+    for match in LOSS_FIGURE_PATTERN.finditer(text or ""):
+        value, unit = match.group("value"), match.group("unit")
+        kind = loss_kind(unit, match.group("before"), match.group("after"))
+        number = to_yuan(value, unit) if kind == "economic_loss_yuan" else to_count(value, unit)
+        figures.append(LossFigure(kind, number, match.start("value"), match.end()))
+    if not figures:
+        return None
+    totals: Dict[str, Union[int, float]] = {}
+    for figure in figures:
+        if figure.kind == "economic_loss_yuan":
+            totals[figure.kind] = max(totals.get(figure.kind, figure.value), figure.value)
+        else:
+            totals[figure.kind] = totals.get(figure.kind, 0) + figure.value
+    return LossInfo(**totals, figures=tuple(figures))
+
+
+def loss_columns(text: str) -> Dict[str, Optional[Union[int, float]]]:
+    """Flat numeric loss columns for a record; all ``None`` when nothing matched."""
+
+    info = extract_loss_details(text)
+    return info.columns() if info else dict.fromkeys(LOSS_COLUMNS)
+
+
 def parse_date(text: str) -> Optional[datetime]:
     if not text:
         return None
     match = DATE_PATTERN.search(text)
     if not match:
         return None
-    year, month, day = map(int, match.groups())
-    return datetime(year, month, day)
+    return _to_datetime(*match.groups())
+
+
+def _to_datetime(year: str, month: str, day: str) -> Optional[datetime]:
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        return None
@@ -0,0 +1,274 @@
+"""Cross-run URL deduplication: an exact fingerprint store, optionally fronted by a Bloom filter."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Protocol
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+from .config_loader import get_section
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DedupSettings:
+    enabled: bool = True
+    backend: str = "sqlite"  # "sqlite" or "postgres"
+    path: Optional[Path] = None
+    table: str = "url_fingerprints"
+    capacity: int = 10_000_000
+    error_rate: float = 0.01
+    # Only this process adds URLs to the store: answer Bloom misses from memory.
+    single_writer: bool = False
+
+
+def canonicalize_url(url: str) -> str:
+    """Lower-case scheme/host, drop the fragment and sort query parameters."""
+
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def url_fingerprint(url: str) -> bytes:
+    """16-byte digest of the canonical URL; stored instead of the URL string."""
+
+    return hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 16-byte fingerprints (double hashing)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, fingerprint: bytes) -> Iterator[int]:
+        h1 = int.from_bytes(fingerprint[:8], "little")
+        h2 = int.from_bytes(fingerprint[8:16], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, fingerprint: bytes) -> None:
+        for pos in self._positions(fingerprint):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, fingerprint: bytes) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fingerprint))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class FingerprintStore(Protocol):
+    def contains(self, fingerprint: bytes) -> bool: ...
+
+    def add(self, fingerprint: bytes) -> bool: ...
+
+    def add_many(self, fingerprints: Iterable[bytes]) -> None: ...
+
+    def iter_all(self) -> Iterator[bytes]: ...
+
+    def close(self) -> None: ...
+
+
+class SqliteFingerprintStore:
+    """Exact fingerprint set in a local SQLite file."""
+
+    def __init__(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS url_fingerprints (fp BLOB PRIMARY KEY) WITHOUT ROWID")
+
+    def contains(self, fingerprint: bytes) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM url_fingerprints WHERE fp = ?", (fingerprint,)).fetchone()
+        return row is not None
+
+    def add(self, fingerprint: bytes) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO url_fingerprints (fp) VALUES (?)", (fingerprint,))
+        return cursor.rowcount == 1
+
+    def add_many(self, fingerprints: Iterable[bytes]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO url_fingerprints (fp) VALUES (?)", ((fp,) for fp in fingerprints)
+            )
+
+    def iter_all(self) -> Iterator[bytes]:
+        cursor = self._conn.execute("SELECT fp FROM url_fingerprints")
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(10_000)
+            if not rows:
+                return
+            for (fp,) in rows:
+                yield fp
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PostgresFingerprintStore:
+    """Exact fingerprint set in a Postgres table shared by every node."""
+
+    def __init__(self, engine: Engine, table: str = "url_fingerprints") -> None:
+        self.engine = engine
+        self.table = table
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table} (fp BYTEA PRIMARY KEY)"))
+
+    def contains(self, fingerprint: bytes) -> bool:
+        with self.engine.connect() as conn:
+            row = conn.execute(text(f"SELECT 1 FROM {self.table} WHERE fp = :fp"), {"fp": fingerprint}).first()
+        return row is not None
+
+    def add(self, fingerprint: bytes) -> bool:
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                text(f"INSERT INTO {self.table} (fp) VALUES (:fp) ON CONFLICT DO NOTHING RETURNING fp"),
+                {"fp": fingerprint},
+            ).first()
+        return row is not None
+
+    def add_many(self, fingerprints: Iterable[bytes]) -> None:
+        rows = [{"fp": fp} for fp in fingerprints]
+        if not rows:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO {self.table} (fp) VALUES (:fp) ON CONFLICT DO NOTHING"), rows)
+
+    def iter_all(self) -> Iterator[bytes]:
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=10_000).execute(
+                text(f"SELECT fp FROM {self.table}")
+            )
+            for (fp,) in result:
+                yield bytes(fp)
+
+    def close(self) -> None:
+        pass
+
+
+class UrlDedupIndex:
+    """Answer "was this URL already ingested?" without keeping URL strings in RAM.
+
+    The exact store decides by default, since other nodes (and other
+    processes sharing the SQLite file) keep adding URLs after this process
+    starts. With ``single_writer`` nothing else writes the store, so a Bloom
+    filter warmed from it in a background thread answers misses from
+    memory once loaded; hits are still confirmed against the store.
+    """
+
+    def __init__(
+        self,
+        store: FingerprintStore,
+        capacity: int = 10_000_000,
+        error_rate: float = 0.01,
+        single_writer: bool = False,
+    ) -> None:
+        self.store = store
+        self.bloom: Optional[BloomFilter] = None
+        self._bloom_lock = threading.Lock()
+        self._bloom_ready = threading.Event()
+        self._closing = threading.Event()
+        self._warmer: Optional[threading.Thread] = None
+        if single_writer:
+            self.bloom = BloomFilter(capacity, error_rate)
+            self._warmer = threading.Thread(target=self._warm, name="dedup-bloom-warmer", daemon=True)
+            self._warmer.start()
+
+    def _warm(self) -> None:
+        loaded = 0
+        for fp in self.store.iter_all():
+            if self._closing.is_set():
+                return
+            self._bloom_add(fp)
+            loaded += 1
+        self._bloom_ready.set()
+        logger.info("Loaded %s URL fingerprints into a %s-byte Bloom filter", loaded, self.bloom.nbytes)
+
+    def _bloom_add(self, fp: bytes) -> None:
+        if self.bloom is not None:
+            with self._bloom_lock:  # bit updates are read-modify-write
+                self.bloom.add(fp)
+
+    @classmethod
+    def from_settings(cls) -> Optional["UrlDedupIndex"]:
+        cfg = get_section("dedup", DedupSettings())
+        if not cfg.enabled:
+            return None
+        if cfg.backend == "postgres":
+            from .storage_handler import StorageHandler
+
+            store: FingerprintStore = PostgresFingerprintStore(StorageHandler().engine, cfg.table)
+        else:
+            path = Path(cfg.path) if cfg.path else settings.storage.raw_html_dir.parent / "url_index.sqlite3"
+            store = SqliteFingerprintStore(path)
+        return cls(store, cfg.capacity, cfg.error_rate, cfg.single_writer)
+
+    def definitely_new(self, url: str) -> bool:
+        """True when the warmed Bloom filter rules ``url`` out; never touches the store."""
+
+        return self._bloom_ready.is_set() and url_fingerprint(url) not in self.bloom
+
+    def seen(self, url: str) -> bool:
+        fp = url_fingerprint(url)
+        if self._bloom_ready.is_set() and fp not in self.bloom:
+            return False
+        return self.store.contains(fp)
+
+    def add(self, url: str) -> bool:
+        """Record ``url``; True when the store did not have it yet."""
+
+        fp = url_fingerprint(url)
+        self._bloom_add(fp)
+        return self.store.add(fp)
+
+    def add_many(self, urls: Iterable[str]) -> None:
+        fps = [url_fingerprint(url) for url in urls]
+        for fp in fps:
+            self._bloom_add(fp)
+        self.store.add_many(fps)
+
+    def close(self) -> None:
+        self._closing.set()
+        if self._warmer is not None:
+            self._warmer.join()
+        self.store.close()
+
+
+_shared_index: Optional[UrlDedupIndex] = None
+_shared_loaded = False
+_shared_lock = threading.Lock()
+
+
+def get_dedup_index() -> Optional[UrlDedupIndex]:
+    """Return the process-wide URL index, or ``None`` when disabled."""
+
+    global _shared_index, _shared_loaded
+    with _shared_lock:
+        if not _shared_loaded:
+            _shared_index = UrlDedupIndex.from_settings()
+            _shared_loaded = True
+        return _shared_index
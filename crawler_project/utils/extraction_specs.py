@@ -0,0 +1,48 @@
+"""Per-source extraction specs shared by the core crawlers and the Scrapy spiders."""
+
+from __future__ import annotations
+
+from .html_parser import ExtractionSpec, Field
+
+NEWS_LISTING = ExtractionSpec(
+    name="news_listing",
+    rows=".list li",
+    fields={
+        "title": Field("a"),
+        "href": Field("a", attr="href"),
+        "date_text": Field("span"),
+    },
+)
+
+NEWS_DETAIL = ExtractionSpec(
+    name="news_detail",
+    fields={"content": Field((".article", "#article"), sep="\n")},
+)
+
+LEGAL_LISTING = ExtractionSpec(
+    name="legal_listing",
+    rows=".list li",
+    fields={
+        "title": Field("a"),
+        "href": Field("a", attr="href"),
+        "judgment_date": Field("span"),
+    },
+)
+
+LEGAL_DETAIL = ExtractionSpec(
+    name="legal_detail",
+    fields={"content": Field(".article", sep="\n")},
+)
+
+HOUSING_LISTING = ExtractionSpec(
+    name="housing_listing",
+    rows="li.clear",
+    fields={
+        "community": Field(".positionInfo a"),
+        "address": Field(".positionInfo a", attr="title"),
+        "price": Field(".totalPrice span"),
+        "unit_price": Field(".unitPrice span"),
+        "house_info": Field(".houseInfo"),
+        "deal_date": Field(".dealDate"),
+    },
+)
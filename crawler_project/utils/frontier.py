@@ -0,0 +1,397 @@
+"""Shared crawl frontier so several nodes can split one crawl.
+
+Every node seeds the same listing pages (inserts are idempotent) and then
+leases them in small batches; a lease expires after ``lease_seconds`` so a
+crashed node's pages go back to the pool, and a page is retried at most
+``max_attempts`` times. Detail URLs are claimed one by one as listing pages
+reveal them, so two nodes never fetch the same detail while a lease is live.
+
+The Postgres backend leases with ``FOR UPDATE SKIP LOCKED``, so concurrent
+workers never block on each other's rows; the SQLite backend serializes
+leases with ``BEGIN IMMEDIATE`` and stands in for single-machine runs and
+tests. Nodes also heartbeat into a workers table, which lets each one scale
+its per-host rate limits to ``1 / active_workers`` of the configured rate.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+from .config_loader import get_section
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FrontierSettings:
+    enabled: bool = False
+    backend: str = "sqlite"  # "sqlite" or "postgres"
+    path: Optional[Path] = None
+    table: str = "crawl_frontier"
+    lease_seconds: float = 600
+    batch_size: int = 4  # listing pages leased per round trip
+    max_attempts: int = 3
+    poll_seconds: float = 5  # wait while other nodes still hold leases
+    worker_id: Optional[str] = None  # defaults to <hostname>:<pid>
+
+
+# A row is leasable when nobody holds it, or its holder's lease ran out and
+# it still has attempts left; expired rows without attempts left count as failed.
+_LEASABLE = "(state = 'pending' OR (state = 'leased' AND lease_expires < :now AND attempts < :max_attempts))"
+_REMAINING = (
+    "(state = 'pending' OR (state = 'leased' AND (lease_expires >= :now OR attempts < :max_attempts)))"
+)
+
+
+def _schema(table: str) -> List[str]:
+    return [
+        f"""CREATE TABLE IF NOT EXISTS {table} (
+            scope TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            position INTEGER NOT NULL DEFAULT 0,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            lease_expires DOUBLE PRECISION,
+            PRIMARY KEY (scope, kind, key)
+        )""",
+        f"CREATE INDEX IF NOT EXISTS {table}_ready ON {table} (scope, kind, state, position)",
+        f"CREATE TABLE IF NOT EXISTS {table}_workers (worker TEXT PRIMARY KEY, seen_at DOUBLE PRECISION NOT NULL)",
+    ]
+
+
+def _sql(table: str) -> dict:
+    return {
+        "push": f"INSERT INTO {table} (scope, kind, key, position) VALUES (:scope, :kind, :key, :position) "
+        "ON CONFLICT (scope, kind, key) DO NOTHING",
+        "claim": f"INSERT INTO {table} (scope, kind, key, state, attempts, worker, lease_expires) "
+        "VALUES (:scope, :kind, :key, 'leased', 1, :worker, :expires) "
+        f"ON CONFLICT (scope, kind, key) DO UPDATE SET state = 'leased', worker = excluded.worker, "
+        f"lease_expires = excluded.lease_expires, attempts = {table}.attempts + 1 "
+        f"WHERE {table}.state = 'pending' OR ({table}.state = 'leased' AND {table}.lease_expires < :now "
+        f"AND {table}.attempts < :max_attempts) RETURNING key",
+        "complete": f"UPDATE {table} SET state = 'done', worker = NULL, lease_expires = NULL "
+        "WHERE scope = :scope AND kind = :kind AND key = :key",
+        "release": f"UPDATE {table} SET state = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END, "
+        "worker = NULL, lease_expires = NULL "
+        "WHERE scope = :scope AND kind = :kind AND key = :key AND worker = :worker AND state = 'leased'",
+        "remaining": f"SELECT COUNT(*) FROM {table} WHERE scope = :scope AND kind = :kind AND {_REMAINING}",
+        "heartbeat": f"INSERT INTO {table}_workers (worker, seen_at) VALUES (:worker, :now) "
+        "ON CONFLICT (worker) DO UPDATE SET seen_at = excluded.seen_at",
+        "workers": f"SELECT COUNT(*) FROM {table}_workers WHERE seen_at >= :since",
+    }
+
+
+class FrontierStore(Protocol):
+    def push(self, scope: str, kind: str, keys: Sequence[str]) -> None: ...
+
+    def lease(
+        self, scope: str, kind: str, worker: str, limit: int, expires: float, now: float, max_attempts: int
+    ) -> List[str]: ...
+
+    def claim(self, scope: str, kind: str, key: str, worker: str, expires: float, now: float, max_attempts: int) -> bool: ...
+
+    def complete(self, scope: str, kind: str, keys: Iterable[str]) -> None: ...
+
+    def release(self, scope: str, kind: str, keys: Iterable[str], worker: str, max_attempts: int) -> None: ...
+
+    def remaining(self, scope: str, kind: str, now: float, max_attempts: int) -> int: ...
+
+    def heartbeat(self, worker: str, now: float) -> None: ...
+
+    def active_workers(self, since: float) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class SqliteFrontierStore:
+    """Frontier in a local SQLite file; safe across processes on one machine."""
+
+    def __init__(self, path: Path, table: str = "crawl_frontier") -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self._sql = _sql(table)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _schema(table):
+            self._conn.execute(statement)
+
+    def _write(self, sql: str, rows: List[dict]) -> None:
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(sql, rows)
+
+    def push(self, scope: str, kind: str, keys: Sequence[str]) -> None:
+        rows = [{"scope": scope, "kind": kind, "key": key, "position": position} for position, key in enumerate(keys)]
+        self._write(self._sql["push"], rows)
+
+    def lease(
+        self, scope: str, kind: str, worker: str, limit: int, expires: float, now: float, max_attempts: int
+    ) -> List[str]:
+        params = {"scope": scope, "kind": kind, "now": now, "max_attempts": max_attempts, "limit": limit}
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            keys = [
+                key
+                for (key,) in self._conn.execute(
+                    f"SELECT key FROM {self.table} WHERE scope = :scope AND kind = :kind AND {_LEASABLE} "
+                    "ORDER BY position LIMIT :limit",
+                    params,
+                )
+            ]
+            self._conn.executemany(
+                f"UPDATE {self.table} SET state = 'leased', worker = :worker, lease_expires = :expires, "
+                "attempts = attempts + 1 WHERE scope = :scope AND kind = :kind AND key = :key",
+                [{"scope": scope, "kind": kind, "key": key, "worker": worker, "expires": expires} for key in keys],
+            )
+        return keys
+
+    def claim(self, scope: str, kind: str, key: str, worker: str, expires: float, now: float, max_attempts: int) -> bool:
+        params = {
+            "scope": scope, "kind": kind, "key": key, "worker": worker,
+            "expires": expires, "now": now, "max_attempts": max_attempts,
+        }
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            return bool(self._conn.execute(self._sql["claim"], params).fetchall())
+
+    def complete(self, scope: str, kind: str, keys: Iterable[str]) -> None:
+        self._write(self._sql["complete"], [{"scope": scope, "kind": kind, "key": key} for key in keys])
+
+    def release(self, scope: str, kind: str, keys: Iterable[str], worker: str, max_attempts: int) -> None:
+        rows = [
+            {"scope": scope, "kind": kind, "key": key, "worker": worker, "max_attempts": max_attempts} for key in keys
+        ]
+        self._write(self._sql["release"], rows)
+
+    def remaining(self, scope: str, kind: str, now: float, max_attempts: int) -> int:
+        params = {"scope": scope, "kind": kind, "now": now, "max_attempts": max_attempts}
+        with self._lock:
+            return self._conn.execute(self._sql["remaining"], params).fetchone()[0]
+
+    def heartbeat(self, worker: str, now: float) -> None:
+        self._write(self._sql["heartbeat"], [{"worker": worker, "now": now}])
+
+    def active_workers(self, since: float) -> int:
+        with self._lock:
+            return self._conn.execute(self._sql["workers"], {"since": since}).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PostgresFrontierStore:
+    """Frontier in a Postgres table shared by every node."""
+
+    def __init__(self, engine: Engine, table: str = "crawl_frontier") -> None:
+        self.engine = engine
+        self.table = table
+        self._sql = _sql(table)
+        with engine.begin() as conn:
+            for statement in _schema(table):
+                conn.execute(text(statement))
+
+    def _write(self, sql: str, rows: List[dict]) -> None:
+        if rows:
+            with self.engine.begin() as conn:
+                conn.execute(text(sql), rows)
+
+    def push(self, scope: str, kind: str, keys: Sequence[str]) -> None:
+        rows = [{"scope": scope, "kind": kind, "key": key, "position": position} for position, key in enumerate(keys)]
+        self._write(self._sql["push"], rows)
+
+    def lease(
+        self, scope: str, kind: str, worker: str, limit: int, expires: float, now: float, max_attempts: int
+    ) -> List[str]:
+        sql = text(
+            f"""WITH picked AS (
+                SELECT scope, kind, key FROM {self.table}
+                WHERE scope = :scope AND kind = :kind AND {_LEASABLE}
+                ORDER BY position LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE {self.table} AS f
+            SET state = 'leased', worker = :worker, lease_expires = :expires, attempts = f.attempts + 1
+            FROM picked
+            WHERE f.scope = picked.scope AND f.kind = picked.kind AND f.key = picked.key
+            RETURNING f.key, f.position"""
+        )
+        params = {
+            "scope": scope, "kind": kind, "worker": worker, "limit": limit,
+            "expires": expires, "now": now, "max_attempts": max_attempts,
+        }
+        with self.engine.begin() as conn:
+            rows = conn.execute(sql, params).all()
+        return [key for key, _ in sorted(rows, key=lambda row: row[1])]
+
+    def claim(self, scope: str, kind: str, key: str, worker: str, expires: float, now: float, max_attempts: int) -> bool:
+        params = {
+            "scope": scope, "kind": kind, "key": key, "worker": worker,
+            "expires": expires, "now": now, "max_attempts": max_attempts,
+        }
+        with self.engine.begin() as conn:
+            return conn.execute(text(self._sql["claim"]), params).first() is not None
+
+    def complete(self, scope: str, kind: str, keys: Iterable[str]) -> None:
+        self._write(self._sql["complete"], [{"scope": scope, "kind": kind, "key": key} for key in keys])
+
+    def release(self, scope: str, kind: str, keys: Iterable[str], worker: str, max_attempts: int) -> None:
+        rows = [
+            {"scope": scope, "kind": kind, "key": key, "worker": worker, "max_attempts": max_attempts} for key in keys
+        ]
+        self._write(self._sql["release"], rows)
+
+    def remaining(self, scope: str, kind: str, now: float, max_attempts: int) -> int:
+        params = {"scope": scope, "kind": kind, "now": now, "max_attempts": max_attempts}
+        with self.engine.connect() as conn:
+            return conn.execute(text(self._sql["remaining"]), params).scalar_one()
+
+    def heartbeat(self, worker: str, now: float) -> None:
+        self._write(self._sql["heartbeat"], [{"worker": worker, "now": now}])
+
+    def active_workers(self, since: float) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(text(self._sql["workers"]), {"since": since}).scalar_one()
+
+    def close(self) -> None:
+        pass
+
+
+class CrawlFrontier:
+    """One worker's view of the frontier for a crawler run (``scope``).
+
+    Completions are buffered and written with the next :meth:`lease`,
+    :meth:`remaining` or :meth:`flush`; leases still held on :meth:`close` are released so other
+    nodes can pick them up immediately instead of waiting for expiry.
+    """
+
+    def __init__(
+        self,
+        store: FrontierStore,
+        scope: str,
+        worker: Optional[str] = None,
+        lease_seconds: float = 600,
+        batch_size: int = 4,
+        max_attempts: int = 3,
+        poll_seconds: float = 5,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = store
+        self.scope = scope
+        self.worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self.poll_seconds = poll_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._held: Set[Tuple[str, str]] = set()
+        self._completed: List[Tuple[str, str]] = []
+
+    @classmethod
+    def from_settings(cls, crawler: str, run_id: str) -> Optional["CrawlFrontier"]:
+        cfg = get_section("frontier", FrontierSettings())
+        if not cfg.enabled:
+            return None
+        if cfg.backend == "postgres":
+            from .storage_handler import StorageHandler
+
+            store: FrontierStore = PostgresFrontierStore(StorageHandler().engine, cfg.table)
+        else:
+            path = Path(cfg.path) if cfg.path else settings.storage.raw_html_dir.parent / "frontier.sqlite3"
+            store = SqliteFrontierStore(path, cfg.table)
+        return cls(
+            store,
+            f"{crawler}:{run_id}",
+            cfg.worker_id,
+            cfg.lease_seconds,
+            cfg.batch_size,
+            cfg.max_attempts,
+            cfg.poll_seconds,
+        )
+
+    def seed(self, kind: str, keys: Sequence[str]) -> None:
+        """Add ``keys`` in crawl order; keys another node already seeded are kept as they are."""
+
+        self.store.push(self.scope, kind, list(keys))
+
+    def lease(self, kind: str, limit: Optional[int] = None) -> List[str]:
+        self.flush()
+        now = self._clock()
+        self.store.heartbeat(self.worker, now)
+        keys = self.store.lease(
+            self.scope, kind, self.worker, limit or self.batch_size, now + self.lease_seconds, now, self.max_attempts
+        )
+        with self._lock:
+            self._held.update((kind, key) for key in keys)
+        return keys
+
+    def claim(self, kind: str, key: str) -> bool:
+        """Take ``key`` unless it is done or leased by a live worker."""
+
+        now = self._clock()
+        claimed = self.store.claim(self.scope, kind, key, self.worker, now + self.lease_seconds, now, self.max_attempts)
+        if claimed:
+            with self._lock:
+                self._held.add((kind, key))
+        return claimed
+
+    def complete(self, kind: str, key: str) -> None:
+        with self._lock:
+            if (kind, key) in self._held:
+                self._held.discard((kind, key))
+                self._completed.append((kind, key))
+
+    def release(self, kind: str, keys: Iterable[str]) -> None:
+        """Hand unfinished leases back (counts as a failed attempt)."""
+
+        with self._lock:
+            keys = [key for key in keys if (kind, key) in self._held]
+            self._held.difference_update((kind, key) for key in keys)
+        self.store.release(self.scope, kind, keys, self.worker, self.max_attempts)
+
+    def remaining(self, kind: str) -> int:
+        """Keys not yet done or given up on, including ones leased by other nodes."""
+
+        self.flush()
+        return self.store.remaining(self.scope, kind, self._clock(), self.max_attempts)
+
+    def active_workers(self) -> int:
+        """Workers that leased within the last lease period (at least this one)."""
+
+        return max(1, self.store.active_workers(self._clock() - self.lease_seconds))
+
+    def flush(self) -> None:
+        with self._lock:
+            completed, self._completed = self._completed, []
+        by_kind: Dict[str, List[str]] = {}
+        for kind, key in completed:
+            by_kind.setdefault(kind, []).append(key)
+        for kind, keys in by_kind.items():
+            self.store.complete(self.scope, kind, keys)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            held, self._held = list(self._held), set()
+        for kind in {kind for kind, _ in held}:
+            self.store.release(self.scope, kind, [key for k, key in held if k == kind], self.worker, self.max_attempts)
+        self.store.close()
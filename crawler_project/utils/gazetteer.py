@@ -0,0 +1,176 @@
+"""Gazetteer-backed location extraction for article and judgment text.
+
+Place names and aliases from an admin-division CSV (GB/T 2260 codes with
+WGS84 centroids) are compiled into one ``KeywordMatcher``, so a text is
+scanned once however large the gazetteer gets. The bundled file covers
+Beijing and Tianjin; point ``gazetteer.path`` at a national file to widen it.
+"""
+
+from __future__ import annotations
+
+import csv
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .config_loader import get_section
+from .keyword_matcher import KeywordMatcher
+
+DEFAULT_GAZETTEER = Path(__file__).resolve().parent.parent / "data" / "admin_divisions.csv"
+LEVEL_RANK = {"province": 0, "city": 1, "district": 2}
+LOCATION_COLUMNS = ("location", "admin_code", "longitude", "latitude")
+# Two-character district aliases are common words too (朝阳群众, 南开大学); they
+# only count right after their parent (北京海淀) or before one of these.
+SHORT_ALIAS_LENGTH = 2
+ALIAS_SUFFIXES = ("路", "街", "道", "镇", "乡", "村", "桥", "站", "地区", "一带", "境内", "辖区", "附近")
+
+
+@dataclass
+class GazetteerSettings:
+    path: Optional[str] = None  # CSV: code,name,level,parent_code,longitude,latitude,aliases
+
+
+class Place(NamedTuple):
+    code: str
+    name: str
+    level: str
+    parent_code: Optional[str]
+    longitude: float
+    latitude: float
+
+
+class PlaceMention(NamedTuple):
+    place: Place
+    surface: str
+    start: int
+    end: int
+
+
+class Location(NamedTuple):
+    code: str
+    name: str  # full name, e.g. 北京市朝阳区
+    longitude: float
+    latitude: float
+    mention: PlaceMention
+
+
+class Gazetteer:
+    def __init__(self, places: Iterable[Place], aliases: Optional[Dict[str, List[str]]] = None) -> None:
+        self.places: Dict[str, Place] = {place.code: place for place in places}
+        aliases = aliases or {}
+        self._matcher = KeywordMatcher(
+            {code: [place.name, *aliases.get(code, [])] for code, place in self.places.items()}
+        )
+
+    @classmethod
+    def from_csv(cls, path: Path | str) -> "Gazetteer":
+        places, aliases = [], {}
+        with open(path, encoding="utf-8", newline="") as handle:
+            for row in csv.DictReader(handle):
+                code = row["code"].strip()
+                places.append(
+                    Place(
+                        code=code,
+                        name=row["name"].strip(),
+                        level=row["level"].strip(),
+                        parent_code=row.get("parent_code", "").strip() or None,
+                        longitude=float(row["longitude"]),
+                        latitude=float(row["latitude"]),
+                    )
+                )
+                aliases[code] = [alias for alias in (row.get("aliases") or "").split("|") if alias]
+        return cls(places, aliases)
+
+    def mentions(self, text: str) -> List[PlaceMention]:
+        """Leftmost-longest, non-overlapping place mentions in text order.
+
+        A span naming several places (same-name districts) yields one mention
+        per place. Short aliases of non-top-level places are skipped unless
+        their parent is mentioned just before or an ``ALIAS_SUFFIXES`` word
+        follows.
+        """
+
+        text = text or ""
+        hits = sorted(self._matcher.iter_matches(text), key=lambda hit: (hit.start, -(hit.end - hit.start)))
+        found: List[PlaceMention] = []
+        cursor = 0
+        for hit in hits:
+            if hit.start < cursor and not (found and (hit.start, hit.end) == (found[-1].start, found[-1].end)):
+                continue
+            place = self.places[hit.category]
+            if not self._alias_in_context(text, hit, place, found):
+                continue
+            found.append(PlaceMention(place, hit.keyword, hit.start, hit.end))
+            cursor = hit.end
+        return found
+
+    @staticmethod
+    def _alias_in_context(text: str, hit, place: Place, found: List[PlaceMention]) -> bool:
+        if hit.keyword == place.name or place.parent_code is None or len(hit.keyword) > SHORT_ALIAS_LENGTH:
+            return True
+        if text.startswith(ALIAS_SUFFIXES, hit.end):
+            return True
+        return any(mention.end == hit.start and mention.place.code == place.parent_code for mention in found)
+
+    def locate(self, text: str) -> Optional[Location]:
+        """Most specific place in ``text``.
+
+        Districts beat cities beat provinces; a district whose parent is also
+        mentioned beats one mentioned alone; ties go to the earliest mention.
+        A place found only by an alias, with its parent unmentioned, loses to
+        any top-level place named in the text.
+        """
+
+        mentions = self.mentions(text)
+        if not mentions:
+            return None
+        mentioned = {mention.place.code for mention in mentions}
+        top_level = any(mention.place.parent_code is None for mention in mentions)
+
+        def score(item):
+            position, mention = item
+            place = mention.place
+            orphan = place.parent_code is not None and place.parent_code not in mentioned
+            weak = orphan and top_level and mention.surface != place.name
+            return (weak, -LEVEL_RANK.get(place.level, 0), orphan, position)
+
+        _, best = min(enumerate(mentions), key=score)
+        return Location(best.place.code, self.full_name(best.place), best.place.longitude, best.place.latitude, best)
+
+    def full_name(self, place: Place) -> str:
+        names = [place.name]
+        parent = self.places.get(place.parent_code or "")
+        while parent is not None:
+            names.append(parent.name)
+            parent = self.places.get(parent.parent_code or "")
+        return "".join(reversed(names))
+
+
+_shared: Optional[Gazetteer] = None
+_shared_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Return the process-wide gazetteer, loading the configured file once."""
+
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            settings = get_section("gazetteer", GazetteerSettings())
+            _shared = Gazetteer.from_csv(settings.path or DEFAULT_GAZETTEER)
+        return _shared
+
+
+def location_columns(text: str) -> Dict[str, object]:
+    """Flat location fields for a record; all ``None`` when no place is found."""
+
+    location = get_gazetteer().locate(text)
+    if location is None:
+        return dict.fromkeys(LOCATION_COLUMNS)
+    return {
+        "location": location.name,
+        "admin_code": location.code,
+        "longitude": location.longitude,
+        "latitude": location.latitude,
+    }
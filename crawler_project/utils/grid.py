@@ -0,0 +1,123 @@
+"""Square-grid aggregation of point data in a projected CRS.
+
+Points are projected once per chunk with pyproj, floored to whole metres
+and bucketed by integer division, so a cell is identified by two int64
+indices and the grid is aligned to the CRS origin. Aggregates are merged
+chunk by chunk: memory grows with the number of occupied cells, never with
+the number of points.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config_loader import get_section
+
+
+@dataclass
+class GridSettings:
+    cell_size_m: int = 5000
+    crs: str = "EPSG:32650"  # UTM zone 50N, metric across Beijing and Tianjin
+    chunk_size: int = 500_000
+
+
+class GridSpec:
+    def __init__(self, cell_size: int = 5000, crs: str = "EPSG:32650") -> None:
+        from pyproj import Transformer
+
+        self.cell_size = int(cell_size)
+        self.crs = crs
+        self._forward = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
+
+    @classmethod
+    def from_settings(cls) -> "GridSpec":
+        cfg = get_section("gridding", GridSettings())
+        return cls(cfg.cell_size_m, cfg.crs)
+
+    def cells(self, lng, lat) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(ix, iy, valid)`` for WGS84 points; invalid rows have NaN/inf input."""
+
+        x, y = self._forward.transform(np.asarray(lng, dtype=np.float64), np.asarray(lat, dtype=np.float64))
+        valid = np.isfinite(x) & np.isfinite(y)
+        x_m = np.floor(np.where(valid, x, 0.0)).astype(np.int64)
+        y_m = np.floor(np.where(valid, y, 0.0)).astype(np.int64)
+        return x_m // self.cell_size, y_m // self.cell_size, valid
+
+    @staticmethod
+    def cell_id(ix: np.ndarray, iy: np.ndarray) -> np.ndarray:
+        """Pack both indices into one sortable int64 key."""
+
+        return (np.asarray(ix, dtype=np.int64) << 32) | (np.asarray(iy, dtype=np.int64) & 0xFFFFFFFF)
+
+    def polygons(self, ix: np.ndarray, iy: np.ndarray, to_crs: str = "EPSG:4326"):
+        import geopandas as gpd
+        import shapely
+
+        x0 = np.asarray(ix, dtype=np.int64) * self.cell_size
+        y0 = np.asarray(iy, dtype=np.int64) * self.cell_size
+        boxes = shapely.box(x0, y0, x0 + self.cell_size, y0 + self.cell_size)
+        return gpd.GeoSeries(boxes, crs=self.crs).to_crs(to_crs)
+
+
+class GridAggregator:
+    """Running per-cell counts, sums and means, optionally split by a category column.
+
+    For each value column ``v`` the result has ``v_sum``, ``v_n`` (non-null
+    count) and ``v_mean``; nulls and non-numeric values are skipped.
+    """
+
+    def __init__(self, spec: GridSpec, values: Sequence[str] = (), by: Optional[str] = None) -> None:
+        self.spec = spec
+        self.values = list(values)
+        self.by = by
+        self.points = 0
+        self._table: Optional[pd.DataFrame] = None
+
+    @property
+    def _keys(self):
+        return ["ix", "iy"] + ([self.by] if self.by else [])
+
+    def add(self, lng, lat, frame: Optional[pd.DataFrame] = None) -> None:
+        ix, iy, valid = self.spec.cells(lng, lat)
+        if not valid.any():
+            return
+        data: Dict[str, np.ndarray] = {"ix": ix[valid], "iy": iy[valid], "count": np.ones(valid.sum(), np.int64)}
+        if self.by:
+            data[self.by] = frame[self.by].to_numpy(dtype=object)[valid]
+        for column in self.values:
+            numbers = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=np.float64)[valid]
+            present = ~np.isnan(numbers)
+            data[f"{column}_sum"] = np.where(present, numbers, 0.0)
+            data[f"{column}_n"] = present.astype(np.int64)
+        chunk = pd.DataFrame(data).groupby(self._keys, dropna=False, sort=False).sum()
+        self._table = chunk if self._table is None else self._table.add(chunk, fill_value=0)
+        self.points += int(valid.sum())
+
+    def add_frames(self, frames: Iterable[pd.DataFrame], lng: str = "longitude", lat: str = "latitude") -> None:
+        for frame in frames:
+            self.add(frame[lng].to_numpy(dtype=np.float64), frame[lat].to_numpy(dtype=np.float64), frame)
+
+    def result(self) -> pd.DataFrame:
+        columns = [*self._keys, "cell_id", "count"]
+        if self._table is None:
+            return pd.DataFrame(columns=columns)
+        table = self._table.reset_index()
+        table["count"] = table["count"].astype(np.int64)
+        table.insert(len(self._keys), "cell_id", GridSpec.cell_id(table["ix"], table["iy"]))
+        for column in self.values:
+            table[f"{column}_n"] = table[f"{column}_n"].astype(np.int64)
+            n = table[f"{column}_n"].to_numpy()
+            table[f"{column}_mean"] = np.divide(
+                table[f"{column}_sum"].to_numpy(), n, out=np.full(len(n), np.nan), where=n > 0
+            )
+        return table.sort_values(self._keys, kind="stable").reset_index(drop=True)
+
+    def to_geodataframe(self, crs: str = "EPSG:4326"):
+        import geopandas as gpd
+
+        table = self.result()
+        return gpd.GeoDataFrame(table, geometry=self.spec.polygons(table["ix"], table["iy"], crs).values, crs=crs)
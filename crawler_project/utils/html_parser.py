@@ -0,0 +1,179 @@
+"""Pluggable HTML extraction backends driven by declarative specs.
+
+Backends, fastest first: selectolax (optional), lxml with precompiled XPath
+(CSS translated once through cssselect), and BeautifulSoup as the fallback.
+All of them return the same plain dicts for the same spec and page.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Protocol, Tuple, Union
+
+from .config_loader import get_section
+
+
+@dataclass(frozen=True)
+class Field:
+    """One extracted value: text of the first match, or one of its attributes.
+
+    ``css`` may be a tuple of selectors tried in order. Text is every
+    descendant text node stripped, empties dropped, joined by ``sep``.
+    A missing element yields ``None``.
+    """
+
+    css: Union[str, Tuple[str, ...]]
+    attr: Optional[str] = None
+    sep: str = ""
+
+    @property
+    def selectors(self) -> Tuple[str, ...]:
+        return (self.css,) if isinstance(self.css, str) else tuple(self.css)
+
+
+@dataclass(frozen=True)
+class ExtractionSpec:
+    """Fields to pull from each ``rows`` match, or once from the whole page."""
+
+    name: str
+    fields: Mapping[str, Field]
+    rows: Optional[str] = None
+
+
+@dataclass
+class ParserSettings:
+    backend: str = "auto"  # auto | selectolax | lxml | soup
+
+
+class ParserBackend(Protocol):
+    name: str
+
+    def extract(self, spec: ExtractionSpec, html: str) -> List[Dict[str, Optional[str]]]: ...
+
+
+def _join_text(parts, sep: str) -> str:
+    return sep.join(part for part in (p.strip() for p in parts) if part)
+
+
+# lxml refuses str input that carries an encoding declaration (XHTML pages).
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+class LxmlBackend:
+    """lxml.html with every selector compiled to an XPath object once per spec."""
+
+    name = "lxml"
+    _TEXT_XPATH = ".//text()[not(ancestor::script) and not(ancestor::style)]"
+
+    def __init__(self) -> None:
+        from cssselect import HTMLTranslator
+        from lxml import etree, html as lxml_html
+
+        self._etree = etree
+        self._html = lxml_html
+        self._translator = HTMLTranslator()
+        self._text = etree.XPath(self._TEXT_XPATH)
+        self._compiled: Dict[str, object] = {}
+
+    def _compile(self, css: str):
+        compiled = self._compiled.get(css)
+        if compiled is None:
+            compiled = self._etree.XPath(self._translator.css_to_xpath(css, prefix="descendant::"))
+            self._compiled[css] = compiled
+        return compiled
+
+    def extract(self, spec: ExtractionSpec, html: str) -> List[Dict[str, Optional[str]]]:
+        if not html or not html.strip():
+            return [] if spec.rows else [{name: None for name in spec.fields}]
+        root = self._html.fromstring(_XML_DECLARATION.sub("", html, count=1))
+        scopes = self._compile(spec.rows)(root) if spec.rows else [root]
+        return [{name: self._value(scope, fld) for name, fld in spec.fields.items()} for scope in scopes]
+
+    def _value(self, scope, fld: Field) -> Optional[str]:
+        for css in fld.selectors:
+            matches = self._compile(css)(scope)
+            if matches:
+                node = matches[0]
+                return node.get(fld.attr) if fld.attr else _join_text(self._text(node), fld.sep)
+        return None
+
+
+class SelectolaxBackend:
+    """selectolax (lexbor) backend, used automatically when installed."""
+
+    name = "selectolax"
+    _SPLIT = "\x00"
+
+    def __init__(self) -> None:
+        from selectolax.lexbor import LexborHTMLParser
+
+        self._parser = LexborHTMLParser
+
+    def extract(self, spec: ExtractionSpec, html: str) -> List[Dict[str, Optional[str]]]:
+        if not html or not html.strip():
+            return [] if spec.rows else [{name: None for name in spec.fields}]
+        tree = self._parser(html)
+        tree.strip_tags(["script", "style"])
+        scopes = tree.css(spec.rows) if spec.rows else [tree.root]
+        return [{name: self._value(scope, fld) for name, fld in spec.fields.items()} for scope in scopes]
+
+    def _value(self, scope, fld: Field) -> Optional[str]:
+        for css in fld.selectors:
+            node = scope.css_first(css)
+            if node is not None:
+                if fld.attr:
+                    return node.attributes.get(fld.attr)
+                return _join_text(node.text(deep=True, separator=self._SPLIT).split(self._SPLIT), fld.sep)
+        return None
+
+
+class SoupBackend:
+    """BeautifulSoup fallback; slowest, but always available."""
+
+    name = "soup"
+
+    def __init__(self) -> None:
+        from bs4 import BeautifulSoup
+
+        self._soup = BeautifulSoup
+
+    def extract(self, spec: ExtractionSpec, html: str) -> List[Dict[str, Optional[str]]]:
+        soup = self._soup(html or "", "lxml")
+        scopes = soup.select(spec.rows) if spec.rows else [soup]
+        return [{name: self._value(scope, fld) for name, fld in spec.fields.items()} for scope in scopes]
+
+    def _value(self, scope, fld: Field) -> Optional[str]:
+        for css in fld.selectors:
+            node = scope.select_one(css)
+            if node is not None:
+                return node.get(fld.attr) if fld.attr else node.get_text(fld.sep, strip=True)
+        return None
+
+
+_BACKENDS = {"selectolax": SelectolaxBackend, "lxml": LxmlBackend, "soup": SoupBackend}
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend(name: Optional[str] = None) -> ParserBackend:
+    """Return a backend by name; ``auto`` picks the fastest one importable."""
+
+    name = name or get_section("html_parser", ParserSettings()).backend
+    if name != "auto":
+        return _BACKENDS[name]()
+    for candidate in ("selectolax", "lxml", "soup"):
+        try:
+            return _BACKENDS[candidate]()
+        except ImportError:
+            continue
+    raise ImportError("No HTML parser backend available")
+
+
+def extract(spec: ExtractionSpec, html: str, backend: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
+    return get_backend(backend).extract(spec, html)
+
+
+def extract_one(spec: ExtractionSpec, html: str, backend: Optional[str] = None) -> Dict[str, Optional[str]]:
+    rows = extract(spec, html, backend)
+    return rows[0] if rows else {name: None for name in spec.fields}
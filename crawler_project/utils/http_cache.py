@@ -0,0 +1,191 @@
+"""On-disk HTTP response cache with conditional-request validators."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+from ..config import settings
+from .config_loader import get_section
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    immutable INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+@dataclass
+class HttpCacheSettings:
+    enabled: bool = True
+    path: Optional[Path] = None
+    max_bytes: int = 512 * 1024 * 1024
+    ttl_seconds: int = 7 * 24 * 3600
+    evict_every: int = 200
+
+
+@dataclass
+class CachedResponse:
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    immutable: bool
+    fetched_at: float
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite store of zlib-compressed bodies keyed by method, URL and params.
+
+    Entries marked immutable are served without touching the network and
+    only leave the cache through size eviction; all others expire after
+    ``ttl_seconds``. When the cache grows past ``max_bytes`` the least
+    recently used entries go first.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, ttl_seconds: int, evict_every: int = 200) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.evict_every = max(1, evict_every)
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls) -> Optional["ResponseCache"]:
+        cfg = get_section("http_cache", HttpCacheSettings())
+        if not cfg.enabled:
+            return None
+        path = Path(cfg.path) if cfg.path else settings.storage.raw_html_dir.parent / "http_cache.sqlite3"
+        return cls(path, cfg.max_bytes, cfg.ttl_seconds, cfg.evict_every)
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha1(f"{method.upper()} {url}?{query}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, immutable, fetched_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            etag, last_modified, body, immutable, fetched_at = row
+            if not immutable and now - fetched_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return CachedResponse(
+            body=zlib.decompress(body).decode("utf-8"),
+            etag=etag,
+            last_modified=last_modified,
+            immutable=bool(immutable),
+            fetched_at=fetched_at,
+        )
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        immutable: bool = False,
+    ) -> None:
+        now = time.time()
+        blob = zlib.compress(body.encode("utf-8"), 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, etag, last_modified, body, size, immutable, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, blob, len(blob), int(immutable), now, now),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict(now)
+
+    def refresh(self, key: str) -> None:
+        """Mark a cached entry as revalidated (e.g. after a 304)."""
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+
+    def evict(self) -> None:
+        with self._lock:
+            self._evict(time.time())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM responses WHERE immutable = 0 AND fetched_at < ?",
+            (now - self.ttl_seconds,),
+        )
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        logger.info("Evicted %s cached responses (%s bytes)", len(doomed), freed)
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_loaded = False
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or ``None`` when disabled."""
+
+    global _shared_cache, _shared_loaded
+    with _shared_lock:
+        if not _shared_loaded:
+            _shared_cache = ResponseCache.from_settings()
+            _shared_loaded = True
+        return _shared_cache
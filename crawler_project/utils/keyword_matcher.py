@@ -0,0 +1,229 @@
+"""Multi-pattern keyword matching compiled into ``re`` alternations.
+
+Each dictionary maps a category to the terms that signal it. The terms are
+compiled once per dictionary into trie-shaped regular expressions, so the
+scan over the text runs in the C regex engine and Python code only runs
+where a term may start.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from .. import config
+from .config_loader import get_section, load_config_file
+
+Dictionary = Mapping[str, Iterable[str]]
+
+
+class KeywordHit(NamedTuple):
+    category: str
+    keyword: str
+    start: int
+    end: int
+
+
+@dataclass
+class CategoryMatch:
+    category: str
+    count: int = 0
+    positions: List[Tuple[int, int]] = field(default_factory=list)
+    keywords: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class KeywordSettings:
+    # extra terms per dictionary name, e.g. {"disaster_types": {"火灾": ["失火"]}}
+    dictionaries: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    # YAML/JSON files of {category: [terms]} per dictionary name
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation over ``terms`` factored into a character trie.
+
+    At each position the first successful match is the longest term starting
+    there, and the leading character set lets ``re`` skip non-candidate
+    positions in C.
+    """
+
+    root: Dict[str, dict] = {}
+    for term in terms:
+        node = root
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:  # a term ends here: longer terms are tried first
+            return body + "?" if len(branches) == 1 and len(branches[0]) == 1 else f"(?:{body})?"
+        return body
+
+    return render(root)
+
+
+_DISPATCH_MIN_STARTS = 64
+_SUBSTRING_MAX_TERMS = 5  # below this, one str.__contains__ per term beats any regex scan
+
+
+class KeywordMatcher:
+    """Keyword matching over the terms of a category dictionary.
+
+    Terms are compiled into trie-shaped alternations, so finding the next hit
+    runs inside ``re`` and Python only handles the hits; large dictionaries
+    get one trie per first character behind a character-class scan. Categories
+    keep the dictionary's order; ``first_category`` returns the earliest one
+    in that order with any hit, not the earliest hit in the text.
+    """
+
+    def __init__(self, dictionary: Dictionary) -> None:
+        self.dictionary: Dict[str, List[str]] = {
+            category: [term for term in terms if term] for category, terms in dictionary.items()
+        }
+        self.categories: List[str] = list(self.dictionary)
+        self._rank = {category: rank for rank, category in enumerate(self.categories)}
+        self._term_categories: Dict[str, Tuple[str, ...]] = {}
+        for category, terms in self.dictionary.items():
+            for term in terms:
+                known = self._term_categories.get(term, ())
+                if category not in known:
+                    self._term_categories[term] = known + (category,)
+        by_first: Dict[str, List[str]] = {}
+        for term in self._term_categories:
+            by_first.setdefault(term[0], []).append(term)
+        # re tries alternatives one by one, so past a few dozen first characters
+        # a character class finds candidates and a per-character trie matches them.
+        self._any: Optional[re.Pattern] = None
+        self._starts: Optional[re.Pattern] = None
+        self._by_first: Dict[str, re.Pattern] = {}
+        if len(by_first) > _DISPATCH_MIN_STARTS:
+            self._starts = re.compile("[" + "".join(re.escape(char) for char in by_first) + "]")
+            self._by_first = {char: re.compile(_trie_pattern(terms)) for char, terms in by_first.items()}
+        elif by_first:
+            self._any = re.compile(_trie_pattern(self._term_categories))
+        self._prefixes: Dict[str, Tuple[str, ...]] = {}
+
+    def _terms_prefixing(self, longest: str) -> Tuple[str, ...]:
+        """Every term that is a prefix of ``longest`` (itself included), longest first."""
+
+        terms = self._prefixes.get(longest)
+        if terms is None:
+            terms = self._prefixes[longest] = tuple(
+                longest[:size] for size in range(len(longest), 0, -1) if longest[:size] in self._term_categories
+            )
+        return terms
+
+    def _longest(self, text: str) -> Iterator[Tuple[int, str]]:
+        """(start, longest term starting there) for every position where a term starts."""
+
+        if self._starts is not None:
+            by_first = self._by_first
+            for candidate in self._starts.finditer(text):
+                start = candidate.start()
+                match = by_first[text[start]].match(text, start)
+                if match is not None:
+                    yield start, match.group()
+        elif self._any is not None:
+            search = self._any.search
+            match = search(text)
+            while match is not None:
+                yield match.start(), match.group()
+                match = search(text, match.start() + 1)
+
+    def _hits(self, text: str) -> Iterator[KeywordHit]:
+        """Term occurrences grouped by start position, left to right."""
+
+        for start, longest in self._longest(text or ""):
+            for term in self._terms_prefixing(longest):
+                for category in self._term_categories[term]:
+                    yield KeywordHit(category, term, start, start + len(term))
+
+    def iter_matches(self, text: str) -> Iterator[KeywordHit]:
+        """Yield every (possibly overlapping) term occurrence, ordered by end position."""
+
+        yield from sorted(self._hits(text), key=lambda hit: (hit.end, hit.start))
+
+    def scan(self, text: str) -> Dict[str, CategoryMatch]:
+        """Return counts, spans and per-term counts for each matched category."""
+
+        found: Dict[str, CategoryMatch] = {}
+        for hit in self.iter_matches(text):
+            match = found.get(hit.category)
+            if match is None:
+                match = found[hit.category] = CategoryMatch(hit.category)
+            match.count += 1
+            match.positions.append((hit.start, hit.end))
+            match.keywords[hit.keyword] = match.keywords.get(hit.keyword, 0) + 1
+        return {category: found[category] for category in sorted(found, key=self._rank.__getitem__)}
+
+    def categories_in(self, text: str) -> List[str]:
+        """Matched categories in dictionary order."""
+
+        seen = {hit.category for hit in self._hits(text)}
+        return sorted(seen, key=self._rank.__getitem__)
+
+    def first_category(self, text: str) -> Optional[str]:
+        if len(self._term_categories) <= _SUBSTRING_MAX_TERMS:
+            text = text or ""
+            for category, terms in self.dictionary.items():
+                if any(term in text for term in terms):
+                    return category
+            return None
+        best: Optional[int] = None
+        for hit in self._hits(text):
+            rank = self._rank[hit.category]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return None if best is None else self.categories[best]
+
+
+def load_dictionary(name: str, defaults: Dictionary) -> Dict[str, List[str]]:
+    """Merge the built-in ``defaults`` with configured terms for ``name``.
+
+    Configured categories are appended after the built-in ones, so results for
+    the default terms do not change when a dictionary is extended.
+    """
+
+    settings = get_section("keywords", KeywordSettings())
+    merged: Dict[str, List[str]] = {category: list(terms) for category, terms in defaults.items()}
+    extras = [settings.dictionaries.get(name) or {}]
+    if name in settings.files:
+        path = Path(settings.files[name])
+        if not path.is_absolute():
+            path = config.DEFAULT_CONFIG_FILE.parent / path
+        extras.append(load_config_file(path))
+    for extra in extras:
+        for category, terms in extra.items():
+            bucket = merged.setdefault(category, [])
+            known = set(bucket)
+            for term in terms:
+                if term not in known:
+                    known.add(term)
+                    bucket.append(term)
+    return merged
+
+
+_matchers: Dict[str, KeywordMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_matcher(name: str, defaults: Dictionary) -> KeywordMatcher:
+    """Return the process-wide matcher for dictionary ``name``, building it once."""
+
+    matcher = _matchers.get(name)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(name)
+            if matcher is None:
+                matcher = _matchers[name] = KeywordMatcher(load_dictionary(name, defaults))
+    return matcher
@@ -0,0 +1,113 @@
+"""Adaptive quadtree tiling for Baidu place-search bounds queries.
+
+A bounds query returns at most ``result_cap`` POIs however many the area
+holds. Each tile's first page reports ``total``: a saturated tile is split
+into four quadrants and re-queried, anything else is paged only as far as
+``total`` requires. Shared by ``SpatialCrawler`` and ``BaiduPoiSpider``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TilingSettings:
+    result_cap: int = 400  # most results Baidu returns for one query
+    page_size: int = 20  # API maximum
+    max_depth: int = 8  # 8 splits of a city-sized box is ~100 m tiles
+
+
+class Tile(NamedTuple):
+    south: float
+    west: float
+    north: float
+    east: float
+
+    @classmethod
+    def from_corners(cls, southwest: str, northeast: str) -> "Tile":
+        """Build from Baidu-style ``"lat,lng"`` corner strings."""
+
+        south, west = (float(part) for part in southwest.split(","))
+        north, east = (float(part) for part in northeast.split(","))
+        return cls(south, west, north, east)
+
+    def to_param(self) -> str:
+        return f"{self.south:.6f},{self.west:.6f},{self.north:.6f},{self.east:.6f}"
+
+    def split(self) -> List["Tile"]:
+        mid_lat = (self.south + self.north) / 2
+        mid_lng = (self.west + self.east) / 2
+        return [
+            Tile(self.south, self.west, mid_lat, mid_lng),
+            Tile(self.south, mid_lng, mid_lat, self.east),
+            Tile(mid_lat, self.west, self.north, mid_lng),
+            Tile(mid_lat, mid_lng, self.north, self.east),
+        ]
+
+
+class PageRequest(NamedTuple):
+    tile: Tile
+    page: int = 0
+    depth: int = 0
+
+
+def search_params(query: str, request: PageRequest, ak: str, settings: TilingSettings) -> Dict[str, Any]:
+    return {
+        "query": query,
+        "bounds": request.tile.to_param(),
+        "output": "json",
+        "scope": 1,
+        "page_size": settings.page_size,
+        "page_num": request.page,
+        "ak": ak or "",
+    }
+
+
+def page_results(payload: Dict[str, Any], request: PageRequest) -> List[Dict[str, Any]]:
+    if payload.get("status", 0) != 0:
+        logger.warning("Baidu place search failed for %s: %s", request, payload.get("message", payload.get("status")))
+        return []
+    return payload.get("results") or []
+
+
+def follow_ups(payload: Dict[str, Any], request: PageRequest, settings: TilingSettings) -> List[PageRequest]:
+    """Next requests after ``request``: quadrants if the tile is saturated, else its remaining pages.
+
+    Only a tile's first page plans anything; later pages were already scheduled.
+    """
+
+    if request.page != 0 or payload.get("status", 0) != 0:
+        return []
+    total = int(payload.get("total") or 0)
+    if total >= settings.result_cap:
+        if request.depth < settings.max_depth:
+            return [PageRequest(child, 0, request.depth + 1) for child in request.tile.split()]
+        logger.warning("Tile %s still saturated at max depth %s; results truncated", request.tile, request.depth)
+    if len(payload.get("results") or []) < settings.page_size:
+        return []
+    pages = math.ceil(min(total, settings.result_cap) / settings.page_size)
+    return [PageRequest(request.tile, page, request.depth) for page in range(1, pages)]
+
+
+def poi_key(poi: Dict[str, Any]) -> str:
+    if poi.get("uid"):
+        return str(poi["uid"])
+    location = poi.get("location") or {}
+    return f"{poi.get('name')}@{location.get('lat')},{location.get('lng')}"
+
+
+def unseen(pois: Iterable[Dict[str, Any]], seen: Set[str]) -> Iterator[Dict[str, Any]]:
+    """Drop POIs already returned by an overlapping tile or page."""
+
+    for poi in pois:
+        key = poi_key(poi)
+        if key not in seen:
+            seen.add(key)
+            yield poi
+
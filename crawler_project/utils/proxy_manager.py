@@ -1,38 +1,268 @@
-"""Proxy pool management with health tracking."""
+"""Proxy pool management with health tracking.
+
+Healthy proxies live in an array with an index map (O(1) add/remove) and
+proxies in cooldown in a min-heap keyed by expiry, so picking a proxy only
+pops the cooldowns that have run out instead of rescanning the pool. Each
+proxy carries EWMAs of latency and success, and a Fenwick tree over the
+healthy proxies' scores draws one with probability proportional to its
+score in O(log n): fast, reliable proxies get most of the traffic while the
+rest are still probed. The pool file is re-read when its mtime changes.
+"""
 
 from __future__ import annotations
 
+import heapq
+import logging
 import random
+import threading
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from .config_loader import get_section
+
+logger = logging.getLogger(__name__)
+
+# Statuses that indicate the proxy (not the target page) is the problem.
+PROXY_FAILURE_STATUSES = frozenset({403, 407, 429, 502, 503, 504})
+
+
+@dataclass
+class ProxyPoolSettings:
+    cooldown_seconds: float = 300  # first cooldown; doubles per consecutive failure
+    max_cooldown_seconds: float = 3600
+    ewma_alpha: float = 0.3  # weight of the newest observation
+    reload_seconds: float = 30  # how often to stat pool_file for changes
+
+
+@dataclass
+class ProxyStats:
+    latency: float = 1.0  # seconds, EWMA
+    success: float = 1.0  # 0..1, EWMA
+    failures: int = 0  # consecutive
+    blocked_until: float = 0.0
+
+    @property
+    def score(self) -> float:
+        return self.success / max(self.latency, 0.05)
+
+
+class WeightedSampler:
+    """Fenwick tree of non-negative weights supporting append, pop-last, update and sampling."""
+
+    def __init__(self) -> None:
+        self._weights: List[float] = []
+        self._tree: List[float] = [0.0]
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def _prefix(self, count: int) -> float:
+        total = 0.0
+        while count > 0:
+            total += self._tree[count]
+            count &= count - 1
+        return total
+
+    def append(self, weight: float) -> None:
+        n = len(self._weights) + 1
+        self._tree.append(weight + self._prefix(n - 1) - self._prefix(n - (n & -n)))
+        self._weights.append(weight)
+
+    def pop(self) -> float:
+        self._tree.pop()
+        return self._weights.pop()
+
+    def update(self, index: int, weight: float) -> None:
+        delta = weight - self._weights[index]
+        self._weights[index] = weight
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def sample(self, rng: random.Random = random) -> int:
+        """Index drawn with probability proportional to its weight."""
+
+        target = rng.random() * self._prefix(len(self._weights))
+        index, step = 0, 1 << len(self._weights).bit_length()
+        while step:
+            nxt = index + step
+            if nxt < len(self._tree) and self._tree[nxt] <= target:
+                index = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return min(index, len(self._weights) - 1)
+
+
+def read_pool_file(path: Path) -> List[str]:
+    lines = (line.split("#", 1)[0].strip() for line in path.read_text(encoding="utf-8").splitlines())
+    return list(dict.fromkeys(line for line in lines if line))
 
 
 class ProxyManager:
-    """Simple rotating proxy pool with failure backoff."""
+    """Rotating proxy pool with health-weighted selection and failure backoff."""
 
-    def __init__(self, proxy_file: Optional[Path] = None) -> None:
-        self.proxy_file = proxy_file
-        self._proxies: List[str] = []
-        self._blocked: dict[str, float] = {}
-        if proxy_file and proxy_file.exists():
-            self._proxies = [p.strip() for p in proxy_file.read_text().splitlines() if p.strip()]
+    def __init__(
+        self,
+        proxy_file: Optional[Path] = None,
+        config: Optional[ProxyPoolSettings] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.proxy_file = Path(proxy_file) if proxy_file else None
+        self.config = config or ProxyPoolSettings()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats: Dict[str, ProxyStats] = {}
+        self._healthy: List[str] = []
+        self._weights = WeightedSampler()
+        self._position: Dict[str, int] = {}
+        self._cooling: List[Tuple[float, str]] = []
+        self._mtime: Optional[float] = None
+        self._next_reload = 0.0
+        self._maybe_reload(force=True)
+
+    @classmethod
+    def from_settings(cls) -> "ProxyManager":
+        return cls(settings.proxy.pool_file, get_section("proxy_pool", ProxyPoolSettings()))
 
     def __iter__(self) -> Iterator[str]:
         while True:
             yield self.next_proxy()
 
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    @property
+    def healthy_count(self) -> int:
+        return len(self._healthy)
+
+    def stats(self, proxy: str) -> Optional[ProxyStats]:
+        return self._stats.get(proxy)
+
     def next_proxy(self) -> Optional[str]:
-        if not self._proxies:
-            return None
-        available = [p for p in self._proxies if self._blocked.get(p, 0) < time.time()]
-        if not available:
-            return None
-        return random.choice(available)
+        self._maybe_reload()
+        with self._lock:
+            self._release_expired(self._clock())
+            if not self._healthy:
+                return None
+            return self._healthy[self._weights.sample()]
+
+    def mark_success(self, proxy: str, latency: float) -> None:
+        with self._lock:
+            stats = self._stats.get(proxy)
+            if stats is None:
+                return
+            alpha = self.config.ewma_alpha
+            stats.latency += alpha * (latency - stats.latency)
+            stats.success += alpha * (1.0 - stats.success)
+            stats.failures = 0
+            self._rescore(proxy)
 
-    def mark_failure(self, proxy: str, cooldown: int = 300) -> None:
-        self._blocked[proxy] = time.time() + cooldown
+    def mark_failure(self, proxy: str, cooldown: Optional[float] = None) -> None:
+        with self._lock:
+            stats = self._stats.get(proxy)
+            if stats is None:
+                return
+            stats.success -= self.config.ewma_alpha * stats.success
+            stats.failures += 1
+            if cooldown is None:
+                cooldown = min(
+                    self.config.cooldown_seconds * 2 ** (stats.failures - 1), self.config.max_cooldown_seconds
+                )
+            stats.blocked_until = self._clock() + cooldown
+            self._discard_healthy(proxy)
+            heapq.heappush(self._cooling, (stats.blocked_until, proxy))
+
+    def record(self, proxy: str, status: int, latency: float) -> None:
+        """Feed one response outcome back into the pool."""
+
+        if status in PROXY_FAILURE_STATUSES:
+            self.mark_failure(proxy)
+        else:
+            self.mark_success(proxy, latency)
 
     def add_proxy(self, proxy: str) -> None:
-        if proxy not in self._proxies:
-            self._proxies.append(proxy)
+        with self._lock:
+            if proxy not in self._stats:
+                self._stats[proxy] = ProxyStats()
+                self._add_healthy(proxy)
+
+    def remove_proxy(self, proxy: str) -> None:
+        with self._lock:
+            if self._stats.pop(proxy, None) is not None:
+                self._discard_healthy(proxy)
+
+    def reload(self) -> None:
+        """Sync the pool with ``proxy_file``, keeping stats of proxies that stay."""
+
+        if not (self.proxy_file and self.proxy_file.exists()):
+            return
+        listed = read_pool_file(self.proxy_file)
+        wanted = set(listed)
+        for proxy in [proxy for proxy in self._stats if proxy not in wanted]:
+            self.remove_proxy(proxy)
+        for proxy in listed:
+            self.add_proxy(proxy)
+        logger.info("Loaded %s proxies from %s", len(listed), self.proxy_file)
+
+    def _maybe_reload(self, force: bool = False) -> None:
+        if not self.proxy_file:
+            return
+        now = self._clock()
+        if not force and now < self._next_reload:
+            return
+        self._next_reload = now + self.config.reload_seconds
+        try:
+            mtime = self.proxy_file.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self._mtime = mtime
+            self.reload()
+
+    def _release_expired(self, now: float) -> None:
+        while self._cooling and self._cooling[0][0] <= now:
+            until, proxy = heapq.heappop(self._cooling)
+            stats = self._stats.get(proxy)
+            # Stale entries: proxy removed, or re-blocked with a later expiry.
+            if stats is not None and stats.blocked_until == until:
+                self._add_healthy(proxy)
+
+    def _add_healthy(self, proxy: str) -> None:
+        if proxy not in self._position:
+            self._position[proxy] = len(self._healthy)
+            self._healthy.append(proxy)
+            self._weights.append(self._stats[proxy].score)
+
+    def _discard_healthy(self, proxy: str) -> None:
+        index = self._position.pop(proxy, None)
+        if index is None:
+            return
+        last = self._healthy.pop()
+        weight = self._weights.pop()
+        if last != proxy:
+            self._healthy[index] = last
+            self._position[last] = index
+            self._weights.update(index, weight)
+
+    def _rescore(self, proxy: str) -> None:
+        index = self._position.get(proxy)
+        if index is not None:
+            self._weights.update(index, self._stats[proxy].score)
+
+
+_shared_manager: Optional[ProxyManager] = None
+_shared_lock = threading.Lock()
+
+
+def get_proxy_manager() -> ProxyManager:
+    """Return the process-wide pool so crawlers and Scrapy share proxy health."""
+
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = ProxyManager.from_settings()
+        return _shared_manager
@@ -0,0 +1,139 @@
+"""Per-host token-bucket rate limiting shared by all crawlers in a process."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from ..config import settings
+from .config_loader import get_section
+
+
+@dataclass
+class RateLimitSettings:
+    """Requests per second per host; ``rate`` defaults to ``1 / min_delay_seconds``."""
+
+    rate: Optional[float] = None
+    burst: int = 1
+    jitter: bool = True
+    hosts: Dict[str, float] = field(default_factory=dict)
+
+
+class TokenBucket:
+    """Token bucket that hands out future send times instead of blocking.
+
+    Tokens may go negative: each reservation books the next free slot, so
+    concurrent callers queue up behind each other at exactly ``rate``.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, extra_seconds: float = 0.0) -> float:
+        """Take one token and return how many seconds to wait before using it.
+
+        ``extra_seconds`` (jitter) lengthens this slot: the request waits that
+        much longer and every later slot moves back with it, so spacing never
+        drops below ``1 / rate``.
+        """
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1 + extra_seconds * self.rate
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate; tokens earned so far are kept at the old rate."""
+
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.rate = rate
+
+
+class HostRateLimiter:
+    """Keep one token bucket per host and schedule requests against it."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        jitter: float = 0.0,
+        host_rates: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.host_rates = dict(host_rates or {})
+        self.share = 1.0
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "HostRateLimiter":
+        policy = settings.request_policy
+        cfg = get_section("rate_limit", RateLimitSettings())
+        rate = cfg.rate or 1.0 / max(policy.min_delay_seconds, 0.001)
+        jitter = max(0.0, policy.max_delay_seconds - policy.min_delay_seconds) if cfg.jitter else 0.0
+        return cls(rate=rate, burst=cfg.burst, jitter=jitter, host_rates=cfg.hosts)
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                rate = self.host_rates.get(host, self.rate) * self.share
+                self._buckets[host] = TokenBucket(rate, self.burst)
+            return self._buckets[host]
+
+    def set_share(self, share: float) -> None:
+        """Use ``share`` of every configured rate, e.g. ``1 / N`` when N nodes crawl the same hosts."""
+
+        with self._lock:
+            if share == self.share:
+                return
+            self.share = share
+            for host, bucket in self._buckets.items():
+                bucket.set_rate(self.host_rates.get(host, self.rate) * share)
+
+    def reserve(self, url: str) -> float:
+        host = urlsplit(url).hostname or ""
+        # A host with its own configured rate (an API quota) runs at exactly that rate.
+        jitter = random.uniform(0, self.jitter) if self.jitter and host not in self.host_rates else 0.0
+        return self.bucket(host).reserve(jitter)
+
+    async def acquire(self, url: str) -> None:
+        """Wait until the host of ``url`` may receive another request."""
+
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_shared_limiter: Optional[HostRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Return the process-wide limiter so every crawler shares host budgets."""
+
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostRateLimiter.from_settings()
+        return _shared_limiter
@@ -2,22 +2,161 @@
 
 from __future__ import annotations
 
+import io
+import itertools
 import json
+import logging
+import math
+import numbers
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, Union
 
 import geopandas as gpd
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import MetaData, Table, bindparam, create_engine, inspect, text
+from sqlalchemy import column as sql_column, table as sql_table
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 
 from ..config import settings
+from .config_loader import get_section
+from .data_parser import LOSS_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+Records = Union[Iterable[Mapping[str, Any]], Mapping[str, Sequence[Any]]]
+
+# Columns typed up front rather than from the first batch, where a page with
+# no loss figures (all None) would create TEXT and None next to counts FLOAT.
+DECLARED_COLUMN_TYPES: Dict[str, str] = {
+    **{column: "BIGINT" for column in LOSS_COLUMNS},
+    "economic_loss_yuan": "DOUBLE PRECISION",
+}
+
+
+@dataclass
+class TableLoadOptions:
+    method: str = "insert"  # "insert" (DataFrame.to_sql) or "copy" (COPY FROM STDIN)
+    conflict_columns: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BulkLoadSettings:
+    """Per-table write method; tables not listed use ``default_method``."""
+
+    default_method: str = "insert"
+    tables: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def for_table(self, table: str) -> TableLoadOptions:
+        options = self.tables.get(table) or {}
+        return TableLoadOptions(
+            method=options.get("method", self.default_method),
+            conflict_columns=list(options.get("conflict_columns") or []),
+        )
+
+
+def _csv_field(value: Any) -> str:
+    """Render one value for ``COPY ... (FORMAT csv)``: unquoted empty is NULL."""
+
+    if value is None or value is pd.NaT or value is pd.NA:
+        return ""
+    if isinstance(value, float) and math.isnan(value):
+        return ""
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, (dict, list, tuple)):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+class _CsvStream(io.TextIOBase):
+    """File-like CSV view over a row iterator, rendered lazily as COPY reads it."""
+
+    def __init__(self, rows: Iterable[Sequence[Any]]) -> None:
+        self._rows = iter(rows)
+        self._pending = ""
+        self.rows_written = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._pending]
+        length = len(self._pending)
+        while size < 0 or length < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            line = ",".join(_csv_field(value) for value in row) + "\n"
+            chunks.append(line)
+            length += len(line)
+            self.rows_written += 1
+        data = "".join(chunks)
+        if size < 0:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+def _db_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+def _sql_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "BOOLEAN"
+    if isinstance(value, numbers.Integral):
+        return "BIGINT"
+    if isinstance(value, numbers.Real):
+        return "DOUBLE PRECISION"
+    if isinstance(value, datetime):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def _column_type(column: str, sample: Iterable[Mapping[str, Any]]) -> str:
+    if column in DECLARED_COLUMN_TYPES:
+        return DECLARED_COLUMN_TYPES[column]
+    values = (record.get(column) for record in sample)
+    return _sql_type(next((value for value in values if value is not None), None))
+
+
+def _iter_records(records: Records) -> Iterator[Mapping[str, Any]]:
+    """Yield dict rows from an iterable of dicts or a mapping of column arrays."""
+
+    if isinstance(records, Mapping):
+        columns = list(records.keys())
+        for values in zip(*(records[column] for column in columns)):
+            yield dict(zip(columns, values))
+    else:
+        yield from records
+
+
+def _chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
 
 
 class StorageHandler:
     """Handles writing tabular and spatial data to disk and PostgreSQL."""
 
     _ENGINE_CACHE: Dict[str, Engine] = {}
+    _TABLE_COLUMNS: Dict[Tuple[str, str], Set[str]] = {}
+    _UNIQUE_INDEXES: Set[Tuple[str, str, Tuple[str, ...]]] = set()
 
     def __init__(self, dsn: str | None = None) -> None:
         self.dsn = dsn or settings.storage.postgres_dsn
@@ -38,8 +177,269 @@ class StorageHandler:
             )
         return cls._ENGINE_CACHE[dsn]
 
-    def save_dataframe(self, df: pd.DataFrame, table: str, if_exists: str = "append") -> None:
-        df.to_sql(table, self.engine, if_exists=if_exists, index=False)
+    def save_dataframe(
+        self,
+        df: pd.DataFrame,
+        table: str,
+        if_exists: str = "append",
+        method: Optional[str] = None,
+        conflict_columns: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Write ``df`` using the table's configured method (see ``bulk_load``)."""
+
+        options = get_section("bulk_load", BulkLoadSettings()).for_table(table)
+        method = method or options.method
+        if method == "copy" and self.engine.dialect.name == "postgresql":
+            self.copy_dataframe(df, table, if_exists, conflict_columns or options.conflict_columns)
+        else:
+            df.to_sql(table, self.engine, if_exists=if_exists, index=False)
+
+    def save_records(
+        self,
+        records: Records,
+        table: str,
+        method: Optional[str] = None,
+        conflict_columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Stream dict rows or column arrays into ``table`` without a DataFrame.
+
+        Records are read ``chunk_size`` at a time. A missing table is created
+        from the first chunk (``DECLARED_COLUMN_TYPES`` override the inferred
+        types); a later chunk with new keys ends the current write, its
+        columns are added, and writing resumes with the wider column list.
+        Only one chunk is held in memory.
+        """
+
+        chunks = _chunked(_iter_records(records), chunk_size)
+        pending = next(chunks, None)
+        if pending is None:
+            return 0
+        columns = list(dict.fromkeys(key for record in pending for key in record))
+        self._ensure_table(table, pending, columns)
+
+        options = get_section("bulk_load", BulkLoadSettings()).for_table(table)
+        method = method or options.method
+        conflict_columns = conflict_columns or options.conflict_columns
+        copy = method == "copy" and self.engine.dialect.name == "postgresql"
+        if copy and conflict_columns:
+            self.ensure_unique_index(table, conflict_columns)
+
+        total = 0
+        while pending is not None:
+            first, pending = pending, None
+            known = set(columns)
+
+            def rows() -> Iterator[List[Any]]:
+                nonlocal pending
+                chunk: Optional[List[Mapping[str, Any]]] = first
+                while chunk is not None:
+                    if chunk is not first and any(key not in known for record in chunk for key in record):
+                        pending = chunk  # written after its columns are added
+                        return
+                    for record in chunk:
+                        yield [record.get(column) for column in columns]
+                    chunk = next(chunks, None)
+
+            if copy:
+                total += self.copy_rows(table, columns, rows(), conflict_columns)
+            else:
+                total += self._insert_rows(table, columns, rows(), chunk_size)
+            if pending is not None:
+                self.add_missing_columns(table, pending)
+                columns += [key for key in dict.fromkeys(k for record in pending for k in record) if key not in known]
+        return total
+
+    def _ensure_table(self, table: str, sample: List[Mapping[str, Any]], columns: List[str]) -> None:
+        key = (self.dsn, table)
+        existing = self._TABLE_COLUMNS.get(key)
+        if existing is not None and existing.issuperset(columns):
+            return
+        if existing is None and not inspect(self.engine).has_table(table):
+            column_sql = ", ".join(f"{_quote(column)} {_column_type(column, sample)}" for column in columns)
+            with self.engine.begin() as conn:
+                conn.execute(text(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({column_sql})"))
+            self._TABLE_COLUMNS[key] = set(columns)
+        else:
+            self.add_missing_columns(table, sample)
+
+    def add_missing_columns(self, table: str, sample: List[Mapping[str, Any]]) -> List[str]:
+        """``ALTER TABLE ... ADD COLUMN`` for sample keys the table lacks.
+
+        Columns in ``DECLARED_COLUMN_TYPES`` get their declared type; others are
+        typed from their first non-null sample value.
+        """
+
+        existing = {column["name"] for column in inspect(self.engine).get_columns(table)}
+        missing = [column for column in dict.fromkeys(name for record in sample for name in record) if column not in existing]
+        if missing:
+            with self.engine.begin() as conn:
+                for column in missing:
+                    sql_type = _column_type(column, sample)
+                    conn.execute(text(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)} {sql_type}"))
+        self._TABLE_COLUMNS[(self.dsn, table)] = existing.union(missing)
+        if not missing:
+            return []
+        logger.info("Added columns %s to %s", ", ".join(missing), table)
+        return missing
+
+    def _insert_rows(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]], chunk_size: int) -> int:
+        # A lightweight table clause: no reflection round trip per call.
+        target = sql_table(table, *(sql_column(column) for column in columns))
+        total = 0
+        with self.engine.begin() as conn:
+            for chunk in _chunked(rows, chunk_size):
+                conn.execute(target.insert(), [dict(zip(columns, map(_db_value, row))) for row in chunk])
+                total += len(chunk)
+        return total
+
+    def copy_dataframe(
+        self,
+        df: pd.DataFrame,
+        table: str,
+        if_exists: str = "append",
+        conflict_columns: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Bulk load ``df`` with ``COPY FROM STDIN``; the table is created from ``df`` if missing."""
+
+        df.head(0).to_sql(table, self.engine, if_exists=if_exists, index=False)
+        if conflict_columns:
+            self.ensure_unique_index(table, conflict_columns)
+        rows = df.itertuples(index=False, name=None)
+        return self.copy_rows(table, list(df.columns), rows, conflict_columns)
+
+    def copy_rows(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        conflict_columns: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Stream ``rows`` into an existing table through ``COPY FROM STDIN``.
+
+        With ``conflict_columns`` the rows land in a temporary staging table
+        first and are upserted with ``INSERT ... ON CONFLICT DO UPDATE``; the
+        target needs a unique index on those columns.
+        """
+
+        column_sql = ", ".join(_quote(column) for column in columns)
+        stream = _CsvStream(rows)
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            target = table
+            if conflict_columns:
+                target = f"_staging_{table}"
+                cursor.execute(
+                    f"CREATE TEMP TABLE {_quote(target)} (LIKE {_quote(table)} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+            cursor.copy_expert(f"COPY {_quote(target)} ({column_sql}) FROM STDIN WITH (FORMAT csv)", stream)
+            if conflict_columns:
+                cursor.execute(self._upsert_sql(table, target, columns, conflict_columns))
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+        logger.debug("Copied %s rows into %s", stream.rows_written, table)
+        return stream.rows_written
+
+    def update_rows(
+        self,
+        table: str,
+        key_columns: Sequence[str],
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        chunk_size: int = 1000,
+    ) -> int:
+        """Overwrite ``columns`` of existing rows matched on ``key_columns``.
+
+        Each row lists the key values first, then the new column values. On
+        PostgreSQL the rows are COPY'd into a staging table and applied with a
+        single ``UPDATE ... FROM``; elsewhere they are batched ``UPDATE``s.
+        """
+
+        all_columns = list(key_columns) + [column for column in columns if column not in key_columns]
+        if self.engine.dialect.name == "postgresql":
+            return self._copy_update(table, key_columns, all_columns, rows)
+        target = Table(table, MetaData(), autoload_with=self.engine)
+        statement = (
+            target.update()
+            .where(*(target.c[key] == bindparam(f"_key_{key}") for key in key_columns))
+            .values({column: bindparam(f"_val_{column}") for column in all_columns[len(key_columns) :]})
+        )
+        names = [f"_key_{key}" for key in key_columns] + [f"_val_{column}" for column in all_columns[len(key_columns) :]]
+        total = 0
+        with self.engine.begin() as conn:
+            for chunk in _chunked(rows, chunk_size):
+                conn.execute(statement, [dict(zip(names, map(_db_value, row))) for row in chunk])
+                total += len(chunk)
+        return total
+
+    def _copy_update(self, table: str, key_columns: Sequence[str], columns: Sequence[str], rows) -> int:
+        staging = f"_update_{table}"
+        column_sql = ", ".join(_quote(column) for column in columns)
+        assignments = ", ".join(
+            f"{_quote(column)} = s.{_quote(column)}" for column in columns if column not in key_columns
+        )
+        join = " AND ".join(f"t.{_quote(key)} = s.{_quote(key)}" for key in key_columns)
+        stream = _CsvStream(rows)
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute(
+                f"CREATE TEMP TABLE {_quote(staging)} AS SELECT {column_sql} FROM {_quote(table)} WITH NO DATA"
+            )
+            cursor.copy_expert(f"COPY {_quote(staging)} ({column_sql}) FROM STDIN WITH (FORMAT csv)", stream)
+            cursor.execute(f"UPDATE {_quote(table)} AS t SET {assignments} FROM {_quote(staging)} AS s WHERE {join}")
+            cursor.execute(f"DROP TABLE {_quote(staging)}")
+            raw.commit()
+        except Exception:
+            raw.rollback()
+            raise
+        finally:
+            raw.close()
+        return stream.rows_written
+
+    def ensure_unique_index(self, table: str, columns: Sequence[str]) -> None:
+        """Create the unique index an upsert on ``columns`` needs, once per table.
+
+        Raises ``ValueError`` when rows already in ``table`` share a key, since
+        the index cannot be built until those duplicates are removed.
+        """
+
+        key = (self.dsn, table, tuple(columns))
+        if key in self._UNIQUE_INDEXES:
+            return
+        name = _quote(f"{table}_{'_'.join(columns)}_key")
+        column_sql = ", ".join(_quote(column) for column in columns)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {_quote(table)} ({column_sql})"))
+        except IntegrityError as exc:
+            raise ValueError(
+                f"Cannot upsert into {table} on ({', '.join(columns)}): existing rows share a key; "
+                "remove the duplicates or drop conflict_columns for this table"
+            ) from exc
+        self._UNIQUE_INDEXES.add(key)
+
+    @staticmethod
+    def _upsert_sql(table: str, staging: str, columns: Sequence[str], conflict_columns: Sequence[str]) -> str:
+        column_sql = ", ".join(_quote(column) for column in columns)
+        keys = ", ".join(_quote(column) for column in conflict_columns)
+        updates = [column for column in columns if column not in conflict_columns]
+        action = (
+            "DO UPDATE SET " + ", ".join(f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in updates)
+            if updates
+            else "DO NOTHING"
+        )
+        # DISTINCT ON keeps one row per key: ON CONFLICT cannot touch the same row twice.
+        return (
+            f"INSERT INTO {_quote(table)} ({column_sql}) "
+            f"SELECT DISTINCT ON ({keys}) {column_sql} FROM {_quote(staging)} "
+            f"ON CONFLICT ({keys}) {action}"
+        )
 
     def save_geojson(self, gdf: gpd.GeoDataFrame, name: str) -> Path:
         target = settings.storage.geojson_dir / f"{name}.geojson"
@@ -51,10 +451,28 @@ class StorageHandler:
         target.write_text(html, encoding="utf-8")
         return target
 
-    def export_records(self, records: Iterable[dict], path: Path) -> Path:
-        data: List[dict] = list(records)
+    def export_records(self, records: Records, path: Path) -> Path:
+        """Write a JSON array one record at a time (same layout as ``indent=2``)."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fh:
+            fh.write("[")
+            separator = "\n"
+            for record in _iter_records(records):
+                body = json.dumps(record, ensure_ascii=False, indent=2, default=str)
+                fh.write(separator + "  " + body.replace("\n", "\n  "))
+                separator = ",\n"
+            fh.write("\n]" if separator != "\n" else "]")
+        return path
+
+    def export_jsonl(self, records: Records, path: Path, append: bool = False) -> Path:
+        """Write one JSON object per line; memory use does not grow with the record count."""
+
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        with path.open("a" if append else "w", encoding="utf-8") as fh:
+            for record in _iter_records(records):
+                fh.write(json.dumps(record, ensure_ascii=False, default=str))
+                fh.write("\n")
         return path
 
     def test_connection(self) -> bool:
@@ -0,0 +1,277 @@
+"""Shared HTTP transport for the core crawlers.
+
+Every crawler running on an event loop borrows the same session from
+:func:`acquire_session`, so they share one connection pool: keep-alive
+connections and cached DNS answers are reused across crawlers instead of
+each opening its own. The session is closed when the last borrower releases
+it. The default aiohttp backend caps connections overall and per host,
+keeps idle connections open for ``keepalive_seconds`` and caches DNS for
+``dns_ttl_seconds``; it decodes gzip/deflate, and advertises and decodes
+brotli when the ``brotli`` package is installed. ``backend: httpx`` switches
+to an HTTP/2 client (``pip install "httpx[http2]"``), which multiplexes
+requests to a host over one connection.
+
+Request, connection and DNS counters are kept in :func:`transport_stats`
+so connection reuse can be checked on a real crawl.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Union
+
+import aiohttp
+
+from ..config import settings
+from .config_loader import get_section
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional HTTP/2 backend
+    httpx = None
+
+
+@dataclass
+class TransportSettings:
+    backend: str = "aiohttp"  # "aiohttp" or "httpx"
+    limit: int = 64  # open connections per session
+    limit_per_host: int = 8  # aiohttp only
+    keepalive_seconds: float = 30.0
+    dns_ttl_seconds: int = 300  # aiohttp only
+    http2: bool = True  # httpx only
+
+
+class TransportStats:
+    """Process-wide request/connection counters for every shared session."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.connections_opened = 0
+            self.connections_reused = 0
+            self.dns_lookups = 0
+            self.dns_cache_hits = 0
+            self.http_versions: Counter = Counter()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def record_version(self, version: str) -> None:
+        with self._lock:
+            self.http_versions[version] += 1
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of connection checkouts served by an already-open connection."""
+
+        checkouts = self.connections_opened + self.connections_reused
+        return self.connections_reused / checkouts if checkouts else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused,
+                "reuse_ratio": round(self.reuse_ratio, 3),
+                "dns_lookups": self.dns_lookups,
+                "dns_cache_hits": self.dns_cache_hits,
+                "http_versions": dict(self.http_versions),
+            }
+
+
+_stats = TransportStats()
+
+
+def transport_stats() -> TransportStats:
+    return _stats
+
+
+# Errors meaning the connection (or proxy) failed rather than the server answering.
+TRANSPORT_ERRORS: tuple = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+if httpx is not None:
+    TRANSPORT_ERRORS += (httpx.TransportError,)
+
+
+def _trace_config(stats: TransportStats) -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params):
+        stats.incr("requests")
+
+    async def on_connection_create_end(session, context, params):
+        stats.incr("connections_opened")
+
+    async def on_connection_reuseconn(session, context, params):
+        stats.incr("connections_reused")
+
+    async def on_dns_resolvehost_end(session, context, params):
+        stats.incr("dns_lookups")
+
+    async def on_dns_cache_hit(session, context, params):
+        stats.incr("dns_cache_hits")
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace.on_dns_cache_hit.append(on_dns_cache_hit)
+    return trace
+
+
+def create_aiohttp_session(config: TransportSettings, stats: TransportStats = _stats) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        keepalive_timeout=config.keepalive_seconds,
+        use_dns_cache=True,
+        ttl_dns_cache=config.dns_ttl_seconds,
+    )
+    timeout = aiohttp.ClientTimeout(total=settings.request_policy.timeout_seconds)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[_trace_config(stats)])
+
+
+class HttpxResponse:
+    """The slice of ``aiohttp.ClientResponse`` that crawlers use."""
+
+    def __init__(self, response) -> None:
+        self._response = response
+        self.status: int = response.status_code
+        self.headers: Mapping[str, str] = response.headers
+
+    def raise_for_status(self) -> None:
+        # Like aiohttp, only 4xx/5xx raise: a 304 answers a conditional request.
+        if self.status >= 400:
+            self._response.raise_for_status()
+
+    async def text(self) -> str:
+        await self._response.aread()
+        return self._response.text
+
+
+class HttpxSession:
+    """aiohttp-style ``request()`` over ``httpx.AsyncClient`` with HTTP/2.
+
+    httpx configures proxies per client, so one client (and pool) is kept
+    per proxy URL.
+    """
+
+    def __init__(self, config: TransportSettings, stats: TransportStats = _stats, transport: Any = None) -> None:
+        if httpx is None:
+            raise ImportError('transport.backend "httpx" needs: pip install "httpx[http2]"')
+        self.config = config
+        self.stats = stats
+        self.transport = transport  # custom httpx transport, e.g. httpx.MockTransport
+        self._clients: Dict[Optional[str], Any] = {}
+        self._streams: "weakref.WeakSet" = weakref.WeakSet()
+        self.closed = False
+
+    def _client(self, proxy: Optional[str]):
+        if proxy not in self._clients:
+            limits = httpx.Limits(
+                max_connections=self.config.limit,
+                max_keepalive_connections=self.config.limit,
+                keepalive_expiry=self.config.keepalive_seconds,
+            )
+            self._clients[proxy] = httpx.AsyncClient(
+                http2=self.config.http2,
+                limits=limits,
+                follow_redirects=True,  # aiohttp's default
+                transport=self.transport,
+                timeout=httpx.Timeout(settings.request_policy.timeout_seconds),
+                proxy=proxy,
+                event_hooks={"response": [self._on_response]},
+            )
+        return self._clients[proxy]
+
+    async def _on_response(self, response) -> None:
+        self.stats.incr("requests")
+        self.stats.record_version(response.http_version)
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        try:
+            reused = stream in self._streams
+            self._streams.add(stream)
+        except TypeError:  # stream type without weakref support
+            return
+        self.stats.incr("connections_reused" if reused else "connections_opened")
+
+    @asynccontextmanager
+    async def request(
+        self, method: str, url: str, proxy: Optional[str] = None, **kwargs
+    ) -> AsyncIterator[HttpxResponse]:
+        client = self._client(proxy)
+        response = await client.send(client.build_request(method, url, **kwargs), stream=True)
+        try:
+            yield HttpxResponse(response)
+        finally:
+            await response.aclose()
+
+    async def close(self) -> None:
+        self.closed = True
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+
+Session = Union[aiohttp.ClientSession, HttpxSession]
+
+
+def create_session(config: Optional[TransportSettings] = None) -> Session:
+    config = config or get_section("transport", TransportSettings())
+    if config.backend == "httpx":
+        return HttpxSession(config)
+    return create_aiohttp_session(config)
+
+
+class _Borrowed:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.borrowers = 0
+
+
+_shared: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Borrowed]" = weakref.WeakKeyDictionary()
+_shared_lock = threading.Lock()
+
+
+async def acquire_session() -> Session:
+    """Borrow the running loop's shared session, creating it on first use.
+
+    Sessions are bound to their event loop, so each loop (thread or
+    ``asyncio.run``) gets its own; within a loop every borrower shares one.
+    """
+
+    loop = asyncio.get_running_loop()
+    with _shared_lock:
+        entry = _shared.get(loop)
+        if entry is None or entry.session.closed:
+            entry = _shared[loop] = _Borrowed(create_session())
+        entry.borrowers += 1
+        return entry.session
+
+
+async def release_session(session: Session) -> None:
+    """Return a borrowed session; the last borrower closes it."""
+
+    loop = asyncio.get_running_loop()
+    with _shared_lock:
+        entry = _shared.get(loop)
+        if entry is None or entry.session is not session:
+            return
+        entry.borrowers -= 1
+        last = entry.borrowers <= 0
+        if last:
+            del _shared[loop]
+    if last:
+        await session.close()
@@ -0,0 +1,71 @@
+"""Incremental-crawl watermarks: the newest item already stored for a source.
+
+News listings run newest-first, so once a whole listing page is older than
+the crawl's date floor (the watermark, or ``start_date`` if later) every
+following page is too and the crawl can stop.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import FrozenSet, Iterable, NamedTuple, Optional
+
+from sqlalchemy import MetaData, Table, func, inspect, select
+from sqlalchemy.engine import Engine
+
+
+class Watermark(NamedTuple):
+    publish_date: datetime
+    urls: FrozenSet[str]  # stored URLs published on that date
+
+
+def _as_datetime(value) -> datetime:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+
+
+def load_watermark(
+    engine: Engine,
+    table: str,
+    date_column: str = "publish_date",
+    url_column: str = "url",
+    url_prefix: Optional[str] = None,
+) -> Optional[Watermark]:
+    """Newest stored ``date_column`` in ``table`` (rows whose URL starts with
+    ``url_prefix`` only) plus the URLs stored on that date; ``None`` when empty."""
+
+    if not inspect(engine).has_table(table):
+        return None
+    target = Table(table, MetaData(), autoload_with=engine)
+    conditions = [target.c[date_column].is_not(None)]
+    if url_prefix:
+        conditions.append(target.c[url_column].startswith(url_prefix, autoescape=True))
+    with engine.connect() as conn:
+        newest = conn.execute(select(func.max(target.c[date_column])).where(*conditions)).scalar()
+        if newest is None:
+            return None
+        urls = conn.execute(select(target.c[url_column]).where(*conditions, target.c[date_column] == newest)).scalars()
+        return Watermark(_as_datetime(newest), frozenset(urls))
+
+
+def date_floor(start_date: Optional[datetime], watermark: Optional[Watermark]) -> Optional[datetime]:
+    """Oldest publish date still worth fetching."""
+
+    candidates = [value for value in (start_date, watermark and watermark.publish_date) if value]
+    return max(candidates) if candidates else None
+
+
+def is_known(url: str, publish_date: datetime, watermark: Optional[Watermark]) -> bool:
+    """True for the URLs already stored on the watermark date itself."""
+
+    return watermark is not None and publish_date <= watermark.publish_date and url in watermark.urls
+
+
+def page_below(dates: Iterable[Optional[datetime]], floor: Optional[datetime]) -> bool:
+    """True when every dated entry on a newest-first listing page is older than ``floor``."""
+
+    known = [value for value in dates if value]
+    return floor is not None and bool(known) and max(known) < floor
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+from sqlalchemy import Float, Integer, inspect
+
+from crawler_project import reextract
+from crawler_project.utils.batch_extraction import (
+    detect_disaster_type_batch,
+    extract_loss_info_batch,
+    loss_columns_batch,
+    parse_date_batch,
+)
+from crawler_project.utils.data_parser import (
+    LOSS_COLUMNS,
+    detect_disaster_type,
+    extract_loss_info,
+    loss_columns,
+    parse_date,
+)
+from crawler_project.utils.storage_handler import StorageHandler
+
+TEXTS = [
+    "2019年5月1日凌晨，北京某区发生火灾，造成20人受伤。",
+    "暴雨引发道路塌陷，随后起火，损失3.5亿元",
+    "2020/02/30 发生地震 损失 12 万元",
+    "２０１９年５月１日 交通事故",
+    "",
+    None,
+    "无关内容 2021-7-8",
+]
+
+
+@pytest.mark.parametrize(
+    "batch,scalar",
+    [
+        (detect_disaster_type_batch, detect_disaster_type),
+        (extract_loss_info_batch, extract_loss_info),
+        (parse_date_batch, parse_date),
+    ],
+)
+def test_batch_matches_scalar(batch, scalar):
+    series = pd.Series(TEXTS, index=range(10, 10 + len(TEXTS)))
+
+    result = batch(series)
+
+    assert list(result.index) == list(series.index)
+    assert list(result) == [scalar(text) for text in TEXTS]
+
+
+def test_batch_accepts_arrow_arrays():
+    pa = pytest.importorskip("pyarrow")
+
+    result = detect_disaster_type_batch(pa.chunked_array([TEXTS[:3], TEXTS[3:]]))
+
+    assert list(result) == [detect_disaster_type(text) for text in TEXTS]
+
+
+def test_reextract_updates_only_changed_rows(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'news.db'}")
+    storage.save_records(
+        [
+            {"url": f"http://test/{i}", "content": text, "disaster_type": None, "loss": None}
+            for i, text in enumerate(TEXTS)
+        ],
+        "news_events",
+        method="insert",
+    )
+
+    first = reextract.reextract(storage, chunk_size=3)
+    second = reextract.reextract(storage, chunk_size=3)
+
+    assert first == {"scanned": len(TEXTS), "changed": 4}
+    assert second == {"scanned": len(TEXTS), "changed": 0}
+    stored = pd.read_sql_table("news_events", storage.engine).set_index("url")
+    assert stored.loc["http://test/0", "disaster_type"] == "火灾"
+    assert json.loads(stored.loc["http://test/1", "loss"]) == extract_loss_info(TEXTS[1])
+
+
+def test_reextract_reparses_dates_from_the_stored_publish_date_column(tmp_path):
+    dsn = f"sqlite:///{tmp_path / 'news.db'}"
+    storage = StorageHandler(dsn)
+    storage.save_records(
+        [
+            {"url": "http://test/a", "title": "火灾", "publish_date": "2019-05-01T00:00:00"},
+            {"url": "http://test/b", "title": "暴雨", "publish_date": "2019年5月2日"},
+        ],
+        "news_events",
+        method="insert",
+    )
+
+    stats = reextract.main(["--fields", "publish_date", "--date-column", "publish_date", "--postgres-dsn", dsn])
+
+    assert stats == {"scanned": 2, "changed": 1}
+    stored = pd.read_sql_table("news_events", storage.engine).set_index("url")
+    assert stored.loc["http://test/b", "publish_date"] == "2019-05-02T00:00:00"
+
+
+def test_loss_columns_batch_matches_scalar():
+    texts = TEXTS + [
+        "死亡3人，受伤20人，直接经济损失3000万元，其中房屋损失0.07万元",
+        "伤亡20人，2人失踪",
+        "死亡3人受伤20人",
+        "3人死亡2人受伤，受灾群众1.2万人",
+    ]
+
+    frame = loss_columns_batch(pd.Series(texts))
+
+    assert list(frame.columns) == list(LOSS_COLUMNS)
+    for position, text in enumerate(texts):
+        row = {name: (None if pd.isna(value) else value) for name, value in frame.iloc[position].items()}
+        assert row == loss_columns(text)
+
+
+def test_reextract_adds_typed_loss_columns(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'news.db'}")
+    storage.save_records([{"url": "http://test/a", "content": "3人死亡，经济损失1.2亿元"}], "news_events")
+
+    stats = reextract.reextract(storage, fields=["loss_columns"])
+
+    assert stats == {"scanned": 1, "changed": 1}
+    stored = pd.read_sql_table("news_events", storage.engine).iloc[0]
+    assert stored["deaths"] == 3
+    assert stored["economic_loss_yuan"] == 120_000_000.0
+
+
+def test_loss_columns_are_typed_even_when_the_first_batch_has_no_figures(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'news.db'}")
+    storage.save_records([{"url": "http://test/a", **loss_columns("没有数字")}], "news_events")
+    storage.save_records([{"url": "http://test/b", **loss_columns("受伤3人")}], "news_events")
+
+    types = {column["name"]: column["type"] for column in inspect(storage.engine).get_columns("news_events")}
+
+    assert isinstance(types["deaths"], Integer) and isinstance(types["injuries"], Integer)
+    assert isinstance(types["economic_loss_yuan"], Float)
+    stored = pd.read_sql_table("news_events", storage.engine).set_index("url")
+    assert stored.loc["http://test/b", "injuries"] == 3
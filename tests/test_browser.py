@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from crawler_project.utils import browser
+from crawler_project.utils.browser import (
+    DEFAULT_READY,
+    BrowserPool,
+    ReadyCondition,
+    create_driver,
+    fetch_dynamic_html,
+    wait_until_ready,
+)
+
+
+class FakeDriver:
+    def __init__(self, crashes: bool = False):
+        self.crashes = crashes
+        self.current_url = None
+        self.visited = []
+        self.quits = 0
+
+    def get(self, url):
+        if self.crashes:
+            raise WebDriverException("chrome not reachable")
+        self.current_url = url
+        self.visited.append(url)
+
+    @property
+    def page_source(self):
+        return f"<html>{self.current_url}</html>"
+
+    def execute_script(self, script):
+        return 60_000  # quiet for a minute: every readiness check passes at once
+
+    def quit(self):
+        self.quits += 1
+
+
+class DriverFactory(list):
+    """Stands in for ``create_driver``; remembers every driver it made."""
+
+    crash_first = False
+
+    def __call__(self, driver_path=None, block_resources=False):
+        driver = FakeDriver(crashes=self.crash_first and not self)
+        self.append(driver)
+        return driver
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    factory = DriverFactory()
+    monkeypatch.setattr(browser, "create_driver", factory)
+    return factory
+
+
+def test_pool_recycles_drivers_after_max_pages(drivers):
+    with BrowserPool(size=1, max_pages_per_driver=2) as pool:
+        pages = [pool.fetch(f"http://test/{page}") for page in range(5)]
+
+    assert pages == [f"<html>http://test/{page}</html>" for page in range(5)]
+    assert [driver.visited for driver in drivers] == [
+        ["http://test/0", "http://test/1"],
+        ["http://test/2", "http://test/3"],
+        ["http://test/4"],
+    ]
+    assert [driver.quits for driver in drivers] == [1, 1, 1]
+
+
+def test_crashed_driver_is_replaced_and_the_fetch_retried(drivers):
+    drivers.crash_first = True
+    pool = BrowserPool(size=1)
+
+    assert pool.fetch("http://test/page", retries=1) == "<html>http://test/page</html>"
+
+    assert len(drivers) == 2 and drivers[0].quits == 1
+    assert pool._created == 1
+    pool.close()
+    assert drivers[1].quits == 1 and pool._created == 0
+
+
+def test_crash_without_retries_frees_the_slot(drivers):
+    drivers.crash_first = True
+    pool = BrowserPool(size=1)
+
+    with pytest.raises(WebDriverException):
+        pool.fetch("http://test/page", retries=0)
+    assert pool._created == 0
+
+    assert pool.fetch("http://test/page", retries=0) == "<html>http://test/page</html>"
+    pool.close()
+
+
+def test_close_quits_idle_and_returned_drivers(drivers):
+    pool = BrowserPool(size=2)
+    with pool.driver():
+        with pool.driver():
+            pass
+    with pool.driver() as held:
+        pool.close()
+        assert [driver.quits for driver in drivers if driver is not held] == [1]
+    assert held.quits == 1  # quit on return instead of going back to the pool
+
+    with pytest.raises(RuntimeError, match="closed"):
+        with pool.driver():
+            pass
+
+
+def test_fetch_dynamic_html_keeps_wait_as_a_deprecated_timeout(drivers, monkeypatch):
+    conditions = []
+    monkeypatch.setattr(browser, "wait_until_ready", lambda driver, ready: conditions.append(ready) or True)
+
+    with pytest.warns(DeprecationWarning):
+        assert fetch_dynamic_html("http://test/a", 3) == "<html>http://test/a</html>"
+    with pytest.warns(DeprecationWarning):
+        fetch_dynamic_html("http://test/b", wait=1.5)
+    fetch_dynamic_html("http://test/c")
+
+    assert [condition.timeout for condition in conditions] == [3.0, 1.5, DEFAULT_READY.timeout]
+    assert all(condition.network_idle for condition in conditions)
+    assert [driver.quits for driver in drivers] == [1, 1, 1]
+
+
+class FakeClock:
+    """Monotonic clock that only moves when ``sleep`` is called."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = 0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps += 1
+        self.now += seconds
+
+
+class LoadingDriver(FakeDriver):
+    """Busy for ``busy_for`` seconds; the selector appears after ``element_after``."""
+
+    def __init__(self, clock: FakeClock, busy_for: float, element_after: float = 0.0):
+        super().__init__()
+        self.clock = clock
+        self.busy_for = busy_for
+        self.element_after = element_after
+        self.scripts = []
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        return max(0.0, self.clock() - self.busy_for) * 1000
+
+    def find_elements(self, by, value):
+        return [object()] if self.clock() >= self.element_after else []
+
+
+def _wait(driver, condition):
+    return wait_until_ready(driver, condition, clock=driver.clock, sleep=driver.clock.sleep)
+
+
+@pytest.mark.parametrize("check", ["network_idle", "dom_stable"])
+def test_wait_until_ready_returns_at_the_first_poll_after_the_page_goes_quiet(check):
+    clock = FakeClock()
+    condition = ReadyCondition(**{check: True}, quiet_seconds=0.5, poll_seconds=0.25, timeout=5)
+
+    assert _wait(LoadingDriver(clock, busy_for=1.0), condition)
+
+    assert clock.sleeps == 6 and clock.now == 1.5  # busy + quiet period, then done
+
+
+def test_wait_until_ready_waits_for_the_selector_first():
+    clock = FakeClock()
+    driver = LoadingDriver(clock, busy_for=0.0, element_after=1.0)
+    condition = ReadyCondition(selector="li.clear", network_idle=True, quiet_seconds=0.5, poll_seconds=0.25)
+
+    assert _wait(driver, condition)
+
+    assert clock.sleeps == 4 and clock.now == 1.0  # already quiet once the selector shows up
+    assert len(driver.scripts) == 1 and "setResourceTimingBufferSize" in driver.scripts[0]
+
+
+def test_wait_until_ready_gives_up_at_the_timeout():
+    clock = FakeClock()
+    condition = ReadyCondition(network_idle=True, timeout=1.0, poll_seconds=0.25)
+
+    assert not _wait(LoadingDriver(clock, busy_for=60), condition)
+
+    assert clock.sleeps == 4 and clock.now == 1.0
+
+
+def test_create_driver_raises_the_resource_timing_buffer(monkeypatch):
+    class FakeChrome(FakeDriver):
+        def __init__(self, options=None):
+            super().__init__()
+            self.cdp = []
+
+        def execute_cdp_cmd(self, command, params):
+            self.cdp.append((command, params))
+
+    monkeypatch.setattr(browser.webdriver, "Chrome", FakeChrome)
+
+    driver = create_driver()
+
+    assert driver.cdp == [("Page.addScriptToEvaluateOnNewDocument", {"source": browser._RESOURCE_BUFFER_JS})]
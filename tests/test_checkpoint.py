@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+
+from crawler_project.core.base_crawler import BaseCrawler
+from crawler_project.utils.checkpoint import CheckpointStore
+from crawler_project.utils.dedup import SqliteFingerprintStore, UrlDedupIndex
+
+
+def test_checkpoint_store_resumes_finished_work(tmp_path):
+    path = tmp_path / "checkpoints.sqlite3"
+    store = CheckpointStore(path, "news", "20150101-20151231", flush_every=2, flush_interval=3600)
+    store.mark_done("page", "http://test/node_1.htm")
+    store.mark_done("detail", "http://test/a.htm")
+    store.mark_done("detail", "http://test/b.htm")
+    store.close()
+
+    resumed = CheckpointStore(path, "news", "20150101-20151231")
+    other_run = CheckpointStore(path, "news", "20160101-20161231")
+
+    assert resumed.is_done("page", "http://test/node_1.htm")
+    assert resumed.is_done("detail", "http://test/b.htm")
+    assert not resumed.is_done("page", "http://test/node_2.htm")
+    assert len(other_run) == 0
+
+
+def test_checkpoint_store_batches_writes(tmp_path):
+    path = tmp_path / "checkpoints.sqlite3"
+    store = CheckpointStore(path, "legal", "run", flush_every=10, flush_interval=3600)
+    store.mark_done("page", "p1")
+
+    assert len(CheckpointStore(path, "legal", "run")) == 0
+    store.flush()
+    assert len(CheckpointStore(path, "legal", "run")) == 1
+
+
+class TwoPageCrawler(BaseCrawler):
+    name = "acked"
+
+    async def crawl(self):
+        for page in ("p1", "p2"):
+            for index in range(2):
+                self._record_yielded(f"{page}/d{index}")
+                yield {"url": f"{page}/d{index}"}
+            self._page_finished(page)
+
+
+def test_crawler_checkpoints_only_acknowledged_records(tmp_path):
+    crawler = TwoPageCrawler()
+    crawler.dedup = index = UrlDedupIndex(SqliteFingerprintStore(tmp_path / "urls.sqlite3"))
+    crawler.checkpoints = store = CheckpointStore(tmp_path / "checkpoints.sqlite3", "acked", "run")
+
+    async def run():
+        records = []
+        async for record in crawler.crawl():
+            records.append(record)
+            if len(records) == 3:
+                await crawler.acknowledge(2)  # first page stored, p2/d0 still in flight
+        return records
+
+    assert len(asyncio.run(run())) == 4
+    assert store.is_done("detail", "p1/d1") and store.is_done("page", "p1")
+    assert not store.is_done("detail", "p2/d0") and not store.is_done("page", "p2")
+    assert index.seen("p1/d1") and not index.seen("p2/d0")
+
+    asyncio.run(crawler.acknowledge(2))
+    assert store.is_done("detail", "p2/d1") and store.is_done("page", "p2")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import numpy as np
+
+from crawler_project.utils.coords import bd09_to_wgs84, gcj02_to_wgs84, to_wgs84, wgs84_to_bd09, wgs84_to_gcj02
+
+
+def test_inverse_round_trips_below_a_millimetre():
+    rng = np.random.default_rng(0)
+    lng = rng.uniform(73.0, 135.0, 10_000)
+    lat = rng.uniform(18.0, 53.0, 10_000)
+
+    back_lng, back_lat = bd09_to_wgs84(*wgs84_to_bd09(lng, lat))
+    gcj_lng, gcj_lat = gcj02_to_wgs84(*wgs84_to_gcj02(lng, lat))
+
+    assert np.abs(back_lng - lng).max() < 1e-8
+    assert np.abs(back_lat - lat).max() < 1e-8
+    assert np.abs(gcj_lng - lng).max() < 1e-8
+    assert np.abs(gcj_lat - lat).max() < 1e-8
+
+
+def test_known_offsets_and_outside_china():
+    # Tiananmen: the GCJ-02 offset in Beijing is roughly +0.006° lng, +0.0014° lat.
+    gcj_lng, gcj_lat = wgs84_to_gcj02(116.3975, 39.9087)
+    assert 0.005 < gcj_lng - 116.3975 < 0.007
+    assert 0.001 < gcj_lat - 39.9087 < 0.002
+
+    lng, lat = to_wgs84([2.35], [48.85], "gcj02")
+    assert lng.tolist() == [2.35] and lat.tolist() == [48.85]
+    assert to_wgs84([], [], "bd09")[0].shape == (0,)
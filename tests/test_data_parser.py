@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from crawler_project.utils.data_parser import extract_loss_details, loss_columns
+
+
+def test_extract_loss_details_collects_every_figure():
+    info = extract_loss_details("3人死亡，另有2人死亡、受伤15人，1人失踪，直接经济损失1.2亿元，其中房屋损失3000万元")
+
+    assert (info.deaths, info.injuries, info.missing) == (5, 15, 1)
+    assert info.economic_loss_yuan == 120_000_000.0
+    assert [figure.kind for figure in info.figures] == [
+        "deaths",
+        "deaths",
+        "injuries",
+        "missing",
+        "economic_loss_yuan",
+        "economic_loss_yuan",
+    ]
+
+
+def test_kind_word_after_the_figure_wins_and_punctuation_breaks_context():
+    assert loss_columns("无人死亡，20人受伤")["injuries"] == 20
+    assert loss_columns("无人死亡，20人受伤")["deaths"] is None
+    assert loss_columns("转移群众1500人")["people"] == 1500
+    assert extract_loss_details("没有数字") is None
+    assert set(loss_columns("")) == {
+        "deaths",
+        "injuries",
+        "missing",
+        "trapped",
+        "affected",
+        "people",
+        "economic_loss_yuan",
+    }
+
+
+def test_each_kind_word_stays_with_its_own_figure():
+    assert {k: v for k, v in loss_columns("死亡3人受伤20人").items() if v is not None} == {"deaths": 3, "injuries": 20}
+    assert {k: v for k, v in loss_columns("3人死亡2人受伤").items() if v is not None} == {"deaths": 3, "injuries": 2}
+    assert loss_columns("受灾群众1.2万人")["affected"] == 12_000
+    assert loss_columns("转移2万名群众")["people"] == 20_000
+
+
+def test_kind_word_after_the_figure_beats_one_before_it():
+    assert {k: v for k, v in loss_columns("死亡事故造成3人受伤").items() if v is not None} == {"injuries": 3}
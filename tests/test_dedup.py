@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from crawler_project.utils.dedup import (
+    BloomFilter,
+    SqliteFingerprintStore,
+    UrlDedupIndex,
+    canonicalize_url,
+    url_fingerprint,
+)
+
+
+def test_canonicalize_url_ignores_fragment_case_and_param_order():
+    assert canonicalize_url("HTTP://WWW.North-News.cn/a.htm?b=2&a=1#top") == "http://www.north-news.cn/a.htm?a=1&b=2"
+    assert url_fingerprint("http://x/a?b=2&a=1") == url_fingerprint("http://x/a?a=1&b=2")
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    fps = [url_fingerprint(f"http://test/{i}") for i in range(1000)]
+    for fp in fps:
+        bloom.add(fp)
+
+    assert all(fp in bloom for fp in fps)
+    false_positives = sum(url_fingerprint(f"http://other/{i}") in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_url_index_persists_across_runs(tmp_path):
+    path = tmp_path / "urls.sqlite3"
+    index = UrlDedupIndex(SqliteFingerprintStore(path), capacity=100)
+    assert not index.seen("http://test/a")
+    assert index.add("http://test/a")
+    assert not index.add("http://test/a#again")
+    index.add_many(["http://test/b", "http://test/c"])
+    index.close()
+
+    reopened = UrlDedupIndex(SqliteFingerprintStore(path), capacity=100)
+
+    assert reopened.seen("http://test/a")
+    assert reopened.seen("http://test/c")
+    assert not reopened.seen("http://test/d")
+
+
+def test_url_index_sees_urls_added_by_other_writers(tmp_path):
+    path = tmp_path / "urls.sqlite3"
+    ours = UrlDedupIndex(SqliteFingerprintStore(path), capacity=100)
+    theirs = UrlDedupIndex(SqliteFingerprintStore(path), capacity=100)
+
+    theirs.add("http://test/late")
+
+    assert ours.seen("http://test/late")
+
+
+def test_single_writer_index_answers_misses_from_a_warmed_bloom_filter(tmp_path):
+    path = tmp_path / "urls.sqlite3"
+    writer = UrlDedupIndex(SqliteFingerprintStore(path), capacity=100)
+    writer.add_many(["http://test/a", "http://test/b"])
+    writer.close()
+
+    index = UrlDedupIndex(SqliteFingerprintStore(path), capacity=100, single_writer=True)
+    index._warmer.join()
+    lookups = []
+    contains = index.store.contains
+    index.store.contains = lambda fp: lookups.append(fp) or contains(fp)
+
+    assert index.seen("http://test/a")
+    assert not index.seen("http://test/missing")
+    assert len(lookups) == 1  # the miss never reached the store
+    index.close()
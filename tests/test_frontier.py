@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+
+import pandas as pd
+
+from crawler_project.core.base_crawler import BaseCrawler
+from crawler_project.core.scheduler import CrawlJob, JobScheduler, SchedulerSettings
+from crawler_project.utils.frontier import CrawlFrontier, SqliteFrontierStore
+from crawler_project.utils.rate_limiter import HostRateLimiter
+from crawler_project.utils.storage_handler import StorageHandler
+
+PAGES = [f"http://www.north-news.cn/news/node_{page}.htm" for page in range(1, 11)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _frontiers(tmp_path, count=2, **kwargs):
+    clock = FakeClock()
+    frontiers = [
+        CrawlFrontier(
+            SqliteFrontierStore(tmp_path / "frontier.sqlite3"), "news:run", f"node-{index}", clock=clock, **kwargs
+        )
+        for index in range(count)
+    ]
+    return frontiers, clock
+
+
+def test_workers_lease_disjoint_pages_in_order(tmp_path):
+    (a, b), _ = _frontiers(tmp_path, batch_size=3)
+    a.seed("page", PAGES)
+    b.seed("page", PAGES)
+
+    first, second = a.lease("page"), b.lease("page")
+
+    assert first == PAGES[:3] and second == PAGES[3:6]
+    for key in first + second:
+        (a if key in first else b).complete("page", key)
+    assert a.remaining("page") == 10 - 3 and b.remaining("page") == 4
+    assert a.active_workers() == 2
+
+
+def test_expired_leases_are_retried_until_attempts_run_out(tmp_path):
+    (a, b), clock = _frontiers(tmp_path, lease_seconds=60, max_attempts=2)
+    a.seed("page", PAGES[:1])
+
+    assert a.lease("page") == PAGES[:1]
+    assert b.lease("page") == []
+    assert b.remaining("page") == 1
+
+    clock.now += 61
+    assert b.lease("page") == PAGES[:1]  # a crashed; its lease expired
+    clock.now += 61
+    assert a.lease("page") == []  # second attempt used up
+    assert a.remaining("page") == 0
+
+
+def test_detail_claims_and_release_on_close(tmp_path):
+    (a, b), _ = _frontiers(tmp_path)
+    url = "http://www.north-news.cn/content/1.htm"
+
+    assert a.claim("detail", url)
+    assert not b.claim("detail", url)
+
+    a.close()
+    assert b.claim("detail", url)
+    b.complete("detail", url)
+    b.flush()
+    (c,), _ = _frontiers(tmp_path, count=1)
+    assert not c.claim("detail", url)  # done stays done
+
+
+class PagedCrawler(BaseCrawler):
+    name = "paged"
+
+    async def crawl(self):
+        async for batch in self._page_batches(PAGES):
+            for url in batch:
+                await asyncio.sleep(0.02)  # a page fetch
+                self._mark_done("page", url)
+                yield url
+
+
+def test_crawlers_split_one_page_range_and_share_host_rates(tmp_path):
+    (a, b), _ = _frontiers(tmp_path, batch_size=2, poll_seconds=0.01)
+    crawlers = [PagedCrawler(), PagedCrawler()]
+    for crawler, frontier in zip(crawlers, (a, b)):
+        crawler.frontier = frontier
+        crawler.rate_limiter = HostRateLimiter(rate=1.0)
+
+    async def run(crawler):
+        return [url async for url in crawler.crawl()]
+
+    async def both():
+        return await asyncio.gather(*(run(crawler) for crawler in crawlers))
+
+    first, second = asyncio.run(both())
+
+    assert sorted(first + second) == sorted(PAGES)
+    assert not set(first) & set(second) and first and second
+    assert crawlers[1].rate_limiter.share == 0.5
+
+
+class LeasedPagesCrawler(BaseCrawler):
+    name = "leased"
+    frontier_factory = None
+    fetched = []
+
+    async def crawl(self):
+        self.dedup = None
+        self.frontier = self.frontier_factory()
+        async for batch in self._page_batches(PAGES[:4], batch_size=1):
+            for url in batch:
+                self.fetched.append(url)
+                for index in range(2):
+                    self._record_yielded(f"{url}#{index}")
+                    yield {"page": url, "index": index}
+                self._page_finished(url)
+
+
+def test_unacknowledged_pages_are_not_leased_again(tmp_path):
+    # The scheduler acknowledges only when its batch fills, here at the end of
+    # the run; leases must not wait for that or they expire and are re-crawled.
+    LeasedPagesCrawler.fetched = []
+    LeasedPagesCrawler.frontier_factory = staticmethod(
+        lambda: CrawlFrontier(
+            SqliteFrontierStore(tmp_path / "frontier.sqlite3"), "leased:run", "node-0", lease_seconds=0.05, poll_seconds=0.01
+        )
+    )
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'rows.db'}")
+    scheduler = JobScheduler(
+        [CrawlJob("leased", LeasedPagesCrawler, "leased_rows", {})], storage, config=SchedulerSettings(batch_size=100)
+    )
+
+    (progress,) = asyncio.run(scheduler.run())
+
+    assert progress.state == "done" and progress.records == 8
+    assert LeasedPagesCrawler.fetched == PAGES[:4]
+    assert len(pd.read_sql_table("leased_rows", storage.engine)) == 8
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from crawler_project.utils.gazetteer import Gazetteer, Place, get_gazetteer, location_columns
+
+
+def test_locate_prefers_district_under_mentioned_city():
+    location = get_gazetteer().locate("据北京市应急局消息，朝阳区一小区发生火灾")
+
+    assert location.code == "110105"
+    assert location.name == "北京市朝阳区"
+    assert location.mention.surface == "朝阳区"
+    assert (location.longitude, location.latitude) == (116.4431, 39.9215)
+
+
+def test_mentions_are_leftmost_longest_and_non_overlapping():
+    mentions = get_gazetteer().mentions("天津市滨海新区与北京海淀")
+
+    assert [(m.surface, m.place.code) for m in mentions] == [
+        ("天津市", "120000"),
+        ("滨海新区", "120116"),
+        ("北京", "110000"),
+        ("海淀", "110108"),
+    ]
+
+
+def test_parent_mention_breaks_ties_between_same_name_districts():
+    gazetteer = Gazetteer(
+        [
+            Place("1", "甲市", "city", None, 1.0, 1.0),
+            Place("11", "和平区", "district", "1", 1.1, 1.1),
+            Place("2", "乙市", "city", None, 2.0, 2.0),
+            Place("21", "和平区", "district", "2", 2.1, 2.1),
+        ]
+    )
+
+    assert gazetteer.locate("乙市和平区").code == "21"
+    assert gazetteer.locate("和平区").code == "11"
+
+
+def test_location_columns_without_match():
+    assert location_columns("没有地名") == {"location": None, "admin_code": None, "longitude": None, "latitude": None}
+
+
+def test_short_aliases_need_place_context():
+    gazetteer = get_gazetteer()
+
+    assert gazetteer.locate("朝阳群众提供线索") is None
+    assert gazetteer.locate("南开大学学生在北京市参加活动").code == "110000"
+    assert gazetteer.locate("朝阳一带出现积水").code == "110105"
+    assert gazetteer.locate("北京海淀一小区").code == "110108"
+
+
+def test_alias_only_district_does_not_outrank_another_named_city():
+    gazetteer = get_gazetteer()
+
+    assert gazetteer.locate("张某从南开一带前往北京市").code == "110000"
+    assert gazetteer.locate("张某从南开区前往北京市").code == "120104"  # full district name still wins
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from pyproj import Transformer
+
+from crawler_project import gridding
+from crawler_project.utils.grid import GridAggregator, GridSpec
+from crawler_project.utils.storage_handler import StorageHandler
+
+
+def _points(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "longitude": rng.uniform(116.0, 117.0, count),
+            "latitude": rng.uniform(39.5, 40.5, count),
+            "price": rng.integers(100, 900, count).astype(float),
+            "category": rng.choice(["学校", "医院"], count),
+        }
+    )
+
+
+def test_cells_match_projected_floor_division():
+    frame = _points(1000)
+    spec = GridSpec(5000, "EPSG:32650")
+
+    ix, iy, valid = spec.cells(frame["longitude"], frame["latitude"])
+
+    x, y = Transformer.from_crs("EPSG:4326", "EPSG:32650", always_xy=True).transform(
+        frame["longitude"].to_numpy(), frame["latitude"].to_numpy()
+    )
+    assert valid.all()
+    assert (ix == np.floor(x / 5000)).all()
+    assert (iy == np.floor(y / 5000)).all()
+
+
+def test_chunked_aggregation_equals_single_pass():
+    frame = _points(5000)
+    frame.loc[::7, "price"] = np.nan
+    frame.loc[3, "longitude"] = np.nan
+    spec = GridSpec(5000, "EPSG:32650")
+
+    whole = GridAggregator(spec, ["price"], by="category")
+    whole.add_frames([frame])
+    chunked = GridAggregator(spec, ["price"], by="category")
+    chunked.add_frames(frame.iloc[i : i + 700] for i in range(0, len(frame), 700))
+
+    pd.testing.assert_frame_equal(whole.result(), chunked.result())
+    result = chunked.result()
+    assert chunked.points == result["count"].sum() == len(frame) - 1
+    expected = frame.drop(index=3)["price"]
+    assert result["price_n"].sum() == expected.notna().sum()
+    assert np.isclose(result["price_sum"].sum(), expected.sum())
+
+
+def test_build_grid_streams_a_table_to_geojson_cells(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'grid.db'}")
+    frame = _points(2000)
+    storage.save_records(frame.to_dict("records"), "spatial_poi", method="insert")
+
+    aggregator = gridding.build_grid(storage, "spatial_poi", spec=GridSpec(5000, "EPSG:32650"), chunk_size=300)
+
+    cells = aggregator.to_geodataframe()
+    assert aggregator.points == 2000
+    assert set(cells["category"]) == {"学校", "医院"}
+    assert cells.crs.to_epsg() == 4326
+    assert cells.geometry.geom_type.eq("Polygon").all()
+
+
+def test_build_grid_rejects_tables_without_coordinates(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'grid.db'}")
+    storage.save_records([{"community": "望京花园", "price": "520"}], "housing_market", method="insert")
+
+    assert "housing_market" not in gridding.SOURCES
+    with pytest.raises(ValueError, match="no column longitude, latitude"):
+        gridding.build_grid(storage, "housing_market", spec=GridSpec(5000, "EPSG:32650"))
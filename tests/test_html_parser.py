@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from crawler_project.utils.extraction_specs import (
+    HOUSING_LISTING,
+    LEGAL_DETAIL,
+    LEGAL_LISTING,
+    NEWS_DETAIL,
+    NEWS_LISTING,
+)
+from crawler_project.utils.html_parser import extract, extract_one, get_backend
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _available_backends():
+    names = []
+    for name in ("selectolax", "lxml", "soup"):
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+BACKENDS = _available_backends()
+CASES = [
+    (NEWS_LISTING, "news_list.html"),
+    (NEWS_DETAIL, "news_detail.html"),
+    (LEGAL_LISTING, "legal_list.html"),
+    (LEGAL_DETAIL, "legal_detail.html"),
+    (HOUSING_LISTING, "housing_list.html"),
+    (NEWS_DETAIL, "xhtml_detail.html"),
+]
+
+
+@pytest.fixture(params=BACKENDS or [pytest.param(None, marks=pytest.mark.skip("no parser backend"))])
+def backend(request):
+    return request.param
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_news_listing_rows(backend):
+    rows = extract(NEWS_LISTING, _fixture("news_list.html"), backend)
+
+    assert rows[0] == {"title": "北京某区发生火灾", "href": "/news/2019-05/01/content_1.htm", "date_text": "2019-05-01"}
+    assert rows[1]["title"] == "暴雨致多条道路积水"
+    assert rows[1]["date_text"] == "2019-05-02"
+    assert rows[2]["title"] == "交通事故通报"
+    assert rows[2]["date_text"] is None
+    assert rows[3]["href"] is None
+
+
+def test_detail_text_skips_scripts_and_blank_nodes(backend):
+    content = extract_one(NEWS_DETAIL, _fixture("news_detail.html"), backend)["content"]
+
+    assert content == "2019年5月1日凌晨，北京市朝阳区发生火灾，造成20人受伤。\n直接经济损失约300万元。"
+
+
+def test_detail_falls_back_to_none_when_missing(backend):
+    assert extract_one(NEWS_DETAIL, "<html><body><p>x</p></body></html>", backend) == {"content": None}
+    assert extract(NEWS_LISTING, "", backend) == []
+
+
+def test_housing_listing_attributes(backend):
+    rows = extract(HOUSING_LISTING, _fixture("housing_list.html"), backend)
+
+    assert len(rows) == 2
+    assert rows[0]["address"] == "朝阳区 望京"
+    assert rows[0]["house_info"].split("|")[1].strip() == "89.5平米"
+    assert rows[1]["address"] is None
+    assert rows[1]["deal_date"] is None
+
+
+def test_xhtml_with_encoding_declaration(backend):
+    content = extract_one(NEWS_DETAIL, _fixture("xhtml_detail.html"), backend)["content"]
+
+    assert content == "2019年7月3日，某县遭遇暴雨，受灾群众1.2万人。"
+
+
+@pytest.mark.skipif(len(BACKENDS) < 2, reason="needs at least two parser backends")
+@pytest.mark.parametrize("spec,fixture", CASES, ids=[fixture for _, fixture in CASES])
+def test_backends_agree(spec, fixture):
+    html = _fixture(fixture)
+    expected = extract(spec, html, BACKENDS[0])
+    for name in BACKENDS[1:]:
+        assert extract(spec, html, name) == expected, name
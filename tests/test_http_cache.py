@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from crawler_project.utils.http_cache import ResponseCache
+
+
+def test_response_cache_round_trip_and_validators(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=1 << 20, ttl_seconds=3600)
+    key = ResponseCache.key("GET", "http://test/list", {"page": 2, "q": "火灾"})
+
+    assert cache.get(key) is None
+    cache.put(key, "http://test/list", "<html>火灾</html>", etag='"abc"', last_modified="Wed, 01 May 2019 00:00:00 GMT")
+
+    cached = cache.get(key)
+    assert cached.body == "<html>火灾</html>"
+    assert cached.conditional_headers() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 01 May 2019 00:00:00 GMT",
+    }
+    assert key == ResponseCache.key("get", "http://test/list", {"q": "火灾", "page": 2})
+
+
+def test_response_cache_expires_mutable_entries_only(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=1 << 20, ttl_seconds=-1)
+    cache.put("listing", "http://test/list", "list")
+    cache.put("detail", "http://test/detail", "detail", immutable=True)
+
+    assert cache.get("listing") is None
+    assert cache.get("detail").body == "detail"
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=10**9, ttl_seconds=3600)
+    for idx in range(5):
+        cache.put(f"k{idx}", f"http://test/{idx}", f"body-{idx}" * 50)
+    cache.get("k0")
+
+    total = cache._conn.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    cache.max_bytes = total - 1
+    cache.evict()
+
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None
+    assert cache.get("k4") is not None
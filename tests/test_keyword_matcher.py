@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import random
+
+from crawler_project.utils.data_parser import DISASTER_KEYWORDS, detect_charge, detect_disaster_type
+from crawler_project.utils.keyword_matcher import KeywordMatcher
+
+
+def _naive_first(dictionary, text):
+    for category, keywords in dictionary.items():
+        if any(keyword in text for keyword in keywords):
+            return category
+    return None
+
+
+def test_scan_reports_counts_and_overlapping_positions():
+    matcher = KeywordMatcher({"a": ["he", "she", "hers"], "b": ["his"]})
+
+    found = matcher.scan("ushers said his")
+
+    assert list(found) == ["a", "b"]
+    assert found["a"].count == 3
+    assert found["a"].positions == [(1, 4), (2, 4), (2, 6)]
+    assert found["a"].keywords == {"she": 1, "he": 1, "hers": 1}
+    assert found["b"].positions == [(12, 15)]
+
+
+def test_first_category_follows_dictionary_order_not_text_order():
+    text = "暴雨引发道路塌陷，随后起火"
+
+    assert detect_disaster_type(text) == "火灾"
+    assert detect_disaster_type("") is None
+    assert detect_disaster_type(None) is None
+    assert detect_charge("被告人犯诈骗罪、盗窃罪") == "盗窃"
+
+
+def test_matches_naive_scan_on_random_text():
+    rng = random.Random(7)
+    alphabet = "".join({char for terms in DISASTER_KEYWORDS.values() for term in terms for char in term}) + "的了在"
+    matcher = KeywordMatcher(DISASTER_KEYWORDS)
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert matcher.first_category(text) == _naive_first(DISASTER_KEYWORDS, text)
+        expected = sorted(
+            (category, keyword, start)
+            for category, keywords in DISASTER_KEYWORDS.items()
+            for keyword in keywords
+            for start in range(len(text))
+            if text.startswith(keyword, start)
+        )
+        assert sorted((hit.category, hit.keyword, hit.start) for hit in matcher.iter_matches(text)) == expected
+
+
+def test_large_dictionaries_match_the_naive_scan():
+    rng = random.Random(11)
+    alphabet = [chr(code) for code in range(0x4E00, 0x4E00 + 120)]
+    dictionary = {
+        f"c{index}": ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3))) for _ in range(10)]
+        for index in range(30)
+    }
+    matcher = KeywordMatcher(dictionary)
+    assert matcher._starts is not None  # first-character dispatch path
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert matcher.first_category(text) == _naive_first(dictionary, text)
+        expected = sorted(
+            {
+                (category, keyword, start)
+                for category, keywords in dictionary.items()
+                for keyword in keywords
+                for start in range(len(text))
+                if text.startswith(keyword, start)
+            }
+        )
+        assert sorted((hit.category, hit.keyword, hit.start) for hit in matcher.iter_matches(text)) == expected
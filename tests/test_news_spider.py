@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
+from pathlib import Path
 
 from scrapy.http import HtmlResponse
 
 from crawler_project.scrapy_app.spiders.news_spider import NorthNewsSpider
+from crawler_project.utils.frontier import CrawlFrontier, SqliteFrontierStore
+
+DETAIL_HTML = "<html><body><div class='article'>2019年5月1日凌晨，北京某区发生火灾。</div></body></html>"
 
 
 def test_news_spider_parse_detail_extracts_fields():
@@ -22,3 +27,44 @@ def test_news_spider_parse_detail_extracts_fields():
     assert item["disaster_type"] == "火灾"
     assert item["loss"]["amount"] == "20"
     assert item["publish_date"] == "2019-05-01T00:00:00"
+    assert item["injuries"] == 20
+    assert item["deaths"] is None
+
+
+def test_news_spider_parse_list_follows_articles_in_range():
+    spider = NorthNewsSpider(start_date="2019-01-01", end_date="2019-12-31")
+    body = (Path(__file__).parent / "fixtures" / "news_list.html").read_bytes()
+    response = HtmlResponse(url="http://www.north-news.cn/news/node_1.htm", body=body, encoding="utf-8")
+
+    async def collect():
+        return [request async for request in spider.parse_list(response, page=1)]
+
+    requests = asyncio.run(collect())
+
+    assert [request.url for request in requests] == [
+        "http://www.north-news.cn/news/2019-05/01/content_1.htm",
+        "http://www.north-news.cn/news/2019-05/02/content_2.htm",
+        "http://www.north-news.cn/news/node_2.htm",
+    ]
+    assert requests[0].cb_kwargs["title"] == "北京某区发生火灾"
+
+
+def test_news_spider_completes_claimed_details(tmp_path):
+    def frontier(worker):
+        return CrawlFrontier(SqliteFrontierStore(tmp_path / "frontier.sqlite3"), "north_news:run", worker)
+
+    spider = NorthNewsSpider()
+    spider.frontier = frontier("node-0")
+    url = "http://www.north-news.cn/news/2019-05/01/content_1.htm"
+    assert spider.frontier.claim("detail", url)
+    listing = HtmlResponse(url="http://www.north-news.cn/news/node_1.htm", body=b"", encoding="utf-8")
+
+    request = spider.detail_request(listing, url, callback=spider.parse_detail, meta={"dedup": True})
+    assert request.errback == spider._release_detail
+    assert request.meta == {"dedup": True, "frontier_detail": url}
+
+    redirected = HtmlResponse(url=url + "?from=list", body=DETAIL_HTML, encoding="utf-8", request=request)
+    list(spider.parse_detail(redirected, title="火灾", publish_date=datetime(2019, 5, 1)))
+    spider.frontier.close()  # a held claim would be released here, costing an attempt
+
+    assert not frontier("node-1").claim("detail", url)  # done, not handed back
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from crawler_project.core import base_crawler, housing_crawler, news_crawler
+from crawler_project.core.base_crawler import ParseSettings, get_parse_executor, shutdown_parse_executor
+from crawler_project.core.housing_crawler import HousingCrawler
+from crawler_project.core.news_crawler import NewsCrawler
+from crawler_project.utils.rate_limiter import HostRateLimiter
+
+FIXTURES = Path(__file__).parent / "fixtures"
+LISTING = (FIXTURES / "news_list.html").read_text(encoding="utf-8")
+HOUSING_LISTING = (FIXTURES / "housing_list.html").read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def parse_settings(monkeypatch):
+    """Point the ``parsing`` section at a ParseSettings the test chooses."""
+
+    chosen = ParseSettings(workers=1)
+    real_get_section = base_crawler.get_section
+    monkeypatch.setattr(
+        base_crawler,
+        "get_section",
+        lambda name, default: chosen if name == "parsing" else real_get_section(name, default),
+    )
+    shutdown_parse_executor()
+    yield chosen
+    shutdown_parse_executor()
+
+
+def test_parse_runs_module_level_parsers_in_the_spawn_pool(parse_settings):
+    crawler = NewsCrawler()
+    executor = get_parse_executor()
+    assert executor._mp_context.get_start_method() == "spawn"
+
+    pooled = asyncio.run(crawler._parse(news_crawler._parse_page, LISTING))
+
+    assert executor._processes  # a worker process did the parsing
+    assert pooled == news_crawler._parse_page(LISTING)
+    assert [row["title"] for row in pooled] == ["北京某区发生火灾", "暴雨致多条道路积水"]
+
+
+def test_parse_many_ships_pages_in_configured_chunks(parse_settings, monkeypatch):
+    parse_settings.chunksize = 2
+    chunksizes = []
+    executor = get_parse_executor()
+    real_map = executor.map
+
+    def recording_map(*args, chunksize):
+        chunksizes.append(chunksize)
+        return real_map(*args, chunksize=chunksize)
+
+    monkeypatch.setattr(executor, "map", recording_map)
+
+    pooled = asyncio.run(NewsCrawler()._parse_many(news_crawler._parse_page, [LISTING] * 3))
+
+    assert chunksizes == [2]
+    assert pooled == [news_crawler._parse_page(LISTING)] * 3
+
+
+class FakeBrowserPool:
+    def __init__(self, size=None):
+        self.size = size or 2
+        self.fetched = []
+        self.closed_in = None
+
+    def fetch(self, url, ready=None):
+        self.fetched.append(url)
+        return HOUSING_LISTING
+
+    def close(self):
+        self.closed_in = threading.current_thread()
+
+
+def test_housing_crawler_parses_each_fetch_window_as_one_group(parse_settings, monkeypatch):
+    parse_settings.workers = 0
+    pools = []
+    monkeypatch.setattr(housing_crawler, "BrowserPool", lambda size: pools.append(FakeBrowserPool(size)) or pools[-1])
+    groups = []
+    real_parse_many = HousingCrawler._parse_many
+
+    async def parse_many(self, func, pages):
+        groups.append(len(pages))
+        return await real_parse_many(self, func, pages)
+
+    monkeypatch.setattr(HousingCrawler, "_parse_many", parse_many)
+    crawler = HousingCrawler()
+    crawler.rate_limiter = HostRateLimiter(rate=1000.0, burst=100)
+
+    async def crawl():
+        return [record async for record in crawler.crawl(max_pages=5, workers=2)]
+
+    records = asyncio.run(crawl())
+
+    assert groups == [2, 2, 1]
+    assert len(records) == 5 * len(housing_crawler._parse_page(HOUSING_LISTING))
+    assert records[0]["community"] == "望京花园"
+    assert pools[0].closed_in not in (None, threading.main_thread())  # closed, and not on the event loop
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import random
+
+from crawler_project.core.spatial_crawler import SpatialCrawler
+from crawler_project.utils.poi_tiling import PageRequest, Tile, TilingSettings, follow_ups, unseen
+
+
+class FakePlaceApi:
+    """Bounds search over fixed POIs with Baidu's result cap and paging."""
+
+    def __init__(self, pois, cap=40, page_size=10):
+        self.pois, self.cap, self.page_size = pois, cap, page_size
+        self.calls = 0
+
+    async def fetch_json(self, url, params=None):
+        self.calls += 1
+        south, west, north, east = map(float, params["bounds"].split(","))
+        inside = [
+            poi
+            for poi in self.pois
+            if south <= poi["location"]["lat"] <= north and west <= poi["location"]["lng"] <= east
+        ]
+        visible = inside[: self.cap]
+        start = params["page_num"] * params["page_size"]
+        return {"status": 0, "total": len(visible), "results": visible[start : start + params["page_size"]]}
+
+
+def _pois(count, seed=3):
+    rng = random.Random(seed)
+    pois = []
+    for i in range(count):
+        # a dense cluster near the centre plus a sparse background
+        if i % 3:
+            lat, lng = rng.uniform(39.90, 39.92), rng.uniform(116.39, 116.41)
+        else:
+            lat, lng = rng.uniform(39.5, 41.0), rng.uniform(116.2, 117.4)
+        pois.append({"uid": f"u{i}", "name": f"poi{i}", "location": {"lat": lat, "lng": lng}})
+    return pois
+
+
+def test_follow_ups_split_saturated_tiles_and_page_the_rest():
+    settings = TilingSettings(result_cap=40, page_size=10, max_depth=3)
+    root = PageRequest(Tile(0.0, 0.0, 2.0, 2.0))
+
+    children = follow_ups({"total": 40, "results": [{}] * 10}, root, settings)
+    pages = follow_ups({"total": 25, "results": [{}] * 10}, root, settings)
+
+    assert [child.tile for child in children] == root.tile.split()
+    assert all(child.depth == 1 for child in children)
+    assert [page.page for page in pages] == [1, 2]
+    assert follow_ups({"total": 25, "results": [{}] * 10}, pages[0], settings) == []
+    assert follow_ups({"status": 302, "message": "quota"}, root, settings) == []
+
+
+def test_unseen_dedupes_by_uid():
+    seen = set()
+    first = list(unseen([{"uid": "a"}, {"uid": "b"}], seen))
+    second = list(unseen([{"uid": "b"}, {"uid": "c"}], seen))
+
+    assert [poi["uid"] for poi in first + second] == ["a", "b", "c"]
+
+
+def test_spatial_crawler_covers_dense_area_beyond_the_cap(monkeypatch):
+    pois = _pois(300)
+    api = FakePlaceApi(pois)
+    monkeypatch.setattr(
+        "crawler_project.core.spatial_crawler.get_section",
+        lambda name, default: TilingSettings(result_cap=40, page_size=10, max_depth=12),
+    )
+
+    async def run():
+        crawler = SpatialCrawler()
+        monkeypatch.setattr(crawler, "fetch_json", api.fetch_json)
+        bounds = {"southwest": "39.5,116.2", "northeast": "41.0,117.4"}
+        return [record async for record in crawler.crawl(bounds, "学校")]
+
+    records = asyncio.run(run())
+
+    assert sorted(record["uid"] for record in records) == sorted(poi["uid"] for poi in pois)
+    assert api.calls < 200
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import time
 from types import SimpleNamespace
 
-import pandas as pd
 import pytest
+from scrapy.exceptions import DropItem
+from twisted.internet import defer
 
 from crawler_project.scrapy_app import pipelines
 from crawler_project.scrapy_app.pipelines import PostgresPipeline
@@ -13,8 +15,10 @@ class DummyStorage:
     def __init__(self):
         self.saved = []
 
-    def save_dataframe(self, df: pd.DataFrame, table: str, if_exists: str = "append") -> None:
-        self.saved.append((table, df.copy()))
+    def save_records(self, records, table: str, **kwargs) -> int:
+        rows = list(records)
+        self.saved.append((table, rows))
+        return len(rows)
 
 
 def test_postgres_pipeline_flush(monkeypatch):
@@ -27,13 +31,12 @@ def test_postgres_pipeline_flush(monkeypatch):
 
     pipeline.process_item({"a": 1}, spider)
     pipeline.process_item({"a": 2}, spider)
+    pipeline.close_spider(spider)
 
     assert len(dummy.saved) == 1
-    table, df = dummy.saved[0]
+    table, rows = dummy.saved[0]
     assert table == "dummy_table"
-    assert df.shape[0] == 2
-
-    pipeline.close_spider(spider)
+    assert rows == [{"a": 1}, {"a": 2}]
 
 
 @pytest.mark.parametrize("items", [[{"x": 1}], []])
@@ -53,3 +56,132 @@ def test_postgres_pipeline_handles_small_batches(monkeypatch, items):
         assert dummy.saved, "Items should flush on close"
     else:
         assert not dummy.saved
+
+
+def test_postgres_pipeline_flushes_on_interval(monkeypatch):
+    dummy = DummyStorage()
+    monkeypatch.setattr(pipelines, "StorageHandler", lambda: dummy)
+    pipeline = PostgresPipeline(batch_size=100, flush_interval=0.05)
+    spider = SimpleNamespace(name="dummy")
+    pipeline.open_spider(spider)
+
+    pipeline.process_item({"x": 1}, spider)
+    deadline = time.monotonic() + 5
+    while not dummy.saved and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [len(rows) for _, rows in dummy.saved] == [1]
+    pipeline.close_spider(spider)
+    assert len(dummy.saved) == 1
+
+
+def test_postgres_pipeline_close_is_exactly_once(monkeypatch):
+    dummy = DummyStorage()
+    monkeypatch.setattr(pipelines, "StorageHandler", lambda: dummy)
+    pipeline = PostgresPipeline(batch_size=2)
+    spider = SimpleNamespace(name="dummy")
+    pipeline.open_spider(spider)
+
+    for value in range(5):
+        pipeline.process_item({"x": value}, spider)
+    pipeline.close_spider(spider)
+    pipeline.close_spider(spider)
+
+    assert sorted(row["x"] for _, rows in dummy.saved for row in rows) == [0, 1, 2, 3, 4]
+
+
+class FlakyStorage(DummyStorage):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+        self.attempts = 0
+
+    def save_records(self, records, table: str, **kwargs) -> int:
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("database unavailable")
+        return super().save_records(records, table, **kwargs)
+
+
+class RecordingDedup:
+    def __init__(self, known=(), bloom_ready=False):
+        self.added = []
+        self.known = set(known)
+        self.bloom_ready = bloom_ready
+        self.lookups = []
+
+    def definitely_new(self, url: str) -> bool:
+        return self.bloom_ready and url not in self.known
+
+    def seen(self, url: str) -> bool:
+        self.lookups.append(url)
+        return url in self.known
+
+    def add_many(self, urls) -> int:
+        self.added.extend(urls)
+        return len(self.added)
+
+
+def test_postgres_pipeline_retries_failed_writes(monkeypatch):
+    storage = FlakyStorage(failures=2)
+    monkeypatch.setattr(pipelines, "StorageHandler", lambda: storage)
+    dedup = RecordingDedup()
+    pipeline = PostgresPipeline(batch_size=2, dedup=dedup, write_retries=2, retry_backoff=0)
+    spider = SimpleNamespace(name="dummy")
+    pipeline.open_spider(spider)
+
+    for value in range(2):
+        pipeline.process_item({"url": f"https://a/{value}"}, spider)
+    pipeline.close_spider(spider)
+
+    assert storage.attempts == 3
+    assert [len(rows) for _, rows in storage.saved] == [2]
+    assert dedup.added == ["https://a/0", "https://a/1"]
+
+
+def test_postgres_pipeline_raises_when_writes_keep_failing(monkeypatch):
+    storage = FlakyStorage(failures=100)
+    monkeypatch.setattr(pipelines, "StorageHandler", lambda: storage)
+    dedup = RecordingDedup()
+    pipeline = PostgresPipeline(batch_size=2, dedup=dedup, write_retries=1, retry_backoff=0)
+    spider = SimpleNamespace(name="dummy")
+    pipeline.open_spider(spider)
+
+    for value in range(5):
+        pipeline.process_item({"url": f"https://a/{value}"}, spider)
+    with pytest.raises(RuntimeError, match="could not store 5 rows"):
+        pipeline.close_spider(spider)
+
+    assert storage.attempts == 2  # later batches are not attempted after giving up
+    assert dedup.added == []  # so the items are crawled again
+
+
+@pytest.mark.parametrize("bloom_ready", [False, True])
+def test_postgres_pipeline_looks_up_the_dedup_store_off_the_reactor(monkeypatch, bloom_ready):
+    monkeypatch.setattr(pipelines, "StorageHandler", DummyStorage)
+    offloaded = []
+
+    def defer_to_thread(func, *args):
+        offloaded.append(func.__name__)
+        return defer.maybeDeferred(func, *args)
+
+    monkeypatch.setattr(pipelines.threads, "deferToThread", defer_to_thread)
+    dedup = RecordingDedup(known={"https://a/old"}, bloom_ready=bloom_ready)
+    pipeline = PostgresPipeline(batch_size=10, dedup=dedup, crawler=SimpleNamespace())
+    spider = SimpleNamespace(name="dummy")
+    pipeline.open_spider(spider)
+
+    new = pipeline.process_item({"url": "https://a/new"}, spider)
+    old = pipeline.process_item({"url": "https://a/old"}, spider)
+    failures = []
+    old.addErrback(lambda failure: failures.append(failure.type))
+
+    assert failures == [DropItem]
+    if bloom_ready:  # a Bloom miss is answered inline, only the hit goes to the store
+        assert new == {"url": "https://a/new"}
+        assert offloaded == ["seen"] and dedup.lookups == ["https://a/old"]
+    else:
+        assert isinstance(new, defer.Deferred)
+        assert offloaded == ["seen", "seen"]
+    pipeline.close_spider(spider)
+    assert pipeline.storage.saved == [("dummy_records", [{"url": "https://a/new"}])]
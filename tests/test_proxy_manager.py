@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+import tenacity
+from scrapy import Request
+from scrapy.http import Response
+
+from crawler_project.core import base_crawler
+from crawler_project.core.base_crawler import BaseCrawler
+from crawler_project.scrapy_app.middlewares import HealthScoredProxyMiddleware
+from crawler_project.utils.proxy_manager import ProxyManager, ProxyPoolSettings, WeightedSampler
+from crawler_project.utils.rate_limiter import HostRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _manager(tmp_path, *proxies, **config):
+    pool = tmp_path / "proxies.txt"
+    pool.write_text("\n".join(proxies) + "\n", encoding="utf-8")
+    clock = FakeClock()
+    return ProxyManager(pool, ProxyPoolSettings(**config), clock=clock), clock, pool
+
+
+def test_failures_cool_down_with_backoff_and_come_back(tmp_path):
+    manager, clock, _ = _manager(tmp_path, "http://a:1", "http://b:1", cooldown_seconds=10)
+
+    manager.mark_failure("http://a:1")
+    assert {manager.next_proxy() for _ in range(50)} == {"http://b:1"}
+
+    clock.now = 10.0
+    assert manager.healthy_count == 1
+    assert "http://a:1" in {manager.next_proxy() for _ in range(50)}
+
+    manager.mark_failure("http://a:1")
+    manager.mark_failure("http://a:1")
+    clock.now = 20.0 + 19.0
+    manager.next_proxy()
+    assert manager.healthy_count == 1  # third failure in a row: 40 s
+    clock.now = 50.0
+    manager.next_proxy()
+    assert manager.healthy_count == 2
+
+
+def test_selection_prefers_fast_reliable_proxies(tmp_path):
+    manager, _, _ = _manager(tmp_path, "http://fast:1", "http://slow:1")
+    for _ in range(20):
+        manager.mark_success("http://fast:1", 0.2)
+        manager.mark_success("http://slow:1", 3.0)
+
+    picks = Counter(manager.next_proxy() for _ in range(2000))
+
+    assert picks["http://fast:1"] > 4 * picks["http://slow:1"] > 0
+
+
+def test_status_outcomes_and_unknown_proxies(tmp_path):
+    manager, _, _ = _manager(tmp_path, "http://a:1")
+
+    manager.record("http://a:1", 404, 0.5)
+    assert manager.healthy_count == 1
+    manager.record("http://a:1", 407, 0.5)
+    assert manager.next_proxy() is None
+
+    manager.mark_failure("http://elsewhere:1")
+    assert len(manager) == 1
+
+
+def test_pool_file_hot_reload_keeps_existing_stats(tmp_path):
+    manager, clock, pool = _manager(tmp_path, "http://a:1", "http://b:1", reload_seconds=5)
+    manager.mark_success("http://a:1", 0.1)
+    latency = manager.stats("http://a:1").latency
+
+    pool.write_text("http://a:1\n# retired b\nhttp://c:1\n", encoding="utf-8")
+    os.utime(pool, (1, 1))
+    clock.now = 5.0
+    manager.next_proxy()
+
+    assert len(manager) == 2
+    assert manager.stats("http://b:1") is None
+    assert manager.stats("http://c:1") is not None
+    assert manager.stats("http://a:1").latency == latency
+
+
+def test_weighted_sampler_tracks_updates_and_pops():
+    sampler = WeightedSampler()
+    for weight in [1.0, 0.0, 3.0, 2.0, 5.0]:
+        sampler.append(weight)
+    sampler.update(4, 0.0)
+    sampler.pop()
+    sampler.update(1, 4.0)
+
+    rng = random.Random(7)
+    counts = Counter(sampler.sample(rng) for _ in range(20_000))
+
+    assert set(counts) == {0, 1, 2, 3}
+    for index, weight in enumerate([1.0, 4.0, 3.0, 2.0]):
+        assert abs(counts[index] / 20_000 - weight / 10.0) < 0.02
+
+
+class FakeManager:
+    def __init__(self, *proxies):
+        self.proxies = list(proxies)
+        self.outcomes = []
+
+    def next_proxy(self):
+        return self.proxies.pop(0) if self.proxies else None
+
+    def record(self, proxy, status, latency):
+        self.outcomes.append((proxy, status))
+
+    def mark_failure(self, proxy):
+        self.outcomes.append((proxy, "failure"))
+
+
+def test_middleware_reports_responses_and_drops_blocked_proxies():
+    manager = FakeManager("http://a:1", "http://b:1", "http://c:1")
+    middleware = HealthScoredProxyMiddleware(manager)
+    request = Request("http://test/page")
+
+    middleware.process_request(request, spider=None)
+    assert request.meta["proxy"] == "http://a:1"
+    middleware.process_response(request, Response(request.url, status=429, request=request), spider=None)
+    assert "proxy" not in request.meta and "pool_proxy" not in request.meta
+
+    retry = request.copy()  # what RetryMiddleware schedules
+    middleware.process_request(retry, spider=None)
+    assert retry.meta["proxy"] == "http://b:1"
+    middleware.process_response(retry, Response(retry.url, status=200, request=retry), spider=None)
+    assert retry.meta["pool_proxy"] == "http://b:1"  # a good proxy stays on the request
+
+    failed = Request("http://test/other")
+    middleware.process_request(failed, spider=None)
+    middleware.process_exception(failed, TimeoutError(), spider=None)
+    assert "proxy" not in failed.meta
+
+    explicit = Request("http://test/pinned", meta={"proxy": "http://mine:1"})
+    middleware.process_request(explicit, spider=None)
+    middleware.process_response(explicit, Response(explicit.url, status=503, request=explicit), spider=None)
+    assert explicit.meta["proxy"] == "http://mine:1"
+
+    assert manager.outcomes == [("http://a:1", 429), ("http://b:1", 200), ("http://c:1", "failure")]
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def text(self):
+        return "body"
+
+
+class FakeSession:
+    closed = False
+
+    def __init__(self):
+        self.proxies = []
+
+    @asynccontextmanager
+    async def request(self, method, url, proxy=None, **kwargs):
+        self.proxies.append(proxy)
+        if url.endswith("/down"):
+            raise aiohttp.ClientConnectionError("connection refused")
+        yield FakeResponse(int(url.rsplit("/", 1)[1]))
+
+
+class IdleCrawler(BaseCrawler):
+    name = "idle"
+
+    async def crawl(self):
+        yield {}
+
+
+def test_send_reports_each_outcome_to_the_proxy_pool(monkeypatch):
+    monkeypatch.setattr(base_crawler.settings.proxy, "enabled", True)
+    crawler = IdleCrawler(session=FakeSession())
+    crawler.proxy_manager = FakeManager(*(f"http://{name}:1" for name in "abcde"))
+    crawler.rate_limiter = HostRateLimiter(rate=1000.0)
+    send = BaseCrawler._send.retry_with(stop=tenacity.stop_after_attempt(2), wait=tenacity.wait_none())
+
+    async def go():
+        assert (await send(crawler, "GET", "http://test/200")).text == "body"
+        with pytest.raises(aiohttp.ClientResponseError):
+            await send(crawler, "GET", "http://test/503")
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await send(crawler, "GET", "http://test/down")
+        await send(crawler, "GET", "http://test/200", proxy="http://mine:1")
+
+    asyncio.run(go())
+
+    # Each retry draws a fresh proxy; an explicit proxy is used but not scored.
+    assert crawler.proxy_manager.outcomes == [
+        ("http://a:1", 200),
+        ("http://b:1", 503),
+        ("http://c:1", 503),
+        ("http://d:1", "failure"),
+        ("http://e:1", "failure"),
+    ]
+    assert crawler.session.proxies[-1] == "http://mine:1"
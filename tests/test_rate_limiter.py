@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from crawler_project.utils.rate_limiter import HostRateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_schedules_back_to_back_reservations():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, burst=1, clock=clock)
+
+    delays = [bucket.reserve() for _ in range(3)]
+
+    assert delays == pytest.approx([0.0, 2.0, 4.0])
+
+
+def test_token_bucket_refills_up_to_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, burst=2, clock=clock)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now = 10.0
+
+    assert [bucket.reserve() for _ in range(3)] == pytest.approx([0.0, 0.0, 1.0])
+
+
+def test_host_rate_limiter_keeps_hosts_independent():
+    limiter = HostRateLimiter(rate=0.5, host_rates={"api.map.baidu.com": 10})
+
+    assert limiter.reserve("http://www.north-news.cn/news/node_1.htm") == 0.0
+    assert limiter.reserve("https://www.bjcourt.gov.cn/bjws/bsal/?page=1") == 0.0
+    assert limiter.reserve("http://www.north-news.cn/news/node_2.htm") > 1.9
+    assert limiter.bucket("api.map.baidu.com").rate == 10
+
+
+def test_jitter_never_brings_requests_closer_than_the_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, burst=1, clock=clock)
+
+    delays = [bucket.reserve(extra) for extra in (2.99, 0.99, 0.0, 1.5)]
+
+    assert delays == pytest.approx([2.99, 2.99 + 0.99 + 2.0, 2.99 + 0.99 + 4.0, 2.99 + 0.99 + 1.5 + 6.0])
+    limiter = HostRateLimiter(rate=0.5, jitter=3.0)
+    delays = [limiter.reserve("http://www.north-news.cn/news/node_1.htm") for _ in range(20)]
+    assert min(later - earlier for earlier, later in zip(delays, delays[1:])) >= 2.0 - 0.01
+
+
+def test_hosts_with_their_own_rate_are_not_jittered():
+    limiter = HostRateLimiter(rate=0.5, jitter=3.0, host_rates={"api.map.baidu.com": 10})
+
+    delays = [limiter.reserve("https://api.map.baidu.com/place/v2/search") for _ in range(100)]
+
+    assert delays[-1] == pytest.approx(99 / 10, abs=0.05)  # 100 requests in ~10 s: 10 req/s sustained
+    assert limiter.reserve("http://www.north-news.cn/") < 3.0
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pandas as pd
+
+from crawler_project import main as cli
+from crawler_project.core.base_crawler import BaseCrawler
+from crawler_project.core.scheduler import CrawlJob, JobScheduler, SchedulerSettings
+from crawler_project.utils.storage_handler import StorageHandler
+
+EVENTS = []
+SESSIONS = set()
+
+
+class TickCrawler(BaseCrawler):
+    name = "tick"
+
+    async def crawl(self, label: str, count: int, fail_at: int = -1):
+        SESSIONS.add(id(self.session))
+        for index in range(count):
+            if index == fail_at:
+                raise RuntimeError("listing page changed")
+            EVENTS.append(label)
+            await asyncio.sleep(0)
+            yield {"label": label, "index": index}
+
+
+def _run(jobs, tmp_path, **kwargs):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'jobs.db'}")
+
+    async def go():
+        async with aiohttp.ClientSession() as session:
+            scheduler = JobScheduler(jobs, storage, config=SchedulerSettings(batch_size=3), session=session, **kwargs)
+            results = await scheduler.run()
+            assert not session.closed
+            return results
+
+    return asyncio.run(go()), storage
+
+
+def test_jobs_run_concurrently_on_one_session_and_stream_to_storage(tmp_path):
+    EVENTS.clear()
+    SESSIONS.clear()
+    jobs = [
+        CrawlJob("slow", TickCrawler, "slow_rows", {"label": "slow", "count": 10}),
+        CrawlJob("fast", TickCrawler, "fast_rows", {"label": "fast", "count": 4}),
+    ]
+
+    results, storage = _run(jobs, tmp_path, parallelism=2)
+
+    assert [(p.name, p.state, p.records) for p in results] == [("slow", "done", 10), ("fast", "done", 4)]
+    assert EVENTS[-1] == "slow" and EVENTS.index("fast") < EVENTS.index("slow", 2)  # interleaved, not serialized
+    assert len(SESSIONS) == 1
+    assert pd.read_sql_table("slow_rows", storage.engine)["index"].tolist() == list(range(10))
+
+
+def test_parallelism_one_serializes_and_failures_are_isolated(tmp_path):
+    EVENTS.clear()
+    jobs = [
+        CrawlJob("broken", TickCrawler, "broken_rows", {"label": "broken", "count": 10, "fail_at": 4}),
+        CrawlJob("ok", TickCrawler, "ok_rows", {"label": "ok", "count": 2}),
+    ]
+
+    results, storage = _run(jobs, tmp_path, parallelism=1)
+
+    broken, ok = results
+    assert broken.state == "failed" and broken.records == 4  # the partial batch is stored too
+    assert ok.state == "done" and ok.records == 2
+    assert EVENTS == ["broken"] * 4 + ["ok"] * 2
+    assert pd.read_sql_table("broken_rows", storage.engine)["index"].tolist() == [0, 1, 2, 3]
+
+
+def test_cli_builds_one_job_per_crawler():
+    args = cli.parse_args(["news", "spatial", "news", "--start-date", "2015-01-01", "--end-date", "2015-12-31"])
+
+    jobs = cli.build_jobs(args)
+
+    assert [(job.name, job.table) for job in jobs] == [("news", "news_events"), ("spatial", "spatial_poi")]
+    assert jobs[0].kwargs["end_date"].date().isoformat() == "2015-12-31"
+    assert jobs[1].kwargs["bounds"] == {"southwest": "39.5,116.2", "northeast": "41.0,117.4"}
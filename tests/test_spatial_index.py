@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from pyproj import Transformer
+
+from crawler_project.utils.spatial_index import PointIndex, points_geodataframe
+
+
+def _frame(count, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "longitude": rng.uniform(116.2, 116.6, count),
+            "latitude": rng.uniform(39.8, 40.1, count),
+            "category": rng.choice(["学校", "医院", "酒吧"], count),
+        }
+    )
+
+
+def _metres(frame):
+    x, y = Transformer.from_crs("EPSG:4326", "EPSG:32650", always_xy=True).transform(
+        frame["longitude"].to_numpy(), frame["latitude"].to_numpy()
+    )
+    return np.column_stack([x, y])
+
+
+def test_points_geodataframe_is_vectorized_and_keeps_missing_rows():
+    frame = pd.DataFrame({"longitude": [116.4, None], "latitude": [39.9, 40.0], "name": ["a", "b"]})
+
+    gdf = points_geodataframe(frame)
+
+    assert gdf.crs.to_epsg() == 4326
+    assert gdf.geometry.iloc[0].coords[0] == (116.4, 39.9)
+    assert gdf.geometry.iloc[1] is None
+    assert gdf["name"].tolist() == ["a", "b"]
+
+
+def test_nearest_and_radius_counts_match_brute_force():
+    pois = _frame(800, 1)
+    queries = _frame(200, 2)
+    index = PointIndex(pois, crs="EPSG:32650")
+
+    schools = pois[pois["category"] == "学校"].reset_index(drop=True)
+    pairwise = np.linalg.norm(_metres(queries)[:, None, :] - _metres(schools)[None, :, :], axis=2)
+
+    nearest = index.nearest(queries["longitude"], queries["latitude"], "学校")
+    assert np.allclose(nearest["distance_m"], pairwise.min(axis=1))
+    assert (index.frame.loc[nearest["poi_index"], "category"] == "学校").all()
+
+    counts = index.count_within(queries["longitude"], queries["latitude"], 1000, "学校")
+    assert (counts == (pairwise <= 1000).sum(axis=1)).all()
+
+    features = index.features(queries["longitude"], queries["latitude"], ["学校", "医院"], radii=[500, 1000])
+    assert list(features.columns) == [
+        "学校_nearest_m", "学校_within_500m", "学校_within_1000m",
+        "医院_nearest_m", "医院_within_500m", "医院_within_1000m",
+    ]
+    assert (features["学校_within_1000m"] == counts).all()
+
+
+def test_missing_query_points_and_out_of_range_results():
+    index = PointIndex(_frame(50, 3), crs="EPSG:32650")
+
+    nearest = index.nearest([116.4, np.nan, 130.0], [39.9, 39.9, 45.0], max_distance=50_000)
+    assert nearest["poi_index"].isna().tolist() == [False, True, True]
+    assert np.isnan(nearest["distance_m"].iloc[1:]).all()
+    assert index.count_within([np.nan], [39.9], 1000).tolist() == [0]
+    assert index.nearest([116.4], [39.9], "不存在")["poi_index"].isna().all()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import event, inspect
+
+from crawler_project.utils.storage_handler import StorageHandler, _csv_field, _CsvStream
+
+ROWS = [
+    [1, 2.5, "plain", None],
+    [2, float("nan"), 'say "hi", then\nleave', {"k": "值"}],
+    [3, np.int64(7), pd.NA, datetime(2019, 5, 1, 8, 30)],
+    [4, True, pd.NaT, date(2019, 5, 2)],
+]
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, ""),
+        (float("nan"), ""),
+        (pd.NA, ""),
+        (pd.NaT, ""),
+        (3, "3"),
+        (np.float64(1.5), "1.5"),
+        (True, '"True"'),
+        ("", '""'),  # quoted empty string is not NULL
+        ('a "b"', '"a ""b"""'),
+        ([1, "二"], '"[1, ""二""]"'),
+        (datetime(2019, 5, 1, 8, 30), '"2019-05-01T08:30:00"'),
+    ],
+)
+def test_csv_field(value, expected):
+    assert _csv_field(value) == expected
+
+
+def test_csv_stream_reads_the_same_text_at_any_size():
+    whole = _CsvStream(ROWS).read()
+
+    for size in (1, 7, 64):
+        stream = _CsvStream(ROWS)
+        parts = []
+        while chunk := stream.read(size):
+            assert len(chunk) <= size
+            parts.append(chunk)
+        assert "".join(parts) == whole
+        assert stream.rows_written == len(ROWS)
+    assert whole.splitlines()[0] == '1,2.5,"plain",'
+
+
+def test_upsert_sql():
+    sql = StorageHandler._upsert_sql("news", "_staging_news", ["url", "title", "deaths"], ["url"])
+
+    assert sql == (
+        'INSERT INTO "news" ("url", "title", "deaths") '
+        'SELECT DISTINCT ON ("url") "url", "title", "deaths" FROM "_staging_news" '
+        'ON CONFLICT ("url") DO UPDATE SET "title" = EXCLUDED."title", "deaths" = EXCLUDED."deaths"'
+    )
+    assert StorageHandler._upsert_sql("t", "s", ["url"], ["url"]).endswith('ON CONFLICT ("url") DO NOTHING')
+
+
+def test_unique_index_is_created_once_per_table(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'store.db'}")
+    storage.save_records([{"url": "a"}, {"url": "b"}], "pages", method="insert")
+    statements = []
+    event.listen(storage.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    for _ in range(3):
+        storage.ensure_unique_index("pages", ["url"])
+
+    assert sum("CREATE UNIQUE INDEX" in statement for statement in statements) == 1
+
+
+def test_unique_index_on_duplicate_rows_fails_clearly(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'store.db'}")
+    storage.save_records([{"url": "a"}, {"url": "a"}], "dupes", method="insert")
+
+    with pytest.raises(ValueError, match=r"Cannot upsert into dupes on \(url\): existing rows share a key"):
+        storage.ensure_unique_index("dupes", ["url"])
+
+
+def test_save_records_adds_keys_first_seen_in_later_chunks(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'store.db'}")
+    records = [{"url": "a"}, {"url": "b"}, {"url": "c", "deaths": 3}, {"url": "d", "note": "x"}, {"url": "e"}]
+
+    assert storage.save_records(iter(records), "events", method="insert", chunk_size=2) == 5
+
+    assert [c["name"] for c in inspect(storage.engine).get_columns("events")] == ["url", "deaths", "note"]
+    rows = pd.read_sql_query("SELECT * FROM events ORDER BY url", storage.engine)
+    assert rows["deaths"].isna().tolist() == [True, True, False, True, True]
+    assert rows.loc[rows["url"] == "c", "deaths"].item() == 3
+    assert rows.loc[rows["url"] == "d", "note"].item() == "x"
+
+
+def test_save_records_reflects_a_known_table_only_for_new_columns(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'store.db'}")
+    storage.save_records([{"url": "a", "title": "t"}], "pages", method="insert")
+    statements = []
+    event.listen(storage.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    storage.save_records([{"url": "b"}], "pages", method="insert")
+    storage.save_records([{"url": "c", "title": "u"}], "pages", method="insert")
+
+    assert all(statement.startswith("INSERT") for statement in statements)
+    storage.save_records([{"url": "d", "extra": 1}], "pages", method="insert")
+    assert any(statement.startswith("ALTER TABLE") for statement in statements)
+
+
+def test_export_records_streams_the_indent_2_layout(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'store.db'}")
+    records = [{"title": "火灾", "loss": {"deaths": 1}}, {"title": "暴雨", "date": date(2019, 5, 1)}]
+
+    path = storage.export_records(iter(records), tmp_path / "out" / "records.json")
+    empty = storage.export_records([], tmp_path / "out" / "empty.json")
+
+    assert path.read_text(encoding="utf-8") == json.dumps(records, ensure_ascii=False, indent=2, default=str)
+    assert json.loads(empty.read_text(encoding="utf-8")) == []
+
+
+def test_export_jsonl_writes_and_appends_lines(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'store.db'}")
+    path = tmp_path / "records.jsonl"
+
+    storage.export_jsonl({"title": ["火灾", "暴雨"], "deaths": [1, None]}, path)
+    storage.export_jsonl([{"title": "地震"}], path, append=True)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"title": "火灾", "deaths": 1},
+        {"title": "暴雨", "deaths": None},
+        {"title": "地震"},
+    ]
+    assert lines[0] == '{"title": "火灾", "deaths": 1}'
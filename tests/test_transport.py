@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from crawler_project.core.base_crawler import BaseCrawler
+from crawler_project.utils import transport
+from crawler_project.utils.transport import (
+    TransportSettings,
+    TransportStats,
+    acquire_session,
+    release_session,
+    transport_stats,
+)
+
+
+class PingCrawler(BaseCrawler):
+    name = "ping"
+
+    async def crawl(self, url: str, count: int):
+        for _ in range(count):
+            yield {"body": await self._request("GET", url)}
+
+
+async def _serve():
+    async def ping(request):
+        return web.Response(text="pong")
+
+    app = web.Application()
+    app.router.add_get("/ping", ping)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/ping"
+
+
+def test_crawlers_on_one_loop_share_a_refcounted_session():
+    async def go():
+        first, second = PingCrawler(), PingCrawler()
+        async with first:
+            async with second:
+                assert first.session is second.session
+                session = first.session
+            assert not session.closed  # first still holds it
+        assert session.closed and first.session is None
+        assert not transport._shared
+
+        async with PingCrawler() as third:
+            assert third.session is not session and not third.session.closed
+
+    asyncio.run(go())
+
+
+def test_caller_session_is_left_open():
+    async def go():
+        async with aiohttp.ClientSession() as session:
+            async with PingCrawler(session=session) as crawler:
+                assert crawler.session is session
+            assert not session.closed
+            await release_session(session)  # not borrowed: ignored
+            assert not session.closed
+
+    asyncio.run(go())
+
+
+def test_connections_are_reused_across_crawlers():
+    stats = transport_stats()
+    stats.reset()
+
+    async def go():
+        runner, url = await _serve()
+        try:
+            shared = await acquire_session()  # keep the pool alive between crawlers
+            for _ in range(2):
+                async with PingCrawler() as crawler:
+                    bodies = [record["body"] async for record in crawler.crawl(url=url, count=3)]
+                    assert bodies == ["pong"] * 3
+            await release_session(shared)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(go())
+
+    snapshot = stats.snapshot()
+    assert snapshot["requests"] == 6
+    assert snapshot["connections_opened"] == 1
+    assert snapshot["connections_reused"] == 5
+    assert snapshot["reuse_ratio"] == round(5 / 6, 3)
+
+
+def test_httpx_session_follows_redirects_and_passes_not_modified():
+    httpx = pytest.importorskip("httpx")
+
+    def handler(request):
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"Location": "/new"})
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="fresh", headers={"ETag": '"v1"'})
+
+    async def go():
+        config = TransportSettings(backend="httpx", http2=False)
+        session = transport.HttpxSession(config, TransportStats(), transport=httpx.MockTransport(handler))
+        try:
+            async with session.request("GET", "http://example.test/old") as response:
+                response.raise_for_status()
+                assert response.status == 200
+                assert await response.text() == "fresh"
+            async with session.request("GET", "http://example.test/new", headers={"If-None-Match": '"v1"'}) as response:
+                response.raise_for_status()
+                assert response.status == 304
+        finally:
+            await session.close()
+
+    asyncio.run(go())
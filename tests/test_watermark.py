@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime
+
+import pandas as pd
+from scrapy.http import HtmlResponse
+
+from crawler_project.core import base_crawler
+from crawler_project.core.news_crawler import BASE_URL, NewsCrawler
+from crawler_project.scrapy_app.spiders.news_spider import NorthNewsSpider
+from crawler_project.utils.storage_handler import StorageHandler
+from crawler_project.utils.watermark import Watermark, date_floor, load_watermark, page_below
+
+LISTINGS = {
+    1: ["2019-05-03", "2019-05-02"],
+    2: ["2019-05-02", "2019-05-01"],
+    3: ["2019-04-30", "2019-04-29"],
+    4: ["2019-04-28"],
+}
+
+
+def _listing(page):
+    items = "".join(
+        f'<li><a href="/news/{page}/content_{index}.htm">标题{page}-{index}</a><span>{day}</span></li>'
+        for index, day in enumerate(LISTINGS[page])
+    )
+    return f"<html><body><ul class='list'>{items}</ul></body></html>"
+
+
+def test_load_watermark_reads_newest_date_and_its_urls(tmp_path):
+    storage = StorageHandler(f"sqlite:///{tmp_path / 'news.db'}")
+    assert load_watermark(storage.engine, "news_events") is None
+    pd.DataFrame(
+        {
+            "url": [f"{BASE_URL}a.htm", f"{BASE_URL}b.htm", f"{BASE_URL}c.htm", "http://other.cn/x.htm"],
+            "publish_date": ["2019-05-01T00:00:00", "2019-05-02T00:00:00", "2019-05-02T00:00:00", "2020-01-01T00:00:00"],
+        }
+    ).to_sql("news_events", storage.engine, index=False)
+
+    watermark = load_watermark(storage.engine, "news_events", url_prefix=BASE_URL)
+
+    assert watermark == Watermark(datetime(2019, 5, 2), frozenset({f"{BASE_URL}b.htm", f"{BASE_URL}c.htm"}))
+    assert load_watermark(storage.engine, "news_events").publish_date == datetime(2020, 1, 1)
+
+
+def test_date_floor_and_page_below():
+    watermark = Watermark(datetime(2019, 5, 2), frozenset())
+    assert date_floor(datetime(2019, 1, 1), watermark) == datetime(2019, 5, 2)
+    assert date_floor(datetime(2019, 6, 1), watermark) == datetime(2019, 6, 1)
+    assert date_floor(None, None) is None
+
+    assert page_below([datetime(2019, 5, 1), None], datetime(2019, 5, 2))
+    assert not page_below([datetime(2019, 5, 2), datetime(2019, 4, 1)], datetime(2019, 5, 2))
+    assert not page_below([None], datetime(2019, 5, 2))
+
+
+class ListingNewsCrawler(NewsCrawler):
+    def __init__(self):
+        super().__init__(run_id=uuid.uuid4().hex)
+        self.dedup = None
+        self.fetched = []
+
+    async def fetch_text(self, url, params=None, immutable=False):
+        self.fetched.append(url)
+        if "/node_" in url:
+            return _listing(int(url.rsplit("_", 1)[1].split(".")[0]))
+        return "<html><body><div class='article'>北京发生火灾。</div></body></html>"
+
+
+def test_news_crawler_stops_at_the_watermark(monkeypatch):
+    monkeypatch.setattr(base_crawler, "get_parse_executor", lambda: None)
+    crawler = ListingNewsCrawler()
+    known = f"{BASE_URL}news/2/content_0.htm"
+    watermark = Watermark(datetime(2019, 5, 2), frozenset({known}))
+
+    async def run():
+        return [
+            record
+            async for record in crawler.crawl(datetime(2019, 1, 1), datetime(2019, 12, 31), 4, watermark=watermark)
+        ]
+
+    records = asyncio.run(run())
+
+    pages = [url for url in crawler.fetched if "/node_" in url]
+    assert pages == [f"{BASE_URL}news/node_{page}.htm" for page in (1, 2, 3)]
+    assert sorted(record["url"].rsplit("/news/", 1)[1] for record in records) == [
+        "1/content_0.htm",
+        "1/content_1.htm",
+    ]
+
+
+def test_news_spider_follows_pages_until_start_date():
+    spider = NorthNewsSpider(start_date="2019-05-01", end_date="2019-12-31", max_pages=4)
+
+    def parse(page):
+        response = HtmlResponse(url=f"{BASE_URL}news/node_{page}.htm", body=_listing(page), encoding="utf-8")
+
+        async def collect():
+            return [request async for request in spider.parse_list(response, page=page)]
+
+        return asyncio.run(collect())
+
+    first = parse(1)
+    assert first[-1].url == f"{BASE_URL}news/node_2.htm"
+    second = parse(2)
+    assert [request.url for request in second][-1] == f"{BASE_URL}news/node_3.htm"
+    third = parse(3)
+    assert third == [] and spider.pages_exhausted